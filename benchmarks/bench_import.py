@@ -0,0 +1,119 @@
+###
+## cluster_maker - import-time benchmark
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+"""
+Measure the cold-start cost of importing cluster_maker.
+
+Each measurement runs in a fresh interpreter, so module caches from earlier
+imports never hide the real start-up cost. For every scenario the script
+records the wall time of the import statement (and of the first attribute
+access, if any) and the peak resident set size of the child process.
+
+Usage:
+    python benchmarks/bench_import.py [--repeat N] [--output results.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Name -> attribute accessed right after "import cluster_maker" (None: none).
+SCENARIOS: Dict[str, Optional[str]] = {
+    "import_only": None,
+    "simulate_data": "simulate_data",
+    "column_summary": "column_summary",
+    "run_clustering": "run_clustering",
+    "plot_clusters_2d": "plot_clusters_2d",
+}
+
+_CHILD_CODE = """
+import json, resource, sys, time
+t0 = time.perf_counter()
+import {package}
+t1 = time.perf_counter()
+attr = {attr!r}
+if attr is not None:
+    getattr({package}, attr)
+t2 = time.perf_counter()
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == "darwin":
+    rss_kb //= 1024
+print(json.dumps({{"import_s": t1 - t0, "total_s": t2 - t0, "max_rss_mb": rss_kb / 1024.0,
+                   "n_modules": len(sys.modules)}}))
+"""
+
+
+def _baseline_rss_mb() -> float:
+    """Peak RSS of a bare interpreter, to separate package cost from Python's own."""
+    code = (
+        "import resource, sys; r = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss; "
+        "print(r / (1024.0 * 1024.0) if sys.platform == 'darwin' else r / 1024.0)"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return float(out.stdout.strip())
+
+
+def measure(attr: Optional[str], repeat: int, package: str = "cluster_maker") -> Dict[str, float]:
+    """Run the import in `repeat` fresh interpreters and summarise the samples."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = REPO_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+
+    samples: List[Dict[str, float]] = []
+    code = _CHILD_CODE.format(package=package, attr=attr)
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True, text=True, check=True, env=env,
+        )
+        samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    total = [s["total_s"] for s in samples]
+    return {
+        "median_s": statistics.median(total),
+        "min_s": min(total),
+        "max_s": max(total),
+        "import_median_s": statistics.median(s["import_s"] for s in samples),
+        "max_rss_mb": max(s["max_rss_mb"] for s in samples),
+        "n_modules": samples[-1]["n_modules"],
+        "repeat": repeat,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark cold-start import of cluster_maker.")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per scenario")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    # One throw-away run so that bytecode caches exist for every measurement.
+    measure("run_clustering", repeat=1)
+
+    results = {"python_rss_mb": _baseline_rss_mb(), "scenarios": {}}
+    print(f"{'scenario':<20}{'median (ms)':>12}{'max RSS (MB)':>14}{'modules':>9}")
+    for name, attr in SCENARIOS.items():
+        stats = measure(attr, args.repeat)
+        results["scenarios"][name] = stats
+        print(f"{name:<20}{stats['median_s'] * 1000:>12.1f}{stats['max_rss_mb']:>14.1f}"
+              f"{stats['n_modules']:>9d}")
+    print(f"(bare interpreter RSS: {results['python_rss_mb']:.1f} MB)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,328 @@
+###
+## cluster_maker - memory benchmark
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+"""
+Measure peak memory of the public functions and of each ``run_clustering``
+stage over growing inputs, and fit how it scales.
+
+Every measurement runs in a fresh interpreter, so allocator caches and
+memory left over from earlier cases never hide the real cost. Inside the
+child process the inputs are built first, then the call under test is made
+twice:
+
+- with a background thread sampling the resident set size from
+  ``/proc/self/statm`` every millisecond (the figure that counts against a
+  worker's memory limit; sampling may miss very short spikes);
+- with ``tracemalloc`` tracing, which gives the exact peak of Python and
+  NumPy allocations made by the call.
+
+Each function is swept along n, d and k separately (the other two held at
+their base values) and a power law ``peak ~ size^b`` is fitted to the
+tracemalloc peaks by least squares in log-log space. An exponent near 1
+along n, d and k, as for ``assign_clusters``, means memory grows as n*k*d.
+The fit is then used to extrapolate the peak to a target n.
+
+Usage:
+    python benchmarks/bench_memory.py [--quick] [--filter NAME] [--target-n 10000000]
+                                      [--output memory.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import harness
+
+import numpy as np
+
+from bench_suite import CASES
+from cluster_maker.algorithms import nearest_centroid
+from cluster_maker.evaluation import compute_inertia
+from cluster_maker.interface import run_clustering
+from cluster_maker.preprocessing import FeatureScaler, apply_pca
+
+BASE = {"n": 20_000, "d": 4, "k": 8}
+SWEEPS = {
+    "n": [5_000, 10_000, 20_000, 40_000, 80_000],
+    "d": [2, 4, 8, 16, 32],
+    "k": [2, 4, 8, 16, 32],
+}
+QUICK_BASE = {"n": 4_000, "d": 4, "k": 8}
+QUICK_SWEEPS = {
+    "n": [2_000, 4_000, 8_000, 16_000],
+    "d": [2, 4, 8, 16],
+    "k": [2, 4, 8, 16],
+}
+
+
+def _setup_nearest_centroid(n: int, d: int, k: int) -> Callable[[], Any]:
+    X = harness.make_matrix(n, d, k)
+    centroids = X[:k].copy()
+    return lambda: nearest_centroid(X, centroids)
+
+
+def _setup_compute_inertia(n: int, d: int, k: int) -> Callable[[], Any]:
+    X = harness.make_matrix(n, d, k)
+    labels = harness.make_dataset(n, d, k)["true_cluster"].to_numpy()
+    centroids = np.vstack([X[labels == j].mean(axis=0) for j in range(k)])
+    return lambda: compute_inertia(X, labels, centroids)
+
+
+def _setup_standardise(n: int, d: int, k: int) -> Callable[[], Any]:
+    X = harness.make_matrix(n, d, k)
+    return lambda: FeatureScaler().fit_transform(X)
+
+
+def _setup_apply_pca(n: int, d: int, k: int) -> Callable[[], Any]:
+    X = harness.make_matrix(n, d, k)
+    return lambda: apply_pca(X, n_components=2, random_state=0)
+
+
+# name -> (axes swept, setup(n, d, k[, tmp]), largest n, needs tmp dir)
+MEMORY_CASES: Dict[str, Tuple[Tuple[str, ...], Callable[..., Callable[[], Any]], Optional[int], bool]] = {
+    **CASES,
+    "nearest_centroid": (("n", "d", "k"), _setup_nearest_centroid, None, False),
+    "compute_inertia": (("n", "d", "k"), _setup_compute_inertia, None, False),
+    "FeatureScaler.fit_transform": (("n", "d"), _setup_standardise, None, False),
+    "apply_pca": (("n", "d"), _setup_apply_pca, None, False),
+}
+# Per-stage peaks of run_clustering are taken from its own profiler.
+STAGES_CASE = "run_clustering[stages]"
+
+
+def _rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class RSSSampler:
+    """Background thread recording the largest RSS seen while it runs."""
+
+    def __init__(self, interval: float = 0.001) -> None:
+        self.interval = interval
+        self.peak = _rss_bytes()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            rss = _rss_bytes()
+            if rss is not None and (self.peak is None or rss > self.peak):
+                self.peak = rss
+            time.sleep(self.interval)
+
+    def __enter__(self) -> "RSSSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+        rss = _rss_bytes()
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+
+
+def _measure_child(name: str, n: int, d: int, k: int) -> Dict[str, Any]:
+    """Run inside the child interpreter: build inputs, then measure one call."""
+    with tempfile.TemporaryDirectory() as tmp:
+        if name == STAGES_CASE:
+            csv_path = os.path.join(tmp, "data.csv")
+            harness.make_dataset(n, d, k).to_csv(csv_path, index=False)
+            harness.clear_datasets()
+            feature_cols = [f"f{j}" for j in range(d)]
+            result = run_clustering(
+                csv_path, feature_cols, k=k, random_state=0, return_data=False,
+                plots=False, silhouette_sample_size=5_000, profile=True,
+            )
+            return {"stages": {r["stage"]: r["peak_mem_bytes"] for r in result["profile"]}}
+
+        _, setup, _, needs_tmp = MEMORY_CASES[name]
+        func = setup(*((n, d, k) + ((tmp,) if needs_tmp else ())))
+        func()  # warm-up: imports, lazy initialisation
+
+        rss_before = _rss_bytes()
+        with RSSSampler() as sampler:
+            func()
+
+        tracemalloc.start()
+        start = tracemalloc.get_traced_memory()[0]
+        func()
+        traced_peak = tracemalloc.get_traced_memory()[1] - start
+        tracemalloc.stop()
+
+    return {
+        "traced_peak_bytes": traced_peak,
+        "rss_before_bytes": rss_before,
+        "rss_peak_bytes": sampler.peak,
+        "rss_delta_bytes": None if rss_before is None else sampler.peak - rss_before,
+    }
+
+
+def measure(name: str, n: int, d: int, k: int) -> Dict[str, Any]:
+    """Measure one case at one size in a fresh interpreter."""
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", name, str(n), str(d), str(k)],
+        capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def fit_power_law(sizes: List[float], peaks: List[float]) -> Optional[Dict[str, float]]:
+    """
+    Least-squares fit of ``peak = c * size^b`` in log-log space.
+
+    Returns
+    -------
+    fit : dict or None
+        "exponent" b, "coefficient" c and "r2" of the log-log fit; None with
+        fewer than two usable points.
+    """
+    points = [(s, p) for s, p in zip(sizes, peaks) if s > 0 and p and p > 0]
+    if len(points) < 2:
+        return None
+    log_s = np.log([s for s, _ in points])
+    log_p = np.log([p for _, p in points])
+    slope, intercept = np.polyfit(log_s, log_p, 1)
+    residual = log_p - (slope * log_s + intercept)
+    total = np.sum((log_p - log_p.mean()) ** 2)
+    r2 = 1.0 - float(np.sum(residual ** 2) / total) if total > 0 else 1.0
+    return {"exponent": float(slope), "coefficient": float(np.exp(intercept)), "r2": r2}
+
+
+def _sweep(
+    name: str,
+    axis: str,
+    values: List[int],
+    base: Dict[str, int],
+    max_n: Optional[int],
+) -> Dict[str, Any]:
+    rows = []
+    for value in values:
+        params = {**base, axis: value}
+        if max_n is not None and params["n"] > max_n:
+            continue
+        if params["k"] > params["n"]:
+            continue
+        rows.append({axis: value, **measure(name, params["n"], params["d"], params["k"])})
+    return {"points": rows}
+
+
+def run_memory(
+    sweeps: Dict[str, List[int]],
+    base: Dict[str, int] = BASE,
+    name_filter: Optional[str] = None,
+    target_n: Optional[int] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Sweep every case along its axes and fit the memory exponents.
+
+    Returns
+    -------
+    results : dict
+        Case name -> {axis: {"points": [...], "fit": ..., "rss_fit": ...}},
+        plus "predicted_at_target_n" when ``target_n`` is given.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, (axes, _, max_n, _) in MEMORY_CASES.items():
+        if name_filter and name_filter not in name:
+            continue
+        entry: Dict[str, Any] = {}
+        for axis in axes:
+            sweep = _sweep(name, axis, sweeps[axis], base, max_n)
+            points = sweep["points"]
+            sweep["fit"] = fit_power_law([p[axis] for p in points], [p["traced_peak_bytes"] for p in points])
+            sweep["rss_fit"] = fit_power_law([p[axis] for p in points], [p["rss_delta_bytes"] for p in points])
+            entry[axis] = sweep
+        if target_n and "n" in entry and entry["n"]["fit"] and entry["n"]["points"]:
+            last = entry["n"]["points"][-1]
+            growth = (target_n / last["n"]) ** entry["n"]["fit"]["exponent"]
+            entry["predicted_at_target_n"] = {
+                "n": target_n,
+                "traced_peak_bytes": last["traced_peak_bytes"] * growth,
+                "rss_peak_bytes": (last["rss_before_bytes"] or 0) + (last["rss_delta_bytes"] or 0) * growth,
+            }
+        results[name] = entry
+        _print_case(name, entry)
+
+    if name_filter is None or name_filter in STAGES_CASE:
+        stage_rows = [
+            {"n": n, **measure(STAGES_CASE, n, base["d"], base["k"])} for n in sweeps["n"]
+        ]
+        stage_names = list(stage_rows[0]["stages"])
+        fits = {
+            stage: fit_power_law([row["n"] for row in stage_rows],
+                                 [row["stages"][stage] for row in stage_rows])
+            for stage in stage_names
+        }
+        results[STAGES_CASE] = {"n": {"points": stage_rows, "fits": fits}}
+        print(f"\n{STAGES_CASE} (peak MB at n={sweeps['n'][-1]}, exponent along n)")
+        for stage in stage_names:
+            peak = stage_rows[-1]["stages"][stage] or 0
+            fit = fits[stage]
+            exponent = f"{fit['exponent']:.2f}" if fit else "-"
+            print(f"  {stage:<14}{peak / 1e6:>10.1f}{exponent:>8}")
+    return results
+
+
+def _print_case(name: str, entry: Dict[str, Any]) -> None:
+    parts = []
+    for axis in ("n", "d", "k"):
+        fit = entry.get(axis, {}).get("fit")
+        if fit:
+            parts.append(f"{axis}^{fit['exponent']:.2f}")
+    line = f"{name:<30}{' '.join(parts):<24}"
+    n_points = entry.get("n", {}).get("points")
+    if n_points:
+        last = n_points[-1]
+        line += (f"traced {last['traced_peak_bytes'] / 1e6:>8.1f} MB, "
+                 f"RSS {(last['rss_peak_bytes'] or 0) / 1e6:>8.1f} MB at n={last['n']}")
+    print(line, flush=True)
+    predicted = entry.get("predicted_at_target_n")
+    if predicted:
+        print(f"{'':<30}predicted at n={predicted['n']}: traced "
+              f"{predicted['traced_peak_bytes'] / 1e6:.0f} MB, RSS {predicted['rss_peak_bytes'] / 1e6:.0f} MB")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure and fit the memory scaling of cluster_maker.")
+    parser.add_argument("--quick", action="store_true", help="smaller sweeps")
+    parser.add_argument("--filter", default=None, help="only run cases whose name contains this")
+    parser.add_argument("--target-n", type=int, default=None,
+                        help="extrapolate each function's peak memory to this many rows")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--child", nargs=4, metavar=("NAME", "N", "D", "K"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        name, n, d, k = args.child
+        print(json.dumps(_measure_child(name, int(n), int(d), int(k))))
+        return 0
+
+    base, sweeps = (QUICK_BASE, QUICK_SWEEPS) if args.quick else (BASE, SWEEPS)
+    print(f"base sizes {base}; exponents fitted to tracemalloc peaks")
+    results = run_memory(sweeps, base, name_filter=args.filter, target_n=args.target_n)
+    if args.output:
+        harness.save_results(args.output, results, extra={"base": base, "sweeps": sweeps})
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+###
+## cluster_maker - parallel scaling benchmark
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+"""
+Measure how throughput changes with core count for each parallel path.
+
+- ``sklearn_kmeans`` and ``silhouette_score_sklearn`` are parallelised by
+  their BLAS/OpenMP thread pools, so they are swept over thread counts.
+- ``elbow_curve(max_workers=...)`` and ``run_sweep(max_workers=...)`` fan
+  fits out over worker processes, each with its own thread pools, so they
+  are swept over workers x threads-per-worker.
+
+Thread pools are sized when NumPy and scikit-learn are first imported, so
+every configuration runs in a fresh interpreter with OMP_NUM_THREADS,
+OPENBLAS_NUM_THREADS, MKL_NUM_THREADS (etc.) set in its environment, the
+same limiting ``cluster-maker --threads`` applies. Worker processes inherit
+the limits.
+
+For each configuration the report gives the median time, the speed-up over
+one worker with one thread, and the efficiency (speed-up per core in use,
+capped at the machine's core count). Configurations with more threads in
+total than cores are marked as oversubscribed, and the penalty is the
+ratio of their best time to the best time without oversubscription.
+
+Usage:
+    python benchmarks/bench_scaling.py [--filter NAME] [--max-cores N] [--repeat 3]
+                                       [--output scaling.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import harness
+
+from cluster_maker.cli import THREAD_ENV_VARS
+
+# name -> (swept: "threads" or "workers", n, d, k)
+TARGETS: Dict[str, Tuple[str, int, int, int]] = {
+    "sklearn_kmeans": ("threads", 200_000, 8, 8),
+    "silhouette_score_sklearn": ("threads", 8_000, 8, 8),
+    "elbow_curve": ("workers", 50_000, 8, 8),
+    # Each sweep fit also computes the exact (O(n^2)) silhouette.
+    "run_sweep": ("workers", 10_000, 8, 6),
+}
+
+
+def _child_callable(name: str, workers: int, n: int, d: int, k: int, tmp: str) -> Callable[[], Any]:
+    """Build the call under test (inside the child interpreter)."""
+    if name == "sklearn_kmeans":
+        from cluster_maker.algorithms import sklearn_kmeans
+
+        X = harness.make_matrix(n, d, k)
+        return lambda: sklearn_kmeans(X, k, random_state=0)
+
+    if name == "silhouette_score_sklearn":
+        from cluster_maker.evaluation import silhouette_score_sklearn
+
+        X = harness.make_matrix(n, d, k)
+        labels = harness.make_dataset(n, d, k)["true_cluster"].to_numpy()
+        return lambda: silhouette_score_sklearn(X, labels)
+
+    if name == "elbow_curve":
+        from cluster_maker.evaluation import elbow_curve
+
+        X = harness.make_matrix(n, d, k)
+        return lambda: elbow_curve(X, list(range(1, k + 1)), random_state=0, max_workers=workers)
+
+    if name == "run_sweep":
+        from cluster_maker.sweep import run_sweep
+
+        csv_path = os.path.join(tmp, "data.csv")
+        harness.make_dataset(n, d, k).to_csv(csv_path, index=False)
+        feature_cols = [f"f{j}" for j in range(d)]
+        return lambda: run_sweep(
+            csv_path, feature_cols, k_values=list(range(2, k + 1)),
+            algorithms=("sklearn_kmeans",), random_state=0, max_workers=workers,
+        )
+
+    raise ValueError(f"Unknown target '{name}'.")
+
+
+def _run_child(name: str, workers: int, n: int, d: int, k: int, repeat: int) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        func = _child_callable(name, workers, n, d, k, tmp)
+        return harness.time_call(func, repeat=repeat, warmup=1)
+
+
+def measure(name: str, workers: int, threads: int, repeat: int) -> Dict[str, Any]:
+    """Time one configuration in a fresh interpreter with ``threads`` BLAS/OpenMP threads."""
+    _, n, d, k = TARGETS[name]
+    env = dict(os.environ)
+    for var in THREAD_ENV_VARS:
+        env[var] = str(threads)
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", name,
+         str(workers), str(n), str(d), str(k), str(repeat)],
+        capture_output=True, text=True, check=True, env=env,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def core_counts(max_cores: int) -> List[int]:
+    """Powers of two up to ``max_cores``, plus ``max_cores`` itself."""
+    counts = []
+    c = 1
+    while c < max_cores:
+        counts.append(c)
+        c *= 2
+    counts.append(max_cores)
+    return counts
+
+
+def configurations(swept: str, max_cores: int) -> List[Tuple[int, int]]:
+    """
+    (workers, threads) pairs to run: thread counts for threaded targets,
+    workers with one thread each and with all cores each for process pools.
+    Both include a point at twice the core count to expose oversubscription.
+    """
+    counts = core_counts(max_cores)
+    if swept == "threads":
+        return [(1, t) for t in counts + [2 * max_cores]]
+    configs = [(w, 1) for w in counts + [2 * max_cores]]
+    configs += [(w, max_cores) for w in counts if w > 1 and max_cores > 1]
+    return configs
+
+
+def summarise(rows: List[Dict[str, Any]], cpu_count: int) -> Dict[str, Any]:
+    """Add speed-up, efficiency and the oversubscription flag to each row."""
+    reference = next((r["median_s"] for r in rows if r["workers"] == 1 and r["threads"] == 1), None)
+    for row in rows:
+        cores = row["workers"] * row["threads"]
+        row["oversubscribed"] = cores > cpu_count
+        if reference:
+            row["speedup"] = reference / row["median_s"]
+            row["efficiency"] = row["speedup"] / min(cores, cpu_count)
+
+    fitting = [r["median_s"] for r in rows if not r["oversubscribed"]]
+    over = [r["median_s"] for r in rows if r["oversubscribed"]]
+    best = min(rows, key=lambda r: r["median_s"])
+    return {
+        "rows": rows,
+        "best": {"workers": best["workers"], "threads": best["threads"], "median_s": best["median_s"]},
+        "oversubscription_penalty": (min(over) / min(fitting)) if over and fitting else None,
+    }
+
+
+def run_scaling(
+    max_cores: int,
+    repeat: int = 3,
+    name_filter: Optional[str] = None,
+) -> Dict[str, Dict[str, Any]]:
+    cpu_count = os.cpu_count() or 1
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, (swept, n, d, k) in TARGETS.items():
+        if name_filter and name_filter not in name:
+            continue
+        rows = []
+        for workers, threads in configurations(swept, max_cores):
+            stats = measure(name, workers, threads, repeat)
+            rows.append({"workers": workers, "threads": threads, **stats})
+        results[name] = summarise(rows, cpu_count)
+        results[name]["params"] = {"n": n, "d": d, "k": k}
+        _print_target(name, results[name])
+        sys.stdout.flush()
+    return results
+
+
+def _print_target(name: str, summary: Dict[str, Any]) -> None:
+    params = summary.get("params", {})
+    print(f"\n{name} {params}")
+    print(f"{'workers':>8}{'threads':>8}{'median (s)':>12}{'speed-up':>10}{'efficiency':>12}")
+    for row in summary["rows"]:
+        flag = "  oversubscribed" if row["oversubscribed"] else ""
+        print(f"{row['workers']:>8}{row['threads']:>8}{row['median_s']:>12.4f}"
+              f"{row.get('speedup', float('nan')):>10.2f}{row.get('efficiency', float('nan')):>12.2f}{flag}")
+    best = summary["best"]
+    print(f"best: {best['workers']} worker(s) x {best['threads']} thread(s)")
+    if summary["oversubscription_penalty"] is not None:
+        print(f"oversubscription penalty: {summary['oversubscription_penalty']:.2f}x")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure parallel scaling of cluster_maker.")
+    parser.add_argument("--filter", default=None, help="only run targets whose name contains this")
+    parser.add_argument("--max-cores", type=int, default=None,
+                        help="largest worker/thread count (default: CPU count)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed samples per configuration")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--child", nargs=6, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        name, workers, n, d, k, repeat = args.child
+        print(json.dumps(_run_child(name, int(workers), int(n), int(d), int(k), int(repeat))))
+        return 0
+
+    max_cores = args.max_cores or os.cpu_count() or 1
+    if max_cores <= 0:
+        raise SystemExit("--max-cores must be a positive integer.")
+    print(f"CPU count {os.cpu_count()}, sweeping up to {max_cores} cores")
+    results = run_scaling(max_cores, repeat=args.repeat, name_filter=args.filter)
+    if args.output:
+        harness.save_results(args.output, results, extra={"max_cores": max_cores})
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
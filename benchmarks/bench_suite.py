@@ -0,0 +1,194 @@
+###
+## cluster_maker - function benchmark suite
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+"""
+Time the package's hot paths over grids of input sizes.
+
+Every case is a function evaluated at one point of an n (rows) x d
+(features) x k (clusters) grid, on data simulated with ``simulate_data``.
+Each case is warmed up, then timed ``--repeat`` times; results are written
+as JSON and can be compared with a saved baseline, failing (exit status 1)
+when any case is more than ``--threshold`` slower.
+
+Usage:
+    python benchmarks/bench_suite.py --grid quick --output current.json
+    python benchmarks/bench_suite.py --baseline baseline.json --threshold 0.2
+    python benchmarks/bench_suite.py --filter kmeans --repeat 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import harness
+
+import numpy as np
+
+from cluster_maker.algorithms import assign_clusters, kmeans, sklearn_kmeans, update_centroids
+from cluster_maker.data_analyser import column_summary
+from cluster_maker.data_exporter import export_summary
+from cluster_maker.evaluation import elbow_curve, silhouette_score_sklearn
+from cluster_maker.interface import run_clustering
+
+GRIDS = {
+    "quick": {"n": [1_000, 10_000], "d": [2, 8], "k": [3, 8]},
+    "full": {"n": [1_000, 10_000, 100_000], "d": [2, 8, 32], "k": [3, 8, 32]},
+}
+
+
+def _centroids(n: int, d: int, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    X = harness.make_matrix(n, d, k)
+    return X, X[np.random.RandomState(0).choice(n, size=k, replace=False)]
+
+
+def _setup_assign_clusters(n: int, d: int, k: int) -> Callable[[], Any]:
+    X, centroids = _centroids(n, d, k)
+    return lambda: assign_clusters(X, centroids)
+
+
+def _setup_update_centroids(n: int, d: int, k: int) -> Callable[[], Any]:
+    X, centroids = _centroids(n, d, k)
+    labels = assign_clusters(X, centroids)
+    return lambda: update_centroids(X, labels, k, random_state=0)
+
+
+def _setup_kmeans(n: int, d: int, k: int) -> Callable[[], Any]:
+    X = harness.make_matrix(n, d, k)
+    return lambda: kmeans(X, k, random_state=0)
+
+
+def _setup_sklearn_kmeans(n: int, d: int, k: int) -> Callable[[], Any]:
+    X = harness.make_matrix(n, d, k)
+    return lambda: sklearn_kmeans(X, k, random_state=0)
+
+
+def _setup_elbow_curve(n: int, d: int, k: int) -> Callable[[], Any]:
+    X = harness.make_matrix(n, d, k)
+    return lambda: elbow_curve(X, list(range(1, k + 1)), random_state=0)
+
+
+def _setup_silhouette(n: int, d: int, k: int) -> Callable[[], Any]:
+    X = harness.make_matrix(n, d, k)
+    labels = harness.make_dataset(n, d, k)["true_cluster"].to_numpy()
+    return lambda: silhouette_score_sklearn(X, labels)
+
+
+def _setup_simulate_data(n: int, d: int, k: int) -> Callable[[], Any]:
+    seed = harness.define_dataframe_structure(
+        [{"name": f"f{j}", "reps": [float(i + j) for i in range(k)]} for j in range(d)]
+    )
+    return lambda: harness.simulate_data(seed, n_points=n, random_state=0)
+
+
+def _setup_column_summary(n: int, d: int, k: int) -> Callable[[], Any]:
+    df = harness.make_dataset(n, d, k)
+    return lambda: column_summary(df)
+
+
+def _setup_export_summary(n: int, d: int, k: int, tmp: str) -> Callable[[], Any]:
+    summary = column_summary(harness.make_dataset(n, d, k))
+    csv_path, txt_path = os.path.join(tmp, "summary.csv"), os.path.join(tmp, "summary.txt")
+    return lambda: export_summary(summary, csv_path, txt_path)
+
+
+def _setup_run_clustering(n: int, d: int, k: int, tmp: str) -> Callable[[], Any]:
+    csv_path = os.path.join(tmp, f"data_{n}_{d}_{k}.csv")
+    harness.make_dataset(n, d, k).to_csv(csv_path, index=False)
+    feature_cols = [f"f{j}" for j in range(d)]
+    return lambda: run_clustering(
+        csv_path, feature_cols, k=k, random_state=0,
+        return_data=False, plots=False, silhouette_sample_size=5_000,
+    )
+
+
+# name -> (grid axes used, setup(n, d, k[, tmp]) -> callable, largest n, needs tmp dir)
+CASES: Dict[str, Tuple[Tuple[str, ...], Callable[..., Callable[[], Any]], Optional[int], bool]] = {
+    "assign_clusters": (("n", "d", "k"), _setup_assign_clusters, None, False),
+    "update_centroids": (("n", "d", "k"), _setup_update_centroids, None, False),
+    "kmeans": (("n", "d", "k"), _setup_kmeans, None, False),
+    "sklearn_kmeans": (("n", "d", "k"), _setup_sklearn_kmeans, None, False),
+    "elbow_curve": (("n", "d", "k"), _setup_elbow_curve, None, False),
+    # Exact silhouette is O(n^2) in time and memory.
+    "silhouette_score_sklearn": (("n", "d", "k"), _setup_silhouette, 10_000, False),
+    "simulate_data": (("n", "d", "k"), _setup_simulate_data, None, False),
+    "column_summary": (("n", "d"), _setup_column_summary, None, False),
+    "export_summary": (("d",), _setup_export_summary, None, True),
+    "run_clustering": (("n", "d", "k"), _setup_run_clustering, None, True),
+}
+
+
+def run_suite(
+    grid_name: str = "quick",
+    repeat: int = 5,
+    warmup: int = 1,
+    name_filter: Optional[str] = None,
+    verbose: bool = True,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Time every case (optionally only those whose name contains ``name_filter``).
+
+    Returns
+    -------
+    results : dict
+        Case name -> timing stats from ``harness.time_call`` plus "params".
+    """
+    axes = GRIDS[grid_name]
+    results: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, (used_axes, setup, max_n, needs_tmp) in CASES.items():
+            if name_filter and name_filter not in name:
+                continue
+            for params in harness.grid(**{axis: axes[axis] for axis in used_axes}):
+                if max_n is not None and params.get("n", 0) > max_n:
+                    continue
+                full = {"n": axes["n"][0], "d": axes["d"][0], "k": axes["k"][0], **params}
+                args = (full["n"], full["d"], full["k"]) + ((tmp,) if needs_tmp else ())
+                func = setup(*args)
+                stats = harness.time_call(func, repeat=repeat, warmup=warmup, min_time=0.05)
+                stats["params"] = params
+                case = harness.case_name(name, params)
+                results[case] = stats
+                if verbose:
+                    print(f"{case:<50}{stats['median_s'] * 1000:>12.3f} ms"
+                          f"  (min {stats['min_s'] * 1000:.3f})", flush=True)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark cluster_maker functions over n/d/k grids.")
+    parser.add_argument("--grid", choices=sorted(GRIDS), default="quick", help="size grid (default quick)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed samples per case (default 5)")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed calls per case (default 1)")
+    parser.add_argument("--filter", default=None, help="only run cases whose name contains this")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare with results saved by an earlier --output")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative slow-down counted as a regression (default 0.2)")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.grid, repeat=args.repeat, warmup=args.warmup, name_filter=args.filter)
+    if args.output:
+        harness.save_results(args.output, results, extra={"grid": args.grid})
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        rows = harness.compare(results, harness.load_results(args.baseline), threshold=args.threshold)
+        print()
+        harness.print_comparison(rows)
+        n_regressions = sum(row["regression"] for row in rows)
+        print(f"\n{n_regressions} of {len(rows)} cases slower than the baseline by more than "
+              f"{args.threshold:.0%}.")
+        if n_regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+###
+## cluster_maker - benchmark harness
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+"""
+Shared helpers for the scripts in ``benchmarks/``: synthetic inputs built
+with ``simulate_data``, warm-up plus repeated timing, JSON result files and
+comparison against a saved baseline.
+
+Only the standard library (plus cluster_maker's own dependencies) is used,
+so the benchmarks run offline.
+"""
+
+from __future__ import annotations
+
+import datetime
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from cluster_maker.dataframe_builder import define_dataframe_structure, simulate_data  # noqa: E402
+
+_DATASETS: Dict[Tuple[int, int, int, int], pd.DataFrame] = {}
+
+
+def make_dataset(n: int, d: int, k: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Simulated data with ``n`` rows, ``d`` features ("f0".."f{d-1}") and ``k``
+    well-separated clusters, plus the "true_cluster" column.
+
+    Datasets are memoised per (n, d, k, seed), since ``simulate_data`` is
+    itself slow for large n and most benchmarks reuse the same inputs.
+    """
+    key = (n, d, k, seed)
+    if key not in _DATASETS:
+        rng = np.random.RandomState(seed)
+        centres = rng.uniform(-10.0, 10.0, size=(k, d))
+        specs = [{"name": f"f{j}", "reps": list(centres[:, j])} for j in range(d)]
+        _DATASETS[key] = simulate_data(define_dataframe_structure(specs), n_points=n, random_state=seed)
+    return _DATASETS[key]
+
+
+def make_matrix(n: int, d: int, k: int, seed: int = 0) -> np.ndarray:
+    """Feature matrix of ``make_dataset`` as a float64 array."""
+    return make_dataset(n, d, k, seed)[[f"f{j}" for j in range(d)]].to_numpy(dtype=float)
+
+
+def clear_datasets() -> None:
+    """Drop the memoised datasets (e.g. before measuring memory)."""
+    _DATASETS.clear()
+
+
+def grid(**axes: Sequence[int]) -> Iterator[Dict[str, int]]:
+    """
+    Every combination of the given axes, e.g. ``grid(n=[1000, 10000], k=[3, 8])``.
+    Combinations with more clusters than points are skipped.
+    """
+    names = list(axes)
+    for values in itertools.product(*(axes[name] for name in names)):
+        params = dict(zip(names, values))
+        if params.get("k", 0) > params.get("n", float("inf")):
+            continue
+        yield params
+
+
+def case_name(name: str, params: Dict[str, Any]) -> str:
+    """Stable identifier such as ``assign_clusters[n=10000,d=2,k=3]``."""
+    return name + "[" + ",".join(f"{key}={value}" for key, value in params.items()) + "]"
+
+
+def time_call(
+    func: Callable[[], Any],
+    repeat: int = 5,
+    warmup: int = 1,
+    min_time: float = 0.0,
+) -> Dict[str, Any]:
+    """
+    Time ``func()`` after ``warmup`` untimed calls.
+
+    Parameters
+    ----------
+    func : callable
+        Zero-argument callable; build its inputs beforehand so that only the
+        work under test is timed.
+    repeat : int, default 5
+        Number of timed samples.
+    warmup : int, default 1
+        Untimed calls made first (imports, caches, BLAS thread start-up).
+    min_time : float, default 0.0
+        If positive, each sample loops ``func`` until at least this many
+        seconds have passed and reports the time per call, which keeps very
+        fast functions above the timer resolution.
+
+    Returns
+    -------
+    stats : dict
+        "median_s", "min_s", "mean_s", "stdev_s", "repeat" and "loops".
+    """
+    if repeat <= 0:
+        raise ValueError("repeat must be a positive integer.")
+    for _ in range(warmup):
+        func()
+
+    loops = 1
+    if min_time > 0:
+        start = time.perf_counter()
+        func()
+        once = time.perf_counter() - start
+        loops = max(1, int(min_time / max(once, 1e-9)))
+
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - start) / loops)
+
+    return {
+        "median_s": statistics.median(samples),
+        "min_s": min(samples),
+        "mean_s": statistics.fmean(samples) if hasattr(statistics, "fmean") else statistics.mean(samples),
+        "stdev_s": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "repeat": repeat,
+        "loops": loops,
+    }
+
+
+def environment() -> Dict[str, Any]:
+    """Machine and library versions stored alongside every result file."""
+    import sklearn
+
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+    }
+
+
+def save_results(path: str, results: Dict[str, Dict[str, Any]], extra: Optional[Dict[str, Any]] = None) -> None:
+    """Write ``{"environment": ..., "results": results}`` as JSON."""
+    payload = {"environment": environment(), "results": results}
+    if extra:
+        payload.update(extra)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    """Read the "results" mapping of a file written by ``save_results``."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float = 0.2,
+    metric: str = "median_s",
+) -> List[Dict[str, Any]]:
+    """
+    Compare ``results`` with ``baseline`` case by case.
+
+    Parameters
+    ----------
+    results, baseline : dict
+        Mappings from case name to stats, as returned by ``load_results``.
+    threshold : float, default 0.2
+        Relative slow-down above which a case counts as a regression
+        (0.2 means more than 20% slower than the baseline).
+    metric : str, default "median_s"
+        Statistic compared. Lower is better.
+
+    Returns
+    -------
+    rows : list of dict
+        One row per case present in both, with "case", "baseline", "current",
+        "ratio" and "regression".
+    """
+    if threshold < 0:
+        raise ValueError("threshold must be non-negative.")
+    rows = []
+    for name in sorted(set(results) & set(baseline)):
+        old = baseline[name].get(metric)
+        new = results[name].get(metric)
+        if not old or new is None:
+            continue
+        ratio = new / old
+        rows.append({
+            "case": name,
+            "baseline": old,
+            "current": new,
+            "ratio": ratio,
+            "regression": ratio > 1.0 + threshold,
+        })
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]], unit: str = "ms", scale: float = 1000.0) -> None:
+    """Print the output of ``compare`` as a table."""
+    width = max([len(row["case"]) for row in rows] + [4])
+    print(f"{'case':<{width}}{'baseline (' + unit + ')':>16}{'current (' + unit + ')':>16}{'ratio':>8}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"{row['case']:<{width}}{row['baseline'] * scale:>16.3f}{row['current'] * scale:>16.3f}"
+              f"{row['ratio']:>8.2f}{flag}")
@@ -15,35 +15,155 @@ Allowed libraries:
 - scikit-learn
 """
 
-# --- Data generation & basic analysis ---
-from .dataframe_builder import define_dataframe_structure, simulate_data
-from .data_analyser import calculate_descriptive_statistics, calculate_correlation, column_summary
-from .data_exporter import export_to_csv, export_formatted, export_summary
+import importlib
+import importlib.util
+import pkgutil
+from typing import TYPE_CHECKING
+
+# Submodules are imported on first attribute access (PEP 562), so that
+# ``import cluster_maker`` stays cheap: scikit-learn and matplotlib are only
+# loaded once a function that needs them is actually used.
+_SUBMODULE_ATTRS = {
+    # Data generation & basic analysis
+    "dataframe_builder": ["define_dataframe_structure", "simulate_data"],
+    "data_analyser": [
+        "calculate_descriptive_statistics",
+        "calculate_correlation",
+        "column_summary",
+    ],
+    "data_exporter": ["export_to_csv", "export_formatted", "export_summary"],
+    "data_loader": ["load_feature_matrix", "load_table_with_features"],
 
-# --- Preprocessing ---
-from .preprocessing import select_features, standardise_features, apply_pca
-
-# --- Clustering algorithms ---
-from .algorithms import (
-    kmeans,
-    sklearn_kmeans,
-    init_centroids,
-    assign_clusters,
-    update_centroids,
-)
-
-# --- Evaluation ---
-from .evaluation import (
-    compute_inertia,
-    silhouette_score_sklearn,
-    elbow_curve,
-)
+    # Preprocessing
+    "preprocessing": [
+        "select_features",
+        "standardise_features",
+        "apply_pca",
+        "FeatureScaler",
+        "merge_moments",
+    ],
+
+    # Clustering algorithms
+    "algorithms": [
+        "kmeans",
+        "sklearn_kmeans",
+        "init_centroids",
+        "assign_clusters",
+        "update_centroids",
+        "nearest_centroid",
+        "load_kmeans_checkpoint",
+        "bisecting_kmeans",
+        "cut_tree",
+    ],
+
+    "centroid_index": ["CentroidIndex"],
+    "distributed": ["distributed_kmeans", "run_worker"],
+    "coreset": ["lightweight_coreset", "streaming_coreset"],
+    "online": ["OnlineKMeans"],
 
-# --- Plotting ---
-from .plotting_clustered import plot_clusters_2d, plot_elbow
+    # Evaluation
+    "evaluation": ["compute_inertia", "silhouette_score_sklearn", "elbow_curve"],
 
-# --- High-level interface ---
-from .interface import run_clustering
+    # Plotting
+    "plotting_clustered": ["plot_clusters_2d", "plot_elbow"],
+    "render": ["render_figure", "render_figures"],
+
+    # High-level interface
+    "interface": ["run_clustering", "clustering_pipeline", "fit_clusters", "compute_metrics"],
+    "async_interface": ["run_clustering_async", "AsyncClusteringService"],
+
+    # Fitted models
+    "model": ["ClusterModel"],
+
+    # Batch processing
+    "batch": ["run_batch", "load_manifest"],
+
+    # Caching
+    "result_cache": ["ResultCache"],
+
+    # Parameter sweeps
+    "sweep": ["run_sweep"],
+}
+
+_ATTR_TO_SUBMODULE = {
+    attr: submodule
+    for submodule, attrs in _SUBMODULE_ATTRS.items()
+    for attr in attrs
+}
+
+if TYPE_CHECKING:
+    # --- Data generation & basic analysis ---
+    from .dataframe_builder import define_dataframe_structure, simulate_data
+    from .data_analyser import calculate_descriptive_statistics, calculate_correlation, column_summary
+    from .data_exporter import export_to_csv, export_formatted, export_summary
+    from .data_loader import load_feature_matrix, load_table_with_features
+
+    # --- Preprocessing ---
+    from .preprocessing import (
+        select_features, standardise_features, apply_pca, FeatureScaler, merge_moments,
+    )
+
+    # --- Clustering algorithms ---
+    from .algorithms import (
+        kmeans,
+        sklearn_kmeans,
+        init_centroids,
+        assign_clusters,
+        update_centroids,
+        nearest_centroid,
+        load_kmeans_checkpoint,
+        bisecting_kmeans,
+        cut_tree,
+    )
+    from .centroid_index import CentroidIndex
+    from .distributed import distributed_kmeans, run_worker
+    from .coreset import lightweight_coreset, streaming_coreset
+    from .online import OnlineKMeans
+
+    # --- Evaluation ---
+    from .evaluation import (
+        compute_inertia,
+        silhouette_score_sklearn,
+        elbow_curve,
+    )
+
+    # --- Plotting ---
+    from .plotting_clustered import plot_clusters_2d, plot_elbow
+    from .render import render_figure, render_figures
+
+    # --- High-level interface ---
+    from .interface import run_clustering, clustering_pipeline, fit_clusters, compute_metrics
+    from .async_interface import run_clustering_async, AsyncClusteringService
+
+    # --- Fitted models ---
+    from .model import ClusterModel
+
+    # --- Batch processing ---
+    from .batch import run_batch, load_manifest
+
+    # --- Caching ---
+    from .result_cache import ResultCache
+
+    # --- Parameter sweeps ---
+    from .sweep import run_sweep
+
+
+def __getattr__(name):
+    submodule = _ATTR_TO_SUBMODULE.get(name)
+    if submodule is not None:
+        value = getattr(importlib.import_module(f".{submodule}", __name__), name)
+        globals()[name] = value  # cache, so __getattr__ is not called again
+        return value
+    # Submodules are attributes too (e.g. cluster_maker.algorithms.kmeans);
+    # importing one binds it on the package.
+    if not name.startswith("_") and importlib.util.find_spec(f".{name}", __name__) is not None:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    submodules = {info.name for info in pkgutil.iter_modules(__path__) if not info.name.startswith("_")}
+    return sorted(set(globals()) | set(__all__) | submodules)
 
 
 __all__ = [
@@ -61,10 +181,16 @@ __all__ = [
     "export_formatted",
     "export_summary",
 
+    # Loading
+    "load_feature_matrix",
+    "load_table_with_features",
+
     # Preprocessing
     "select_features",
     "standardise_features",
     "apply_pca",
+    "FeatureScaler",
+    "merge_moments",
 
     # Algorithms
     "kmeans",
@@ -72,6 +198,16 @@ __all__ = [
     "init_centroids",
     "assign_clusters",
     "update_centroids",
+    "nearest_centroid",
+    "load_kmeans_checkpoint",
+    "bisecting_kmeans",
+    "cut_tree",
+    "CentroidIndex",
+    "distributed_kmeans",
+    "run_worker",
+    "lightweight_coreset",
+    "streaming_coreset",
+    "OnlineKMeans",
 
     # Evaluation
     "compute_inertia",
@@ -81,7 +217,27 @@ __all__ = [
     # Plotting
     "plot_clusters_2d",
     "plot_elbow",
+    "render_figure",
+    "render_figures",
 
     # High-level orchestration
     "run_clustering",
+    "clustering_pipeline",
+    "fit_clusters",
+    "compute_metrics",
+    "run_clustering_async",
+    "AsyncClusteringService",
+
+    # Fitted models
+    "ClusterModel",
+
+    # Batch processing
+    "run_batch",
+    "load_manifest",
+
+    # Caching
+    "ResultCache",
+
+    # Parameter sweeps
+    "run_sweep",
 ]
\ No newline at end of file
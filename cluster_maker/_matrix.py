@@ -0,0 +1,79 @@
+###
+## cluster_maker
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+"""
+Internal matrix helpers shared by the clustering modules (algorithms,
+evaluation, coreset, centroid_index, distributed and online).
+
+Contract: every function accepts a dense 2D ``ndarray`` or a CSR matrix
+as returned by ``check_input`` (other sparse formats must go through it
+first), never densifies sparse input, and raises ValueError/TypeError for
+invalid arguments. The module is not part of the public API; its
+functions are public only so that sibling modules do not reach into each
+other's private names.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+
+def check_input(X: Any) -> Any:
+    """Accept a NumPy array or a SciPy sparse matrix (converted to CSR)."""
+    if sp.issparse(X):
+        return X if X.format == "csr" else X.tocsr()
+    if not isinstance(X, np.ndarray):
+        raise TypeError("X must be a NumPy array or a SciPy sparse matrix.")
+    return X
+
+
+def row_norms_sq(X: Any) -> np.ndarray:
+    """Squared Euclidean norm of every row of a dense or CSR matrix."""
+    if sp.issparse(X):
+        return np.asarray(X.multiply(X).sum(axis=1)).ravel()
+    return np.einsum("ij,ij->i", X, X)
+
+
+def cluster_sums(
+    X: Any,
+    labels: np.ndarray,
+    k: int,
+    sample_weight: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-cluster (weighted) sums of the rows of X and cluster sizes (total
+    weights).
+
+    For CSR input the sums come from one sparse product with the (k, n)
+    one-hot assignment matrix, so only the non-zeros of X are visited.
+    """
+    counts = np.bincount(labels, weights=sample_weight, minlength=k)
+    if sp.issparse(X):
+        n_samples = X.shape[0]
+        values = np.ones(n_samples) if sample_weight is None else sample_weight
+        assignment = sp.csr_matrix(
+            (values, (labels, np.arange(n_samples))), shape=(k, n_samples)
+        )
+        sums = (assignment @ X).toarray()
+    else:
+        sums = np.zeros((k, X.shape[1]))
+        np.add.at(sums, labels, X if sample_weight is None else X * sample_weight[:, np.newaxis])
+    return sums, counts
+
+
+def check_sample_weight(sample_weight: Any, n_samples: int) -> Optional[np.ndarray]:
+    """Validate sample_weight: None, or n_samples non-negative finite floats."""
+    if sample_weight is None:
+        return None
+    sample_weight = np.asarray(sample_weight, dtype=float)
+    if sample_weight.shape != (n_samples,):
+        raise ValueError(f"sample_weight must have shape ({n_samples},), got {sample_weight.shape}.")
+    if not np.all(np.isfinite(sample_weight)) or np.any(sample_weight < 0):
+        raise ValueError("sample_weight must be finite and non-negative.")
+    return sample_weight
@@ -6,19 +6,30 @@
 
 from __future__ import annotations
 
-from typing import Tuple, Optional
+import hashlib
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple, Optional
 
 import numpy as np
+import scipy.sparse as sp
 from sklearn.cluster import KMeans
 
+from ._matrix import check_input, check_sample_weight, cluster_sums, row_norms_sq
+
 
 def init_centroids(
     X: np.ndarray,
     k: int,
     random_state: Optional[int] = None,
+    sample_weight: Optional[np.ndarray] = None,
 ) -> np.ndarray:
     """
     Initialise centroids by randomly sampling points from X without replacement.
+    With sample_weight, rows are drawn with probability proportional to their
+    weight. For sparse X only the k sampled rows are converted to dense centroids.
     """
     if k <= 0:
         raise ValueError("k must be a positive integer.")
@@ -27,14 +38,24 @@ def init_centroids(
         raise ValueError("k cannot be larger than the number of samples.")
 
     rng = np.random.RandomState(random_state)
-    indices = rng.choice(n_samples, size=k, replace=False)
+    if sample_weight is None:
+        indices = rng.choice(n_samples, size=k, replace=False)
+    else:
+        if np.count_nonzero(sample_weight) < k:
+            raise ValueError("k cannot be larger than the number of samples with positive weight.")
+        indices = rng.choice(n_samples, size=k, replace=False, p=sample_weight / sample_weight.sum())
+    if sp.issparse(X):
+        return X[indices].toarray()
     return X[indices]
 
 
 def assign_clusters(X: np.ndarray, centroids: np.ndarray) -> np.ndarray:
     """
     Assign each sample to the nearest centroid (Euclidean distance).
+    Sparse X is handled by ``nearest_centroid``, without densifying it.
     """
+    if sp.issparse(X):
+        return nearest_centroid(X, centroids)
     # X: (n_samples, n_features)
     # centroids: (k, n_features)
     # Broadcast to compute distances
@@ -44,16 +65,92 @@ def assign_clusters(X: np.ndarray, centroids: np.ndarray) -> np.ndarray:
     return labels
 
 
+def nearest_centroid(
+    X: np.ndarray,
+    centroids: np.ndarray,
+    block_size: Optional[int] = None,
+    return_distances: bool = False,
+):
+    """
+    Assign each sample to its nearest centroid, processing X in row blocks.
+
+    Uses the expansion ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2, so each block
+    costs one matrix product and only a (block_size, k) array is allocated,
+    instead of the (n_samples, k, n_features) array built by assign_clusters.
+    For CSR input each block is a sparse-dense product, so its cost is
+    proportional to the number of non-zeros.
+
+    Parameters
+    ----------
+    X : ndarray or CSR matrix of shape (n_samples, n_features)
+    centroids : ndarray of shape (k, n_features)
+    block_size : int or None, default None
+        Rows per block. Defaults to a size keeping each block's distance
+        matrix at roughly 8 MB.
+    return_distances : bool, default False
+        If True, also return the squared distance to the assigned centroid.
+
+    Returns
+    -------
+    labels : ndarray of shape (n_samples,)
+    sq_distances : ndarray of shape (n_samples,)
+        Only returned when ``return_distances`` is True.
+    """
+    n_samples = X.shape[0]
+    k = centroids.shape[0]
+    if block_size is None:
+        block_size = max(1, (1 << 20) // max(k, 1))
+
+    X = check_input(X)
+    centroids_t = np.ascontiguousarray(centroids.T)
+    centroid_sq = np.einsum("ij,ij->i", centroids, centroids)
+    row_sq = row_norms_sq(X) if return_distances else None
+
+    labels = np.empty(n_samples, dtype=np.intp)
+    sq_distances = np.empty(n_samples, dtype=float) if return_distances else None
+    for start in range(0, n_samples, block_size):
+        block = X[start:start + block_size]
+        scores = np.asarray(block @ centroids_t)
+        scores *= -2.0
+        scores += centroid_sq
+        block_labels = scores.argmin(axis=1)
+        labels[start:start + block_size] = block_labels
+        if return_distances:
+            best = scores[np.arange(block.shape[0]), block_labels]
+            best += row_sq[start:start + block_size]
+            sq_distances[start:start + block_size] = np.maximum(best, 0.0)
+
+    if return_distances:
+        return labels, sq_distances
+    return labels
+
+
 def update_centroids(
     X: np.ndarray,
     labels: np.ndarray,
     k: int,
     random_state: Optional[int] = None,
+    sample_weight: Optional[np.ndarray] = None,
 ) -> np.ndarray:
     """
     Update centroids by taking the mean of points in each cluster.
     If a cluster becomes empty, re-initialise its centroid randomly from X.
+    Sparse X is aggregated with a single sparse product (see cluster_sums).
+    With sample_weight each centroid is the weighted mean of its points, and
+    a cluster whose points all have zero weight counts as empty.
     """
+    sample_weight = check_sample_weight(sample_weight, X.shape[0])
+    if sp.issparse(X) or sample_weight is not None:
+        sums, counts = cluster_sums(X, labels, k, sample_weight)
+        new_centroids = sums / np.where(counts > 0, counts, 1)[:, np.newaxis]
+        rng = np.random.RandomState(random_state)
+        for cluster_id in np.flatnonzero(counts == 0):
+            # Empty cluster: re-initialise randomly, drawing in the same
+            # order as the dense loop below
+            idx = rng.randint(0, X.shape[0])
+            new_centroids[cluster_id] = _dense_row(X, idx)
+        return new_centroids
+
     n_features = X.shape[1]
     new_centroids = np.zeros((k, n_features), dtype=float)
     rng = np.random.RandomState(random_state)
@@ -76,13 +173,23 @@ def kmeans(
     max_iter: int = 300,
     tol: float = 1e-4,
     random_state: Optional[int] = None,
+    checkpoint_path: Optional[str] = None,
+    checkpoint_every: Optional[int] = None,
+    checkpoint_seconds: Optional[float] = None,
+    checkpoint_stats: bool = False,
+    resume: bool = False,
+    index: Optional[str] = None,
+    index_n_probe: int = 3,
+    init: Optional[np.ndarray] = None,
+    sample_weight: Optional[np.ndarray] = None,
 ) -> Tuple[np.ndarray, np.ndarray]:
     """
     Simple manual K-means implementation.
 
     Parameters
     ----------
-    X : ndarray of shape (n_samples, n_features)
+    X : ndarray or scipy.sparse matrix of shape (n_samples, n_features)
+        Sparse input is converted to CSR (never to a dense array).
     k : int
         Number of clusters.
     max_iter : int, default 300
@@ -90,50 +197,459 @@ def kmeans(
     tol : float, default 1e-4
         Convergence tolerance on centroid movement.
     random_state : int or None
+    checkpoint_path : str or None, default None
+        If given, the state of the fit is periodically saved to this
+        ``.npz`` file (see ``checkpoint_every`` / ``checkpoint_seconds``),
+        and once more when the loop ends.
+    checkpoint_every : int or None, default None
+        Save a checkpoint every this many iterations.
+    checkpoint_seconds : float or None, default None
+        Save a checkpoint when at least this many seconds have passed since
+        the last one. If neither interval is given, only the final state
+        is saved.
+    checkpoint_stats : bool, default False
+        If True, checkpoints also hold the per-cluster sums and counts of
+        the last assignment (the sufficient statistics of the update step).
+    resume : bool, default False
+        If True and ``checkpoint_path`` exists, continue from the saved
+        iteration instead of starting again. Every iteration depends only on
+        the current centroids and the seed of the fit, so a resumed fit
+        returns exactly the same result as an uninterrupted one. With
+        ``random_state=None`` and a ``checkpoint_path``, a seed is drawn once
+        for the fit and saved in the checkpoint, and a resumed fit reuses it.
+    index : {None, "exact", "approximate"}, default None
+        If given, points are assigned each iteration through a
+        ``CentroidIndex`` built over the current centroids, which pays off
+        when k is in the hundreds or more. "approximate" trades a little
+        accuracy for speed (see ``index_n_probe``).
+    index_n_probe : int, default 3
+        Coarse groups searched per point with ``index="approximate"``.
+    init : ndarray of shape (k, n_features) or None, default None
+        Initial centroids. If None, k rows of X are sampled (init_centroids).
+    sample_weight : ndarray of shape (n_samples,) or None, default None
+        Non-negative weight of each row, e.g. coreset weights or duplicate
+        counts. The fit minimises the weighted inertia: initial rows are
+        drawn in proportion to their weight and centroids are weighted means.
 
     Returns
     -------
     labels : ndarray of shape (n_samples,)
     centroids : ndarray of shape (k, n_features)
     """
-    if not isinstance(X, np.ndarray):
-        raise TypeError("X must be a NumPy array.")
+    X = check_input(X)
+    sample_weight = check_sample_weight(sample_weight, X.shape[0])
+    if checkpoint_every is not None and checkpoint_every <= 0:
+        raise ValueError("checkpoint_every must be a positive integer.")
+
+    start_iter = 0
+    converged = False
+    centroids = None
+    seed = random_state
+    fingerprint = None
+    if checkpoint_path is not None:
+        fingerprint = _data_fingerprint(X, sample_weight)
+        if resume and os.path.exists(checkpoint_path):
+            state = load_kmeans_checkpoint(checkpoint_path)
+            _check_checkpoint_matches(state, fingerprint, k, random_state)
+            centroids = state["centroids"]
+            start_iter = state["iteration"]
+            converged = state["converged"]
+            seed = state["seed"]
+        elif random_state is None:
+            # Fix the random draws of this fit so that a resume can replay them.
+            seed = int(np.random.randint(0, 2 ** 31 - 1))
+
+    if index is None:
+        assign = assign_clusters
+    else:
+        from .centroid_index import CentroidIndex
+
+        def assign(X: Any, centroids: np.ndarray) -> np.ndarray:
+            return CentroidIndex(
+                centroids, mode=index, n_probe=index_n_probe, random_state=seed
+            ).query(X)
+
+    if centroids is None and init is not None:
+        centroids = np.array(init, dtype=float)
+        if centroids.shape != (k, X.shape[1]):
+            raise ValueError(f"init must have shape ({k}, {X.shape[1]}), got {centroids.shape}.")
+    if centroids is None:
+        centroids = init_centroids(X, k, random_state=seed, sample_weight=sample_weight)
 
-    centroids = init_centroids(X, k, random_state=random_state)
-    for _ in range(max_iter):
-        labels = assign_clusters(X, centroids)
-        new_centroids = update_centroids(X, labels, k, random_state=random_state)
+    labels = None
+    last_save = time.monotonic()
+    iteration = start_iter
+    while not converged and iteration < max_iter:
+        labels = assign(X, centroids)
+        new_centroids = update_centroids(
+            X, labels, k, random_state=seed, sample_weight=sample_weight
+        )
         shift = np.linalg.norm(new_centroids - centroids)
         centroids = new_centroids
+        iteration += 1
         if shift < tol:
-            break
+            converged = True
 
-    labels = assign_clusters(X, centroids)
+        if checkpoint_path is not None and not converged and (
+            (checkpoint_every is not None and iteration % checkpoint_every == 0)
+            or (checkpoint_seconds is not None and time.monotonic() - last_save >= checkpoint_seconds)
+        ):
+            _save_kmeans_checkpoint(
+                checkpoint_path, X, k, random_state, seed, fingerprint, centroids,
+                iteration, converged, labels if checkpoint_stats else None, sample_weight,
+            )
+            last_save = time.monotonic()
+
+    if checkpoint_path is not None and iteration > start_iter:
+        _save_kmeans_checkpoint(
+            checkpoint_path, X, k, random_state, seed, fingerprint, centroids,
+            iteration, converged, labels if checkpoint_stats else None, sample_weight,
+        )
+
+    labels = assign(X, centroids)
     return labels, centroids
 
 
+def _data_fingerprint(X: np.ndarray, sample_weight: Optional[np.ndarray] = None) -> str:
+    """
+    Identity check for X: a hash of its shape and every value (and of the
+    weights, if any). Computed once per fit, it costs about one pass over
+    X, less than a single assignment step.
+    """
+    digest = hashlib.sha1(repr(X.shape).encode("utf-8"))
+    if sp.issparse(X):
+        X = sp.csr_matrix(X)
+        for part in (X.indptr, X.indices, X.data.astype(float, copy=False)):
+            digest.update(memoryview(np.ascontiguousarray(part)))
+    else:
+        digest.update(memoryview(np.ascontiguousarray(X, dtype=float)))
+    if sample_weight is not None:
+        digest.update(memoryview(np.ascontiguousarray(sample_weight, dtype=float)))
+    return digest.hexdigest()
+
+
+def _save_kmeans_checkpoint(
+    path: str,
+    X: np.ndarray,
+    k: int,
+    random_state: Optional[int],
+    seed: Optional[int],
+    fingerprint: str,
+    centroids: np.ndarray,
+    iteration: int,
+    converged: bool,
+    labels: Optional[np.ndarray],
+    sample_weight: Optional[np.ndarray] = None,
+) -> None:
+    """Atomically write the state of a kmeans fit."""
+    arrays: Dict[str, Any] = {
+        "centroids": centroids,
+        "iteration": np.array(iteration),
+        "converged": np.array(converged),
+        "k": np.array(k),
+        "random_state": np.array(-1 if random_state is None else random_state),
+        "seed": np.array(-1 if seed is None else seed),
+        "data_fingerprint": np.array(fingerprint),
+    }
+    if labels is not None:
+        arrays["sums"], arrays["counts"] = cluster_sums(X, labels, k, sample_weight)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def load_kmeans_checkpoint(path: str) -> Dict[str, Any]:
+    """
+    Read a checkpoint written by ``kmeans``.
+
+    Returns
+    -------
+    state : dict
+        "centroids", "iteration" (completed iterations), "converged", "k",
+        "random_state", "seed" (the one used by the fit, drawn when
+        random_state is None) and, if saved with ``checkpoint_stats=True``, the
+        per-cluster "sums" and "counts" of the last assignment.
+    """
+    with np.load(path, allow_pickle=False) as data:
+        state: Dict[str, Any] = {
+            "centroids": data["centroids"],
+            "iteration": int(data["iteration"]),
+            "converged": bool(data["converged"]),
+            "k": int(data["k"]),
+            "random_state": None if int(data["random_state"]) == -1 else int(data["random_state"]),
+            "seed": None if int(data["seed"]) == -1 else int(data["seed"]),
+            "data_fingerprint": str(data["data_fingerprint"]),
+        }
+        for name in ("sums", "counts"):
+            if name in data.files:
+                state[name] = data[name]
+    return state
+
+
+def _check_checkpoint_matches(
+    state: Dict[str, Any],
+    fingerprint: str,
+    k: int,
+    random_state: Optional[int],
+) -> None:
+    if state["k"] != k or state["random_state"] != random_state:
+        raise ValueError("Checkpoint was written with a different k or random_state.")
+    if state["data_fingerprint"] != fingerprint:
+        raise ValueError("Checkpoint was written for different data.")
+
+
+def _node_stats(X: Any, row_sq: np.ndarray, indices: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Mean and within-node SSE of the rows ``indices`` of X."""
+    rows = X[indices]
+    centroid = np.asarray(rows.mean(axis=0)).ravel()
+    # sum ||x - c||^2 = sum ||x||^2 - n ||c||^2 when c is the mean
+    sse = float(row_sq[indices].sum() - indices.size * centroid @ centroid)
+    return centroid, max(sse, 0.0)
+
+
+def _dense_row(X: Any, i: int) -> np.ndarray:
+    row = X[i]
+    return (row.toarray() if sp.issparse(row) else np.asarray(row, dtype=float)).ravel()
+
+
+def _bisect(
+    X: Any,
+    row_sq: np.ndarray,
+    indices: np.ndarray,
+    seed: Optional[int],
+) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Split the rows ``indices`` of X in two with 2-means; None if they cannot be split."""
+    if indices.size < 2:
+        return None
+    rows = X[indices]
+    # k-means++ seeding: a random row, then a row drawn with probability
+    # proportional to its squared distance from the first.
+    rng = np.random.RandomState(seed)
+    first = _dense_row(rows, rng.randint(indices.size))
+    sq_dist = row_sq[indices] - 2.0 * np.asarray(rows @ first).ravel() + first @ first
+    sq_dist = np.maximum(sq_dist, 0.0)
+    if sq_dist.sum() <= 0:
+        return None
+    second = _dense_row(rows, rng.choice(indices.size, p=sq_dist / sq_dist.sum()))
+    init = np.vstack([first, second])
+
+    labels, _ = kmeans(rows, 2, random_state=seed, init=init)
+    left, right = indices[labels == 0], indices[labels == 1]
+    if left.size == 0 or right.size == 0:
+        return None
+    return left, right
+
+
+def bisecting_kmeans(
+    X: np.ndarray,
+    k: int,
+    random_state: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    return_tree: bool = False,
+):
+    """
+    Bisecting K-means: repeatedly split clusters in two with 2-means.
+
+    Starting from one cluster holding every point, each round splits the
+    leaves with the largest SSE (as many as are needed to reach k, at most
+    all of them), running each split only on the points of its own leaf.
+    The splits of a round are independent and run in parallel threads.
+    Every round touches each point at most once and there are about
+    log2(k) rounds, so a fit costs O(n log k) distance evaluations per
+    pass instead of the O(n k) of flat K-means.
+
+    Parameters
+    ----------
+    X : ndarray or scipy.sparse matrix of shape (n_samples, n_features)
+    k : int
+        Number of clusters (leaves).
+    random_state : int or None
+        Seed; every split derives its own seed from it and its node id, so
+        results do not depend on thread scheduling.
+    max_workers : int or None, default None
+        Threads used for the splits of a round. Defaults to the number of
+        CPUs; with 1 the splits run one after another.
+    return_tree : bool, default False
+        If True, also return the split tree (see below), from which coarser
+        clusterings are obtained with ``cut_tree`` without refitting.
+
+    Returns
+    -------
+    labels : ndarray of shape (n_samples,)
+    centroids : ndarray of shape (k, n_features)
+        Mean of each leaf.
+    tree : dict
+        Only returned when ``return_tree`` is True. Arrays indexed by node id
+        (the root is node 0): "parent" (-1 for the root), "children"
+        (n_nodes, 2; -1 for leaves), "centroids", "sizes", "sse", plus
+        "leaf_nodes" (node id of each final cluster label) and "split_order"
+        (node ids in the order they were split).
+    """
+    X = check_input(X)
+    n_samples = X.shape[0]
+    if k <= 0:
+        raise ValueError("k must be a positive integer.")
+    if k > n_samples:
+        raise ValueError("k cannot be larger than the number of samples.")
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers <= 0:
+        raise ValueError("max_workers must be a positive integer.")
+
+    row_sq = row_norms_sq(X)
+    members: List[np.ndarray] = [np.arange(n_samples)]
+    parent: List[int] = [-1]
+    children: List[List[int]] = [[-1, -1]]
+    root_centroid, root_sse = _node_stats(X, row_sq, members[0])
+    centroids: List[np.ndarray] = [root_centroid]
+    sse: List[float] = [root_sse]
+    sizes: List[int] = [n_samples]
+    leaves = [0]
+    unsplittable = set()
+    split_order: List[int] = []
+
+    def seed_for(node: int) -> Optional[int]:
+        return None if random_state is None else (random_state * 1_000_003 + node) % (2 ** 32)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
+    try:
+        while len(leaves) < k:
+            candidates = sorted(
+                (node for node in leaves if node not in unsplittable),
+                key=lambda node: sse[node],
+                reverse=True,
+            )[:k - len(leaves)]
+            if not candidates:
+                raise ValueError(f"X has fewer than k={k} distinct points.")
+
+            args = [(X, row_sq, members[node], seed_for(node)) for node in candidates]
+            if executor is None or len(candidates) == 1:
+                splits = [_bisect(*a) for a in args]
+            else:
+                splits = list(executor.map(lambda a: _bisect(*a), args))
+
+            for node, split in zip(candidates, splits):
+                if split is None:
+                    unsplittable.add(node)
+                    continue
+                leaves.remove(node)
+                split_order.append(node)
+                for side, indices in enumerate(split):
+                    child = len(members)
+                    members.append(indices)
+                    parent.append(node)
+                    children.append([-1, -1])
+                    children[node][side] = child
+                    child_centroid, child_sse = _node_stats(X, row_sq, indices)
+                    centroids.append(child_centroid)
+                    sse.append(child_sse)
+                    sizes.append(indices.size)
+                    leaves.append(child)
+                members[node] = None  # only the leaves' memberships are kept
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    leaves.sort()
+    labels = np.empty(n_samples, dtype=np.intp)
+    for label, node in enumerate(leaves):
+        labels[members[node]] = label
+    leaf_centroids = np.vstack([centroids[node] for node in leaves])
+
+    if not return_tree:
+        return labels, leaf_centroids
+    tree = {
+        "parent": np.array(parent, dtype=np.intp),
+        "children": np.array(children, dtype=np.intp),
+        "centroids": np.vstack(centroids),
+        "sizes": np.array(sizes, dtype=np.intp),
+        "sse": np.array(sse),
+        "leaf_nodes": np.array(leaves, dtype=np.intp),
+        "split_order": np.array(split_order, dtype=np.intp),
+    }
+    return labels, leaf_centroids, tree
+
+
+def cut_tree(
+    tree: Dict[str, np.ndarray],
+    labels: np.ndarray,
+    n_clusters: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Coarser clustering from a ``bisecting_kmeans`` split tree.
+
+    Keeps only the first ``n_clusters - 1`` splits, i.e. the clustering the
+    algorithm had when it reached ``n_clusters`` leaves.
+
+    Parameters
+    ----------
+    tree : dict
+        Split tree returned by ``bisecting_kmeans(..., return_tree=True)``.
+    labels : ndarray of shape (n_samples,)
+        Labels returned with the tree.
+    n_clusters : int
+        Between 1 and the number of leaves of the tree.
+
+    Returns
+    -------
+    labels : ndarray of shape (n_samples,)
+    centroids : ndarray of shape (n_clusters, n_features)
+    """
+    n_leaves = tree["leaf_nodes"].size
+    if not 1 <= n_clusters <= n_leaves:
+        raise ValueError(f"n_clusters must be between 1 and {n_leaves}.")
+
+    active = {0}
+    for node in tree["split_order"][:n_clusters - 1]:
+        active.remove(int(node))
+        active.update(int(child) for child in tree["children"][node])
+    active_nodes = sorted(active)
+    position = {node: i for i, node in enumerate(active_nodes)}
+
+    # Map every final leaf to its ancestor among the active nodes.
+    leaf_to_label = np.empty(n_leaves, dtype=np.intp)
+    for label, node in enumerate(tree["leaf_nodes"]):
+        ancestor = int(node)
+        while ancestor not in position:
+            ancestor = int(tree["parent"][ancestor])
+        leaf_to_label[label] = position[ancestor]
+    return leaf_to_label[labels], tree["centroids"][active_nodes]
+
+
 def sklearn_kmeans(
     X: np.ndarray,
     k: int,
     random_state: Optional[int] = None,
+    sample_weight: Optional[np.ndarray] = None,
 ) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Thin wrapper around scikit-learn's KMeans.
+    Thin wrapper around scikit-learn's KMeans (which accepts CSR input).
+
+    ``sample_weight`` (non-negative, one per row) is passed to
+    ``KMeans.fit``, which then minimises the weighted inertia.
 
     Returns
     -------
     labels : ndarray of shape (n_samples,)
     centroids : ndarray of shape (k, n_features)
     """
-    if not isinstance(X, np.ndarray):
-        raise TypeError("X must be a NumPy array.")
+    X = check_input(X)
+    sample_weight = check_sample_weight(sample_weight, X.shape[0])
 
     model = KMeans(
         n_clusters=k,
         random_state=random_state,
         n_init=10,
     )
-    model.fit(X)
+    model.fit(X, sample_weight=sample_weight)
     labels = model.labels_
     centroids = model.cluster_centers_
     return labels, centroids
\ No newline at end of file
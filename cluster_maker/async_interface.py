@@ -0,0 +1,132 @@
+###
+## cluster_maker
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .interface import clustering_pipeline
+from .preprocessing import FeatureScaler
+
+
+async def run_clustering_async(
+    input_path: str,
+    feature_cols: List[str],
+    algorithm: str = "kmeans",
+    k: int = 3,
+    standardise: bool = True,
+    output_path: Optional[str] = None,
+    random_state: Optional[int] = None,
+    compute_elbow: bool = False,
+    elbow_k_values: Optional[List[int]] = None,
+    use_pca: bool = False,
+    pca_components: int = 2,
+    pca_solver: str = "auto",
+    scaler: Optional[FeatureScaler] = None,
+    dtype: Any = np.float64,
+    cache_matrix: bool = False,
+    return_data: bool = True,
+    plots: bool = False,
+    silhouette_sample_size: Optional[int] = None,
+    coreset_size: Optional[int] = None,
+    deduplicate: bool = False,
+    executor: Optional[Executor] = None,
+) -> Dict[str, Any]:
+    """
+    Asynchronous version of ``run_clustering`` for use inside an event loop.
+
+    The stages are those of ``clustering_pipeline``, shared with
+    ``run_clustering``. Every blocking stage (CSV reading, standardisation,
+    PCA, clustering, metrics, elbow curve, export and plotting) runs in
+    ``executor`` via ``loop.run_in_executor``, so the event loop keeps serving other requests
+    while a job is in progress. The coroutine yields between stages: if it is
+    cancelled, the stage already running finishes in the background and its
+    result is discarded, and no further stage is started.
+
+    Parameters are those of ``run_clustering`` (without ``result_cache`` and
+    the profiling options), except that ``plots`` defaults to False, plus:
+
+    executor : concurrent.futures.Executor or None, default None
+        Executor for the blocking stages. None uses the loop's default
+        thread pool. A ProcessPoolExecutor also works, at the cost of
+        sending each stage's arrays to the worker process.
+
+    Returns
+    -------
+    result : dict
+        Same keys as ``run_clustering``; "cached" is always False and
+        "profile" is None.
+    """
+    loop = asyncio.get_running_loop()
+    pipeline = clustering_pipeline(
+        input_path, feature_cols, algorithm=algorithm, k=k, standardise=standardise,
+        output_path=output_path, random_state=random_state, compute_elbow=compute_elbow,
+        elbow_k_values=elbow_k_values, use_pca=use_pca, pca_components=pca_components,
+        pca_solver=pca_solver, scaler=scaler, dtype=dtype, cache_matrix=cache_matrix,
+        return_data=return_data, plots=plots, silhouette_sample_size=silhouette_sample_size,
+        coreset_size=coreset_size, deduplicate=deduplicate,
+    )
+
+    value = None
+    while True:
+        try:
+            _, func, args = pipeline.send(value)
+        except StopIteration as stop:
+            result = stop.value
+            break
+        value = await loop.run_in_executor(executor, functools.partial(func, *args))
+
+    result["profile"] = None
+    return result
+
+
+class AsyncClusteringService:
+    """
+    Concurrency-limited front end to ``run_clustering_async``.
+
+    A service process typically creates one instance and calls
+    :meth:`run_clustering` from its request handlers. At most
+    ``max_concurrency`` jobs run at once; further requests wait (without
+    blocking the event loop) until a slot is free.
+
+    Parameters
+    ----------
+    max_concurrency : int, default 4
+    executor : concurrent.futures.Executor or None, default None
+        Executor shared by all jobs; None uses the loop's default pool.
+    """
+
+    def __init__(self, max_concurrency: int = 4, executor: Optional[Executor] = None) -> None:
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be a positive integer.")
+        self.max_concurrency = max_concurrency
+        self.executor = executor
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.active = 0
+
+    async def run_clustering(self, input_path: str, feature_cols: List[str], **kwargs: Any) -> Dict[str, Any]:
+        """
+        Run ``run_clustering_async`` once a concurrency slot is available.
+
+        Keyword arguments are passed to ``run_clustering_async``; the
+        service's executor is used unless one is given explicitly.
+        """
+        # Created lazily so that it belongs to the running event loop.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        kwargs.setdefault("executor", self.executor)
+
+        async with self._semaphore:
+            self.active += 1
+            try:
+                return await run_clustering_async(input_path, feature_cols, **kwargs)
+            finally:
+                self.active -= 1
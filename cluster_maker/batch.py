@@ -0,0 +1,297 @@
+###
+## cluster_maker
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+METRIC_COLUMNS = [
+    "job_id",
+    "input_path",
+    "status",
+    "error",
+    "n_samples",
+    "algorithm",
+    "k",
+    "inertia",
+    "silhouette",
+    "elapsed_s",
+]
+
+
+class JobTimeoutError(TimeoutError):
+    """Raised inside a worker when a job exceeds its time limit."""
+
+
+def _raise_timeout(signum, frame):
+    raise JobTimeoutError("Job exceeded its time limit.")
+
+
+def load_manifest(path: str) -> List[Dict[str, Any]]:
+    """
+    Read a batch manifest describing one clustering job per entry.
+
+    Supported formats:
+    - ``.jsonl``: one JSON object per line;
+    - ``.json``: a JSON list of objects;
+    - ``.csv``: one job per row, with ``feature_cols`` (and
+      ``elbow_k_values``) separated by ";". Only the known integer and
+      boolean parameters of ``run_clustering`` are converted; every other
+      column (paths, names, "job_id", ...) is kept as a string.
+
+    Each job must contain "input_path" and "feature_cols"; any other keys are
+    passed to ``run_clustering`` (e.g. "k", "algorithm", "standardise").
+    An optional "job_id" names the job in the metrics table.
+
+    Parameters
+    ----------
+    path : str
+
+    Returns
+    -------
+    jobs : list of dict
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"The manifest file '{path}' does not exist.")
+
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".jsonl":
+        with open(path, encoding="utf-8") as f:
+            jobs = [json.loads(line) for line in f if line.strip()]
+    elif ext == ".json":
+        with open(path, encoding="utf-8") as f:
+            jobs = json.load(f)
+    elif ext == ".csv":
+        table = pd.read_csv(path, dtype=str, keep_default_na=False)
+        jobs = []
+        jobs = [
+            {key: _parse_csv_value(key, value) for key, value in record.items() if value != ""}
+            for record in table.to_dict(orient="records")
+        ]
+    else:
+        raise ValueError(f"Unsupported manifest format '{ext}'. Use .jsonl, .json or .csv.")
+
+    for i, job in enumerate(jobs):
+        if "input_path" not in job or "feature_cols" not in job:
+            raise ValueError(f"Manifest entry {i} must have 'input_path' and 'feature_cols'.")
+    return jobs
+
+
+# run_clustering parameters converted from CSV manifest cells; any other
+# column is passed through as a string.
+_CSV_INT_COLUMNS = ("k", "random_state", "pca_components", "silhouette_sample_size", "coreset_size")
+_CSV_BOOL_COLUMNS = ("standardise", "compute_elbow", "use_pca", "cache_matrix", "deduplicate")
+
+
+def _parse_csv_value(key: str, value: str) -> Any:
+    """Convert one CSV manifest cell to the type of its parameter."""
+    if key == "feature_cols":
+        return [col.strip() for col in value.split(";")]
+    try:
+        if key == "elbow_k_values":
+            return [int(k) for k in value.split(";")]
+        if key in _CSV_INT_COLUMNS:
+            return int(value)
+    except ValueError:
+        raise ValueError(f"Manifest column '{key}' must hold integers, got '{value}'.") from None
+    if key in _CSV_BOOL_COLUMNS:
+        lowered = value.strip().lower()
+        if lowered not in ("true", "false"):
+            raise ValueError(f"Manifest column '{key}' must be true or false, got '{value}'.")
+        return lowered == "true"
+    return value
+
+
+def _run_job(job: Dict[str, Any], timeout: Optional[float]) -> Dict[str, Any]:
+    """Run one job in a worker and return its metrics row; never raises."""
+    from .interface import run_clustering
+
+    params = dict(job)
+    job_id = params.pop("job_id", None)
+    row: Dict[str, Any] = {
+        "job_id": job_id,
+        "input_path": params.get("input_path"),
+        "algorithm": params.get("algorithm", "kmeans"),
+        "k": params.get("k", 3),
+        "status": "ok",
+        "error": None,
+    }
+    # Workers only report metrics: figures and the full table are never built.
+    params["plots"] = False
+    params["return_data"] = False
+
+    use_alarm = timeout is not None and hasattr(signal, "setitimer")
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    start = time.perf_counter()
+    try:
+        result = run_clustering(**params)
+        row["n_samples"] = len(result["labels"])
+        row["inertia"] = result["metrics"]["inertia"]
+        row["silhouette"] = result["metrics"]["silhouette"]
+    except JobTimeoutError:
+        row["status"] = "timeout"
+        row["error"] = f"Timed out after {timeout} s."
+    except Exception as exc:
+        row["status"] = "error"
+        row["error"] = f"{type(exc).__name__}: {exc}"
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+    row["elapsed_s"] = time.perf_counter() - start
+    return row
+
+
+def _worker_died_row(job: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "job_id": job["job_id"],
+        "input_path": job.get("input_path"),
+        "status": "error",
+        "error": "Worker process terminated abruptly.",
+    }
+
+
+def _run_isolated(job: Dict[str, Any], timeout: Optional[float]) -> Dict[str, Any]:
+    """Re-run one job alone in a fresh single-worker pool."""
+    executor = ProcessPoolExecutor(max_workers=1)
+    try:
+        return executor.submit(_run_job, job, timeout).result()
+    except BrokenProcessPool:
+        return _worker_died_row(job)
+    finally:
+        executor.shutdown(wait=True)
+
+
+def run_batch(
+    jobs: List[Dict[str, Any]],
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    defaults: Optional[Dict[str, Any]] = None,
+) -> pd.DataFrame:
+    """
+    Run ``run_clustering`` for many inputs in a pool of worker processes.
+
+    Parameters
+    ----------
+    jobs : list of dict
+        One dict of ``run_clustering`` arguments per job (see load_manifest).
+    max_workers : int or None, default None
+        Number of worker processes. Defaults to the number of CPUs. At most
+        twice this many jobs are queued at any time.
+    timeout : float or None, default None
+        Per-job time limit in seconds. A job that exceeds it is interrupted
+        inside its worker and reported with status "timeout". Enforced with
+        SIGALRM, so only on platforms that provide it, and only between
+        Python bytecodes: a job blocked in one long C call (e.g. a large
+        BLAS operation inside scikit-learn) is interrupted when that call
+        returns, not at the deadline.
+    defaults : dict or None, default None
+        Arguments applied to every job unless the job overrides them.
+
+    Returns
+    -------
+    metrics : pandas.DataFrame
+        One row per job, in manifest order, with columns METRIC_COLUMNS.
+        Failed jobs have status "error" or "timeout" and an error message;
+        they do not stop the rest of the batch.
+
+    Notes
+    -----
+    If a worker process dies (e.g. killed for using too much memory), the
+    pool breaks and every job in flight on it loses its result, although
+    usually only one of them caused it. Those jobs are run again afterwards,
+    one at a time in a fresh pool each; only a job that breaks its pool
+    again is reported as "Worker process terminated abruptly."
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers <= 0:
+        raise ValueError("max_workers must be a positive integer.")
+    if timeout is not None and timeout <= 0:
+        raise ValueError("timeout must be positive.")
+
+    pending = [
+        (i, {**(defaults or {}), **job, "job_id": job.get("job_id", i)})
+        for i, job in enumerate(jobs)
+    ]
+    pending.reverse()  # pop() from the end keeps manifest order
+    rows: Dict[int, Dict[str, Any]] = {}
+    suspects: List[Any] = []
+
+    while pending:
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+        in_flight = {}
+        broken = False
+        try:
+            while (pending or in_flight) and not broken:
+                while pending and len(in_flight) < 2 * max_workers:
+                    index, job = pending.pop()
+                    in_flight[executor.submit(_run_job, job, timeout)] = (index, job)
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, job = in_flight.pop(future)
+                    try:
+                        rows[index] = future.result()
+                    except BrokenProcessPool:
+                        suspects.append((index, job))
+                        broken = True
+            # A worker died: any job in flight may have caused it, so retry
+            # them all in isolation and carry on with a fresh pool.
+            suspects.extend(in_flight.values())
+        finally:
+            executor.shutdown(wait=True)
+
+    for index, job in sorted(suspects, key=lambda item: item[0]):
+        rows[index] = _run_isolated(job, timeout)
+
+    metrics = pd.DataFrame([rows[i] for i in sorted(rows)])
+    return metrics.reindex(columns=METRIC_COLUMNS)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point: ``python -m cluster_maker.batch MANIFEST``."""
+    parser = argparse.ArgumentParser(
+        description="Run run_clustering over every job in a manifest, in parallel."
+    )
+    parser.add_argument("manifest", help="job manifest (.jsonl, .json or .csv)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    parser.add_argument("--timeout", type=float, default=None, help="per-job time limit (s)")
+    parser.add_argument("--output", default=None, help="write the metrics table to this CSV")
+    args = parser.parse_args(argv)
+
+    try:
+        jobs = load_manifest(args.manifest)
+    except (OSError, ValueError) as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+
+    print(f"Running {len(jobs)} jobs...")
+    metrics = run_batch(jobs, max_workers=args.workers, timeout=args.timeout)
+    print(metrics.to_string(index=False))
+
+    n_failed = int((metrics["status"] != "ok").sum())
+    print(f"\n{len(metrics) - n_failed} succeeded, {n_failed} failed.")
+    if args.output:
+        metrics.to_csv(args.output, index=False)
+        print(f"Metrics written to {args.output}")
+    return 0 if n_failed == 0 else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+###
+## cluster_maker
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+from __future__ import annotations
+
+from typing import Any, List, Optional, Tuple, Union
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.spatial import cKDTree
+
+from ._matrix import check_input, row_norms_sq
+from .algorithms import kmeans, nearest_centroid
+
+# Above this many dimensions a kd-tree prunes almost nothing, so the exact
+# mode falls back to the blocked brute-force search.
+KD_TREE_MAX_DIM = 16
+
+
+class CentroidIndex:
+    """
+    Nearest-centroid search structure, for k in the hundreds or thousands.
+
+    Parameters
+    ----------
+    centroids : ndarray of shape (k, n_features)
+    mode : {"exact", "approximate"}, default "exact"
+        "exact" always returns the true nearest centroid. It uses a kd-tree
+        (scipy.spatial.cKDTree) over the centroids when n_features is at
+        most KD_TREE_MAX_DIM and dense input is queried, and the blocked
+        brute-force ``nearest_centroid`` otherwise.
+        "approximate" groups the centroids into ``n_groups`` coarse groups
+        (k-means on the centroids themselves). A query scores the group
+        centres, then searches only the centroids of its ``n_probe`` closest
+        groups, which costs about k * n_probe / n_groups + n_groups distance
+        evaluations per point instead of k.
+    n_groups : int or None, default None
+        Number of coarse groups; defaults to about sqrt(k).
+    n_probe : int, default 3
+        Groups searched per query point in approximate mode: the recall
+        knob. Larger values find the true nearest centroid more often at a
+        higher cost; ``n_probe >= n_groups`` makes the search exact.
+    random_state : int or None, default None
+        Seed for the coarse grouping.
+    """
+
+    def __init__(
+        self,
+        centroids: np.ndarray,
+        mode: str = "exact",
+        n_groups: Optional[int] = None,
+        n_probe: int = 3,
+        random_state: Optional[int] = None,
+    ) -> None:
+        if mode not in ("exact", "approximate"):
+            raise ValueError("mode must be 'exact' or 'approximate'.")
+        if n_probe <= 0:
+            raise ValueError("n_probe must be a positive integer.")
+        self.centroids = np.ascontiguousarray(centroids, dtype=float)
+        if self.centroids.ndim != 2 or self.centroids.shape[0] == 0:
+            raise ValueError("centroids must be a non-empty 2D array.")
+        self.mode = mode
+        self.n_probe = n_probe
+        self._centroid_sq = np.einsum("ij,ij->i", self.centroids, self.centroids)
+
+        k, n_features = self.centroids.shape
+        self._tree = None
+        if mode == "exact" and n_features <= KD_TREE_MAX_DIM:
+            self._tree = cKDTree(self.centroids)
+
+        self.n_groups = 0
+        self._groups: List[np.ndarray] = []
+        if mode == "approximate":
+            if n_groups is None:
+                n_groups = int(round(np.sqrt(k)))
+            n_groups = max(1, min(n_groups, k))
+            group_labels, self._group_centres = kmeans(
+                self.centroids, n_groups, max_iter=20, random_state=random_state
+            )
+            self._groups = [np.flatnonzero(group_labels == g) for g in range(n_groups)]
+            # update_centroids re-seeds empty groups, so every group has members
+            # except in degenerate cases (duplicate centroids); drop those.
+            keep = [g for g, members in enumerate(self._groups) if members.size]
+            self._groups = [self._groups[g] for g in keep]
+            self._group_centres = self._group_centres[keep]
+            self.n_groups = len(self._groups)
+
+    @property
+    def n_clusters(self) -> int:
+        return self.centroids.shape[0]
+
+    def query(
+        self,
+        X: Any,
+        return_distances: bool = False,
+        block_size: Optional[int] = None,
+    ) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Index of the (approximately, in approximate mode) nearest centroid
+        of each row of X.
+
+        Parameters
+        ----------
+        X : ndarray or CSR matrix of shape (n_samples, n_features)
+        return_distances : bool, default False
+            If True, also return the squared distance to that centroid.
+        block_size : int or None, default None
+            Rows searched per block, to bound memory. Defaults to 65536.
+
+        Returns
+        -------
+        labels : ndarray of shape (n_samples,)
+        sq_distances : ndarray of shape (n_samples,)
+            Only returned when ``return_distances`` is True.
+        """
+        X = check_input(X)
+        if X.ndim != 2 or X.shape[1] != self.centroids.shape[1]:
+            raise ValueError(
+                f"X must have {self.centroids.shape[1]} features, got shape {X.shape}."
+            )
+
+        if self.mode == "exact":
+            if self._tree is not None and not sp.issparse(X):
+                distances, labels = self._tree.query(X, k=1)
+                labels = labels.astype(np.intp, copy=False)
+                return (labels, distances ** 2) if return_distances else labels
+            return nearest_centroid(X, self.centroids, return_distances=return_distances)
+
+        n_samples = X.shape[0]
+        if block_size is None:
+            block_size = 1 << 16
+        labels = np.empty(n_samples, dtype=np.intp)
+        best = np.empty(n_samples, dtype=float)
+        for start in range(0, n_samples, block_size):
+            stop = min(start + block_size, n_samples)
+            labels[start:stop], best[start:stop] = self._query_block(X[start:stop])
+
+        if not return_distances:
+            return labels
+        return labels, np.maximum(best + row_norms_sq(X), 0.0)
+
+    def _query_block(self, X: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate search for one block. Returns labels and the score
+        ||c||^2 - 2 x.c of the chosen centroid (the squared distance minus
+        ||x||^2).
+        """
+        n_samples = X.shape[0]
+        n_probe = min(self.n_probe, self.n_groups)
+
+        # Level 1: the n_probe closest coarse groups of every point.
+        group_sq = np.einsum("ij,ij->i", self._group_centres, self._group_centres)
+        group_scores = np.asarray(X @ self._group_centres.T) * -2.0 + group_sq
+        if n_probe < self.n_groups:
+            probes = np.argpartition(group_scores, n_probe - 1, axis=1)[:, :n_probe]
+        else:
+            probes = np.broadcast_to(np.arange(self.n_groups), (n_samples, self.n_groups))
+
+        # Level 2: exact search inside each probed group, visiting each
+        # group once with all the points that probe it.
+        flat = probes.ravel()
+        order = np.argsort(flat, kind="stable")
+        bounds = np.concatenate(([0], np.cumsum(np.bincount(flat, minlength=self.n_groups))))
+
+        labels = np.zeros(n_samples, dtype=np.intp)
+        best = np.full(n_samples, np.inf)
+        for g, members in enumerate(self._groups):
+            rows = order[bounds[g]:bounds[g + 1]] // n_probe
+            if rows.size == 0:
+                continue
+            scores = np.asarray(X[rows] @ self.centroids[members].T)
+            scores *= -2.0
+            scores += self._centroid_sq[members]
+            j = scores.argmin(axis=1)
+            value = scores[np.arange(rows.size), j]
+            better = value < best[rows]
+            best[rows[better]] = value[better]
+            labels[rows[better]] = members[j[better]]
+        return labels, best
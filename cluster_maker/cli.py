@@ -0,0 +1,291 @@
+###
+## cluster_maker
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+"""
+Command-line interface: ``cluster-maker fit|predict|summarise|bench``.
+
+Heavy modules are imported inside each command, after the thread limits
+requested with ``--threads`` have been exported, so that they take effect
+for the BLAS/OpenMP pools used by NumPy and scikit-learn.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+ALGORITHMS = ["kmeans", "sklearn_kmeans", "bisecting_kmeans"]
+
+# Environment variables read by the BLAS/OpenMP runtimes for their thread
+# count; also used by the benchmarks to pin threads in child processes.
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "BLIS_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+
+def set_thread_limit(n_threads: Optional[int]) -> None:
+    """Cap BLAS/OpenMP threads for libraries imported after this call."""
+    if n_threads is None:
+        return
+    if n_threads <= 0:
+        raise ValueError("--threads must be a positive integer.")
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(n_threads)
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for options that must be a positive integer."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'") from None
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {number}")
+    return number
+
+
+def _add_common_options(
+    parser: argparse.ArgumentParser,
+    chunk_help: Optional[str] = "rows per chunk when streaming input/output",
+) -> None:
+    if chunk_help is not None:
+        parser.add_argument("--chunk-size", type=_positive_int, default=100_000,
+                            help=f"{chunk_help} (default 100000)")
+    parser.add_argument("--threads", type=_positive_int, default=None,
+                        help="BLAS/OpenMP threads for numerical code (default: library default)")
+    parser.add_argument("--dtype", choices=["float64", "float32"], default="float64",
+                        help="floating-point type of the feature matrix (default float64)")
+
+
+def _write_labels(labels, path: str, chunk_size: int) -> None:
+    """Write one "cluster" column to CSV, chunk by chunk."""
+    import numpy as np
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("cluster\n")
+        for start in range(0, len(labels), chunk_size):
+            np.savetxt(f, labels[start:start + chunk_size], fmt="%d")
+
+
+def cmd_fit(args: argparse.Namespace) -> int:
+    from .interface import run_clustering
+    from .model import ClusterModel
+
+    result = run_clustering(
+        input_path=args.input,
+        feature_cols=args.features,
+        algorithm=args.algorithm,
+        k=args.k,
+        standardise=not args.no_standardise,
+        random_state=args.random_state,
+        use_pca=args.pca is not None,
+        pca_components=args.pca if args.pca is not None else 2,
+        pca_solver=args.pca_solver,
+        dtype=args.dtype,
+        cache_matrix=args.cache_matrix,
+        return_data=False,
+        plots=False,
+        profile=args.profile or args.profile_path is not None,
+        profile_path=args.profile_path,
+        silhouette_sample_size=args.silhouette_sample_size,
+    )
+
+    print(f"Fitted {args.algorithm} with k={args.k} on {len(result['labels'])} rows.")
+    for key, value in result["metrics"].items():
+        print(f"  {key}: {value}")
+
+    if args.model:
+        ClusterModel.from_result(result, feature_cols=args.features).save(args.model)
+        print(f"Model saved to {args.model}")
+    if args.labels:
+        _write_labels(result["labels"], args.labels, args.chunk_size)
+        print(f"Labels written to {args.labels}")
+    if args.profile:
+        _print_profile(result["profile"])
+    return 0
+
+
+def cmd_predict(args: argparse.Namespace) -> int:
+    import pandas as pd
+
+    from .model import ClusterModel
+
+    model = ClusterModel.load(args.model)
+    if model.feature_cols is None:
+        raise ValueError("The model does not record its feature columns.")
+
+    usecols = None if args.with_input else model.feature_cols
+    reader = pd.read_csv(args.input, usecols=usecols, chunksize=args.chunk_size)
+
+    n_rows = 0
+    start = time.perf_counter()
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        for i, chunk in enumerate(reader):
+            X = chunk[model.feature_cols].to_numpy(dtype=args.dtype)
+            labels = model.predict(X)
+            frame = chunk.assign(cluster=labels) if args.with_input else pd.DataFrame({"cluster": labels})
+            frame.to_csv(out, header=(i == 0), index=False)
+            n_rows += len(chunk)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Labelled {n_rows} rows in {elapsed:.2f} s.", file=sys.stderr)
+    return 0
+
+
+def cmd_summarise(args: argparse.Namespace) -> int:
+    import pandas as pd
+
+    from .data_analyser import column_summary_from_chunks
+    from .data_exporter import export_summary
+
+    summary = column_summary_from_chunks(pd.read_csv(args.input, chunksize=args.chunk_size))
+    print(summary.to_string(index=False))
+
+    if args.output_csv or args.output_txt:
+        if not (args.output_csv and args.output_txt):
+            raise ValueError("--output-csv and --output-txt must be given together.")
+        export_summary(summary, args.output_csv, args.output_txt)
+        print(f"Summary written to {args.output_csv} and {args.output_txt}")
+    return 0
+
+
+def cmd_bench(args: argparse.Namespace) -> int:
+    from .dataframe_builder import define_dataframe_structure, simulate_data
+    from .interface import run_clustering
+
+    centres = [
+        {"name": f"f{j}", "reps": [5.0 * ((i + j) % args.k) for i in range(args.k)]}
+        for j in range(args.d)
+    ]
+    feature_cols = [spec["name"] for spec in centres]
+    data = simulate_data(define_dataframe_structure(centres), n_points=args.n, random_state=0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "bench.csv")
+        data.to_csv(csv_path, index=False)
+        del data
+
+        runs = []
+        for _ in range(args.repeat):
+            result = run_clustering(
+                input_path=csv_path,
+                feature_cols=feature_cols,
+                algorithm=args.algorithm,
+                k=args.k,
+                random_state=0,
+                dtype=args.dtype,
+                return_data=False,
+                plots=False,
+                profile=True,
+                silhouette_sample_size=args.silhouette_sample_size,
+            )
+            runs.append(result["profile"])
+
+    print(f"run_clustering: n={args.n}, d={args.d}, k={args.k}, "
+          f"algorithm={args.algorithm}, repeat={args.repeat} (median per stage)")
+    stages = [record["stage"] for record in runs[0]]
+    print(f"{'stage':<14}{'wall (s)':>10}{'cpu (s)':>10}{'peak MB':>10}")
+    for i, stage in enumerate(stages):
+        wall = statistics.median(run[i]["wall_s"] for run in runs)
+        cpu = statistics.median(run[i]["cpu_s"] for run in runs)
+        peak = max(run[i]["peak_mem_bytes"] for run in runs) / 1e6
+        print(f"{stage:<14}{wall:>10.4f}{cpu:>10.4f}{peak:>10.1f}")
+    return 0
+
+
+def _print_profile(records) -> None:
+    print(f"{'stage':<14}{'wall (s)':>10}{'cpu (s)':>10}{'peak MB':>10}")
+    for record in records:
+        print(f"{record['stage']:<14}{record['wall_s']:>10.4f}{record['cpu_s']:>10.4f}"
+              f"{record['peak_mem_bytes'] / 1e6:>10.1f}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="cluster-maker",
+        description="Fit clustering models, label data and summarise CSV files.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    fit = sub.add_parser("fit", help="cluster a CSV file and optionally save the model")
+    fit.add_argument("input", help="input CSV file")
+    fit.add_argument("--features", nargs="+", required=True, help="feature columns")
+    fit.add_argument("--algorithm", default="kmeans", choices=ALGORITHMS)
+    fit.add_argument("-k", "--k", type=int, default=3, help="number of clusters (default 3)")
+    fit.add_argument("--no-standardise", action="store_true", help="skip standardisation")
+    fit.add_argument("--pca", type=_positive_int, default=None, metavar="N",
+                     help="keep N principal components")
+    fit.add_argument("--pca-solver", default="auto", choices=["auto", "full", "randomized", "incremental"])
+    fit.add_argument("--random-state", type=int, default=None)
+    fit.add_argument("--silhouette-sample-size", type=int, default=None,
+                     help="estimate the silhouette on this many sampled rows")
+    fit.add_argument("--cache-matrix", action="store_true", help="cache the parsed matrix as .npy")
+    fit.add_argument("--model", help="save the fitted ClusterModel to this .npz file")
+    fit.add_argument("--labels", help="write the cluster labels to this CSV file")
+    fit.add_argument("--profile", action="store_true", help="print per-stage time and memory")
+    fit.add_argument("--profile-path",
+                     help="append per-stage profile records (JSON lines); enables profiling")
+    _add_common_options(fit, chunk_help="rows per chunk when writing --labels; the input is "
+                                        "loaded whole")
+    fit.set_defaults(func=cmd_fit)
+
+    predict = sub.add_parser("predict", help="label a CSV file with a saved model, streaming")
+    predict.add_argument("model", help="model .npz file written by 'fit --model'")
+    predict.add_argument("input", help="input CSV file")
+    predict.add_argument("--output", help="output CSV file (default: standard output)")
+    predict.add_argument("--with-input", action="store_true",
+                         help="write all input columns plus 'cluster' instead of labels only")
+    _add_common_options(predict)
+    predict.set_defaults(func=cmd_predict)
+
+    summarise = sub.add_parser("summarise", help="column summary of a CSV file, streaming")
+    summarise.add_argument("input", help="input CSV file")
+    summarise.add_argument("--output-csv", help="write the summary table to this CSV file")
+    summarise.add_argument("--output-txt", help="write a readable summary to this text file")
+    _add_common_options(summarise)
+    summarise.set_defaults(func=cmd_summarise)
+
+    bench = sub.add_parser("bench", help="time run_clustering stages on synthetic data")
+    bench.add_argument("--n", type=int, default=100_000, help="number of rows (default 100000)")
+    bench.add_argument("--d", type=int, default=2, help="number of features (default 2)")
+    bench.add_argument("-k", "--k", type=int, default=3, help="number of clusters (default 3)")
+    bench.add_argument("--algorithm", default="kmeans", choices=ALGORITHMS)
+    bench.add_argument("--repeat", type=int, default=3, help="number of timed runs (default 3)")
+    bench.add_argument("--silhouette-sample-size", type=int, default=10_000,
+                       help="silhouette sample size (default 10000)")
+    _add_common_options(bench, chunk_help=None)
+    bench.set_defaults(func=cmd_bench)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Console entry point for ``cluster-maker``."""
+    args = build_parser().parse_args(argv)
+    try:
+        set_thread_limit(args.threads)
+        return args.func(args)
+    except (OSError, KeyError, TypeError, ValueError) as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
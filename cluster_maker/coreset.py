@@ -0,0 +1,165 @@
+###
+## cluster_maker
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from ._matrix import check_input, check_sample_weight, row_norms_sq
+
+
+def _lightweight(
+    X: Any,
+    sample_weight: np.ndarray,
+    size: int,
+    rng: np.random.RandomState,
+) -> Tuple[Any, np.ndarray]:
+    """One lightweight-coreset draw of ``size`` rows from weighted X."""
+    total = sample_weight.sum()
+    if total <= 0:
+        raise ValueError("sample_weight must have a positive sum.")
+
+    # Squared distance of every row to the weighted mean, without densifying X.
+    mean = np.asarray(X.T @ sample_weight).ravel() / total
+    sq_dist = row_norms_sq(X) - 2.0 * np.asarray(X @ mean).ravel() + mean @ mean
+    sq_dist = sample_weight * np.maximum(sq_dist, 0.0)
+
+    q = 0.5 * sample_weight / total
+    if sq_dist.sum() > 0:
+        q += 0.5 * sq_dist / sq_dist.sum()
+    else:
+        q *= 2.0
+    indices = rng.choice(X.shape[0], size=size, p=q)
+    return X[indices], sample_weight[indices] / (size * q[indices])
+
+
+def _merge(a: Tuple[Any, np.ndarray], b: Tuple[Any, np.ndarray]) -> Tuple[Any, np.ndarray]:
+    """Union of two weighted row sets."""
+    if sp.issparse(a[0]) or sp.issparse(b[0]):
+        rows = sp.vstack([a[0], b[0]], format="csr")
+    else:
+        rows = np.vstack([a[0], b[0]])
+    return rows, np.concatenate([a[1], b[1]])
+
+
+def lightweight_coreset(
+    X: Any,
+    size: int,
+    sample_weight: Optional[np.ndarray] = None,
+    random_state: Optional[int] = None,
+) -> Tuple[Any, np.ndarray]:
+    """
+    Small weighted sample of X whose K-means cost approximates that of X.
+
+    Implements the lightweight coreset of Bachem, Lucic and Krause (2018):
+    rows are drawn i.i.d. with probability
+    q(x) = 1/2 * w(x) / W + 1/2 * w(x) d(x, mu)^2 / sum_y w(y) d(y, mu)^2,
+    where mu is the (weighted) mean of X, and each draw gets weight
+    w(x) / (size * q(x)). Building it takes two linear passes over X.
+    With size of order (n_features * k * log k + log(1/delta)) / eps^2, for
+    every set of k centroids the weighted cost on the coreset is, with
+    probability at least 1 - delta, within eps * (cost on X + total
+    squared distance of X to mu) of the cost on X.
+
+    Parameters
+    ----------
+    X : ndarray or scipy.sparse matrix of shape (n_samples, n_features)
+    size : int
+        Number of rows to draw. If it is at least n_samples, X is returned
+        unchanged (with its weights), as an exact coreset.
+    sample_weight : ndarray of shape (n_samples,) or None, default None
+        Weights of the rows of X (e.g. of an earlier coreset); 1 if None.
+    random_state : int or None, default None
+
+    Returns
+    -------
+    coreset : ndarray or CSR matrix of shape (size, n_features)
+    weights : ndarray of shape (size,)
+        Use as ``sample_weight`` for ``kmeans``, ``compute_inertia`` or
+        ``elbow_curve``. They sum to about the total weight of X.
+    """
+    X = check_input(X)
+    if size <= 0:
+        raise ValueError("size must be a positive integer.")
+    n_samples = X.shape[0]
+    sample_weight = check_sample_weight(sample_weight, n_samples)
+    if sample_weight is None:
+        sample_weight = np.ones(n_samples)
+    if size >= n_samples:
+        return X, sample_weight.copy()
+    return _lightweight(X, sample_weight, size, np.random.RandomState(random_state))
+
+
+def streaming_coreset(
+    chunks: Iterable[Any],
+    size: int,
+    random_state: Optional[int] = None,
+) -> Tuple[Any, np.ndarray]:
+    """
+    Coreset of a stream of row blocks, in one pass with bounded memory.
+
+    Uses merge-and-reduce: each incoming chunk is reduced to a coreset of
+    ``size`` rows and placed at level 0; whenever two coresets share a
+    level they are merged and reduced again into one at the next level (a
+    binary counter). Only one coreset per level is held, so memory is
+    O(size * log(n_samples / size)) plus one chunk, and no row is read
+    twice. Finally the coresets of all levels are merged and reduced to
+    ``size`` rows. The approximation error grows with the number of levels
+    (about log2 of the number of chunks), so a somewhat larger ``size`` than
+    for ``lightweight_coreset`` keeps the same guarantee.
+
+    Parameters
+    ----------
+    chunks : iterable of ndarray or scipy.sparse matrix
+        Row blocks with the same number of columns, e.g. the feature columns
+        of ``pandas.read_csv(..., chunksize=...)`` converted with
+        ``to_numpy()``.
+    size : int
+        Rows in each intermediate coreset and in the result.
+    random_state : int or None, default None
+
+    Returns
+    -------
+    coreset : ndarray or CSR matrix of shape (at most size, n_features)
+    weights : ndarray
+    """
+    if size <= 0:
+        raise ValueError("size must be a positive integer.")
+    rng = np.random.RandomState(random_state)
+    levels: Dict[int, Tuple[Any, np.ndarray]] = {}
+
+    def reduce(X: Any, weights: np.ndarray) -> Tuple[Any, np.ndarray]:
+        if X.shape[0] <= size:
+            return X, weights
+        return _lightweight(X, weights, size, rng)
+
+    n_features = None
+    for chunk in chunks:
+        chunk = check_input(chunk)
+        if chunk.ndim != 2 or chunk.shape[0] == 0:
+            continue
+        if n_features is None:
+            n_features = chunk.shape[1]
+        elif chunk.shape[1] != n_features:
+            raise ValueError("All chunks must have the same number of columns.")
+
+        carry = reduce(chunk, np.ones(chunk.shape[0]))
+        level = 0
+        while level in levels:
+            carry = reduce(*_merge(levels.pop(level), carry))
+            level += 1
+        levels[level] = carry
+
+    if not levels:
+        raise ValueError("The stream holds no rows.")
+    merged = levels.popitem()[1]
+    while levels:
+        merged = _merge(levels.popitem()[1], merged)
+    return reduce(*merged)
+
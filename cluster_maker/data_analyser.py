@@ -6,9 +6,13 @@
 
 from __future__ import annotations
 
+from typing import Any, Dict, Iterable
+
 import pandas as pd
 import numpy as np  
 
+from .preprocessing import merge_moments
+
 
 def calculate_descriptive_statistics(data: pd.DataFrame) -> pd.DataFrame:
     """
@@ -101,3 +105,81 @@ def column_summary(df: pd.DataFrame) -> pd.DataFrame:
             })
 
     return pd.DataFrame(summary_records)
+
+
+def column_summary_from_chunks(chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Compute the same summary as ``column_summary`` from a stream of chunks.
+
+    Intended for files too large to load at once, e.g. the iterator returned
+    by ``pd.read_csv(path, chunksize=...)``. Only a handful of running
+    statistics per column are kept in memory: means and variances are merged
+    chunk by chunk with the pairwise (Chan et al.) form of Welford's update.
+
+    A column is reported as numeric only if it is numeric in every chunk.
+
+    Parameters
+    ----------
+    chunks : iterable of pandas.DataFrame
+        Chunks with the same columns, in the same order.
+
+    Returns
+    -------
+    summary_df : pandas.DataFrame
+        Same layout as ``column_summary``:
+        ['column', 'mean', 'std', 'min', 'max', 'n_missing', 'note']
+    """
+    stats: Dict[Any, Dict[str, Any]] = {}
+
+    for chunk in chunks:
+        for col in chunk.columns:
+            series = chunk[col]
+            entry = stats.setdefault(col, {
+                "numeric": True, "n": 0, "mean": 0.0, "m2": 0.0,
+                "min": np.nan, "max": np.nan, "n_missing": 0,
+            })
+            entry["n_missing"] += int(series.isna().sum())
+            if not entry["numeric"]:
+                continue
+            if not pd.api.types.is_numeric_dtype(series):
+                entry["numeric"] = False
+                continue
+
+            values = series.dropna().to_numpy(dtype=float)
+            n_chunk = values.size
+            if n_chunk == 0:
+                continue
+            chunk_mean = values.mean()
+            chunk_m2 = float(((values - chunk_mean) ** 2).sum())
+            entry["n"], entry["mean"], entry["m2"] = merge_moments(
+                entry["n"], entry["mean"], entry["m2"], n_chunk, chunk_mean, chunk_m2
+            )
+            entry["min"] = np.nanmin([entry["min"], values.min()])
+            entry["max"] = np.nanmax([entry["max"], values.max()])
+
+    summary_records = []
+    for col, entry in stats.items():
+        if entry["numeric"]:
+            n = entry["n"]
+            summary_records.append({
+                "column": col,
+                "mean": entry["mean"] if n > 0 else np.nan,
+                # Sample standard deviation, as pandas' Series.std
+                "std": np.sqrt(entry["m2"] / (n - 1)) if n > 1 else np.nan,
+                "min": entry["min"],
+                "max": entry["max"],
+                "n_missing": entry["n_missing"],
+                "note": "numeric",
+            })
+        else:
+            summary_records.append({
+                "column": col,
+                "mean": np.nan,
+                "std": np.nan,
+                "min": np.nan,
+                "max": np.nan,
+                "n_missing": entry["n_missing"],
+                "note": "non-numeric (ignored)",
+            })
+
+    return pd.DataFrame(summary_records)
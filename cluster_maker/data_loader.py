@@ -0,0 +1,214 @@
+###
+## cluster_maker
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import warnings
+from typing import List, Optional, Any, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def matrix_cache_path(
+    input_path: str,
+    feature_cols: List[str],
+    dtype: Any = np.float64,
+    cache_dir: Optional[str] = None,
+) -> str:
+    """
+    Return the path of the ``.npy`` sidecar caching a parsed feature matrix.
+
+    The file name embeds a hash of the absolute input path, its size and
+    modification time, the requested columns and the dtype, so any change to
+    the input file or to the requested matrix results in a different sidecar.
+
+    Parameters
+    ----------
+    input_path : str
+        Path to the input CSV file (must exist).
+    feature_cols : list of str
+    dtype : numpy dtype, default float64
+    cache_dir : str or None, default None
+        Directory for the sidecar. Defaults to the directory of the input.
+
+    Returns
+    -------
+    path : str
+    """
+    abs_path = os.path.abspath(input_path)
+    stat = os.stat(abs_path)
+    key_fields = [
+        abs_path,
+        stat.st_size,
+        stat.st_mtime_ns,
+        list(feature_cols),
+        np.dtype(dtype).str,
+    ]
+    key = hashlib.sha1(json.dumps(key_fields).encode("utf-8")).hexdigest()[:16]
+
+    if cache_dir is None:
+        cache_dir = os.path.dirname(abs_path)
+    return os.path.join(cache_dir, f"{os.path.basename(abs_path)}.{key}.npy")
+
+
+def load_feature_matrix(
+    input_path: str,
+    feature_cols: List[str],
+    dtype: Any = np.float64,
+    cache: bool = False,
+    cache_dir: Optional[str] = None,
+) -> np.ndarray:
+    """
+    Read only the requested feature columns of a CSV into a NumPy matrix.
+
+    The column projection (``usecols``) and the target dtype are passed
+    straight to the CSV parser, so unused columns are never parsed and no
+    intermediate full DataFrame is built.
+
+    Parameters
+    ----------
+    input_path : str
+        Path to the input CSV file.
+    feature_cols : list of str
+        Column names to load, in the order they should appear in the matrix.
+    dtype : numpy dtype, default float64
+        dtype of the returned matrix (e.g. ``np.float32`` to halve memory).
+    cache : bool, default False
+        If True, the parsed matrix is stored as a ``.npy`` sidecar (see
+        ``matrix_cache_path``) and later calls on the unchanged file load it
+        instead of parsing the CSV again.
+    cache_dir : str or None, default None
+        Directory for the sidecar. Defaults to the directory of the input.
+
+    Returns
+    -------
+    X : ndarray of shape (n_samples, len(feature_cols))
+        When loaded from the cache, X is a copy-on-write memory map, so it
+        can be modified in place without touching the sidecar on disk.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the input file does not exist.
+    KeyError
+        If any requested column is missing.
+    TypeError
+        If any requested column is non-numeric.
+    """
+    if not os.path.exists(input_path):
+        raise FileNotFoundError(f"The input file '{input_path}' does not exist.")
+
+    feature_cols = list(feature_cols)
+    dtype = np.dtype(dtype)
+
+    sidecar = None
+    if cache:
+        sidecar = matrix_cache_path(input_path, feature_cols, dtype, cache_dir)
+        if os.path.exists(sidecar):
+            return np.load(sidecar, mmap_mode="c")
+
+    header = pd.read_csv(input_path, nrows=0).columns
+    missing = [col for col in feature_cols if col not in header]
+    if missing:
+        raise KeyError(f"The following feature columns are missing: {missing}")
+
+    try:
+        X_df = pd.read_csv(
+            input_path,
+            usecols=feature_cols,
+            dtype={col: dtype for col in feature_cols},
+        )
+    except ValueError:
+        # Only reached on bad input: re-parse to report the offending columns.
+        X_df = pd.read_csv(input_path, usecols=feature_cols)
+        non_numeric = [
+            col for col in feature_cols
+            if not pd.api.types.is_numeric_dtype(X_df[col])
+        ]
+        raise TypeError(
+            f"The following feature columns are not numeric: {non_numeric}"
+        ) from None
+
+    X = np.ascontiguousarray(X_df[feature_cols].to_numpy(dtype=dtype))
+
+    if sidecar is not None:
+        _write_sidecar(sidecar, X)
+    return X
+
+
+def load_table_with_features(
+    input_path: str,
+    feature_cols: List[str],
+    dtype: Any = np.float64,
+) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    Read the whole CSV once and take the feature matrix from it.
+
+    For callers that need both the full table (e.g. to return or export it
+    with labels) and the feature matrix: parsing the file a second time for
+    the matrix would cost more than converting the columns already parsed.
+
+    Parameters
+    ----------
+    input_path : str
+        Path to the input CSV file.
+    feature_cols : list of str
+        Column names to use, in the order they should appear in the matrix.
+    dtype : numpy dtype, default float64
+        dtype of the returned matrix.
+
+    Returns
+    -------
+    df : DataFrame
+        The full input table.
+    X : ndarray of shape (n_samples, len(feature_cols))
+        A copy of the feature columns, independent of ``df``.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the input file does not exist.
+    KeyError
+        If any requested column is missing.
+    TypeError
+        If any requested column is non-numeric.
+    """
+    if not os.path.exists(input_path):
+        raise FileNotFoundError(f"The input file '{input_path}' does not exist.")
+
+    feature_cols = list(feature_cols)
+    df = pd.read_csv(input_path)
+    missing = [col for col in feature_cols if col not in df.columns]
+    if missing:
+        raise KeyError(f"The following feature columns are missing: {missing}")
+    non_numeric = [col for col in feature_cols if not pd.api.types.is_numeric_dtype(df[col])]
+    if non_numeric:
+        raise TypeError(f"The following feature columns are not numeric: {non_numeric}")
+
+    X = np.ascontiguousarray(df[feature_cols].to_numpy(dtype=np.dtype(dtype), copy=True))
+    return df, X
+
+
+def _write_sidecar(path: str, X: np.ndarray) -> None:
+    """Atomically write X to path, warning instead of failing on I/O errors."""
+    directory = os.path.dirname(path) or "."
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, X)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as exc:
+        warnings.warn(f"Could not write matrix cache '{path}': {exc}")
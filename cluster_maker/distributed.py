@@ -0,0 +1,406 @@
+###
+## cluster_maker
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from multiprocessing.connection import Client, Connection, Listener, wait
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ._matrix import cluster_sums
+from .algorithms import assign_clusters
+from .data_loader import load_feature_matrix
+
+
+def _load_shard(path: str, feature_cols: Optional[List[str]], dtype: Any) -> np.ndarray:
+    """Memory-map a .npy shard or parse the feature columns of a CSV shard."""
+    if path.endswith(".npy"):
+        X = np.load(path, mmap_mode="r")
+        if X.ndim != 2:
+            raise ValueError(f"Shard '{path}' must hold a 2D array.")
+        return X
+    if feature_cols is None:
+        raise ValueError("feature_cols is required for CSV shards.")
+    return load_feature_matrix(path, feature_cols, dtype=dtype)
+
+
+def _serve(conn: Connection, X: np.ndarray) -> None:
+    """
+    Answer driver requests about one shard until told to stop.
+
+    Requests are ``(command, payload)`` tuples:
+
+    - ``("rows", indices)``: the rows at these local indices;
+    - ``("step", (centroids, keep_labels))``: assign the shard, reply with
+      per-cluster sums, counts and the SSE, and keep the labels if asked;
+    - ``("labels", None)``: the labels kept by the last step;
+    - ``("stop", None)``.
+
+    Every reply is ``("ok", value)`` or ``("error", exception)``.
+    """
+    labels = None
+    while True:
+        command, payload = conn.recv()
+        if command == "stop":
+            return
+        try:
+            if command == "rows":
+                reply = np.array(X[payload], dtype=float)
+            elif command == "step":
+                centroids, keep_labels = payload
+                shard_labels = assign_clusters(X, centroids)
+                sums, counts = cluster_sums(X, shard_labels, centroids.shape[0])
+                sse = float(np.sum((X - centroids[shard_labels]) ** 2))
+                labels = shard_labels if keep_labels else None
+                reply = (sums, counts, sse)
+            elif command == "labels":
+                reply = labels
+            else:
+                raise ValueError(f"Unknown command '{command}'.")
+        except Exception as exc:  # sent back and re-raised by the driver
+            conn.send(("error", exc))
+        else:
+            conn.send(("ok", reply))
+
+
+def _pipe_worker(conn: Connection, shard: str, feature_cols: Optional[List[str]], dtype: Any) -> None:
+    try:
+        X = _load_shard(shard, feature_cols, dtype)
+    except Exception as exc:
+        conn.send(("error", exc))
+        return
+    conn.send(("ok", X.shape))
+    _serve(conn, X)
+
+
+def run_worker(
+    address: Tuple[str, int],
+    authkey: bytes,
+    shard: str,
+    shard_index: int,
+    feature_cols: Optional[List[str]] = None,
+    dtype: Any = np.float64,
+) -> None:
+    """
+    Serve one shard to a ``distributed_kmeans`` driver over a socket.
+
+    The driver starts these itself with ``transport="socket"``; the
+    function is public so that workers can also be started by hand (or on
+    another host sharing the shard files) against a listening driver.
+
+    Parameters
+    ----------
+    address : (host, port)
+        Address the driver listens on.
+    authkey : bytes
+        Shared secret used to authenticate the connection.
+    shard : str
+        Path to the worker's .npy or CSV shard.
+    shard_index : int
+        Position of the shard in the driver's shard list; sent as soon as
+        the connection is made, before the shard is loaded.
+    feature_cols : list of str or None
+    dtype : numpy dtype, default float64
+    """
+    conn = Client(address, authkey=authkey)
+    try:
+        conn.send(shard_index)
+        try:
+            X = _load_shard(shard, feature_cols, dtype)
+        except Exception as exc:
+            conn.send(("error", exc))
+            return
+        conn.send(("ok", X.shape))
+        _serve(conn, X)
+    finally:
+        conn.close()
+
+
+def _request(conn: Connection, command: str, payload: Any = None) -> Any:
+    conn.send((command, payload))
+    return _unwrap(conn.recv())
+
+
+def _unwrap(reply: Tuple[str, Any]) -> Any:
+    status, value = reply
+    if status == "error":
+        raise value
+    return value
+
+
+class _ShardPool:
+    """Worker processes, one per shard, and the driver's connections to them."""
+
+    def __init__(
+        self,
+        shards: Sequence[str],
+        feature_cols: Optional[List[str]],
+        dtype: Any,
+        transport: str,
+        connect_timeout: float = 60.0,
+    ) -> None:
+        self.shards = shards
+        self.processes: List[multiprocessing.Process] = []
+        self.conns: List[Connection] = []
+        self.shapes: List[Tuple[int, int]] = []
+        try:
+            if transport == "pipe":
+                self._start_pipes(shards, feature_cols, dtype)
+            else:
+                self._start_sockets(shards, feature_cols, dtype, connect_timeout)
+            self.shapes = self._receive_shapes()
+        except BaseException:
+            self.close()
+            raise
+
+    def _start_pipes(self, shards: Sequence[str], feature_cols: Optional[List[str]], dtype: Any) -> None:
+        for shard in shards:
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_pipe_worker, args=(child_conn, shard, feature_cols, dtype), daemon=True
+            )
+            process.start()
+            child_conn.close()
+            self.processes.append(process)
+            self.conns.append(parent_conn)
+
+    def _start_sockets(
+        self,
+        shards: Sequence[str],
+        feature_cols: Optional[List[str]],
+        dtype: Any,
+        connect_timeout: float,
+    ) -> None:
+        authkey = os.urandom(16)
+        with Listener(("127.0.0.1", 0), authkey=authkey) as listener:
+            for i, shard in enumerate(shards):
+                process = multiprocessing.Process(
+                    target=run_worker,
+                    args=(listener.address, authkey, shard, i, feature_cols, dtype),
+                    daemon=True,
+                )
+                process.start()
+                self.processes.append(process)
+
+            # Workers connect in any order; each introduces itself by index.
+            # accept() cannot time out, so it runs in a thread while this
+            # one watches the deadline and the worker processes.
+            accepted: "queue.Queue[Any]" = queue.Queue()
+            threading.Thread(
+                target=_accept_workers, args=(listener, len(shards), accepted), daemon=True
+            ).start()
+            deadline = time.monotonic() + connect_timeout
+            conns: Dict[int, Connection] = {}
+            while len(conns) < len(shards):
+                try:
+                    item = accepted.get(timeout=0.1)
+                except queue.Empty:
+                    for i, process in enumerate(self.processes):
+                        if i not in conns and not process.is_alive():
+                            raise RuntimeError(self._died_message(i, "before connecting"))
+                    if time.monotonic() > deadline:
+                        missing = [shards[i] for i in range(len(shards)) if i not in conns]
+                        raise TimeoutError(
+                            f"Workers for shards {missing} did not connect within "
+                            f"{connect_timeout} s."
+                        )
+                    continue
+                if isinstance(item, BaseException):
+                    raise RuntimeError("A worker disconnected before sending its shard index.") from item
+                index, conn = item
+                conns[index] = conn
+                self.conns.append(conn)  # so that close() stops it on failure
+        self.conns = [conns[i] for i in range(len(shards))]
+
+    def _receive_shapes(self) -> List[Tuple[int, int]]:
+        """Each worker's reply to loading its shard: its shape, or its error."""
+        replies: Dict[int, Tuple[str, Any]] = {}
+        waiting = dict(enumerate(self.conns))
+        while waiting:
+            sentinels = {self.processes[i].sentinel: i for i in waiting}
+            ready = wait(list(waiting.values()) + list(sentinels))
+            for i, conn in list(waiting.items()):
+                if conn in ready:
+                    try:
+                        replies[i] = conn.recv()
+                    except EOFError:
+                        raise RuntimeError(self._died_message(i, "while loading its shard")) from None
+                    del waiting[i]
+            for sentinel in ready:
+                if sentinel in sentinels and sentinels[sentinel] in waiting:
+                    i = sentinels[sentinel]
+                    self.processes[i].join()
+                    raise RuntimeError(self._died_message(i, "while loading its shard"))
+        return [_unwrap(replies[i]) for i in range(len(self.conns))]
+
+    def _died_message(self, i: int, when: str) -> str:
+        return (
+            f"Worker for shard {i} ('{self.shards[i]}') exited with code "
+            f"{self.processes[i].exitcode} {when}."
+        )
+
+    def broadcast(self, command: str, payload: Any = None) -> List[Any]:
+        """Send the same request to every worker, then collect the replies."""
+        for conn in self.conns:
+            conn.send((command, payload))
+        return [_unwrap(conn.recv()) for conn in self.conns]
+
+    def close(self) -> None:
+        for conn in self.conns:
+            try:
+                conn.send(("stop", None))
+                conn.close()
+            except OSError:
+                pass
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+
+
+def _accept_workers(listener: Listener, n_workers: int, accepted: "queue.Queue[Any]") -> None:
+    """Accept worker connections, putting (shard index, connection) on ``accepted``."""
+    try:
+        for _ in range(n_workers):
+            conn = listener.accept()
+            accepted.put((conn.recv(), conn))
+    except (OSError, EOFError) as exc:  # listener closed, or a worker died
+        accepted.put(exc)
+
+
+def distributed_kmeans(
+    shards: Sequence[str],
+    k: int,
+    feature_cols: Optional[List[str]] = None,
+    init: Optional[np.ndarray] = None,
+    max_iter: int = 300,
+    tol: float = 1e-4,
+    random_state: Optional[int] = None,
+    transport: str = "pipe",
+    dtype: Any = np.float64,
+    return_inertia: bool = False,
+    connect_timeout: float = 60.0,
+):
+    """
+    Lloyd's K-means over data split into shards, one worker process per shard.
+
+    Each worker loads (or memory-maps) its own shard and keeps it. Every
+    iteration the driver sends the current centroids to all workers, each
+    worker assigns its rows and replies with its per-cluster sums, counts
+    and SSE, and the driver reduces these into the new centroids. Only
+    (k, n_features) arrays travel per iteration; the data is never gathered
+    in the driver. The single rows needed to initialise centroids or to
+    re-seed an empty cluster are fetched from the shard that owns them.
+
+    The driver follows ``kmeans`` step for step on the concatenation of the
+    shards (in order): the same sampled initial rows, the same re-seeding
+    of empty clusters and the same stopping rule, so for the same
+    ``random_state`` (or ``init``) it returns the same labels and, up to
+    floating-point summation order, the same centroids.
+
+    Parameters
+    ----------
+    shards : sequence of str
+        Paths to ``.npy`` files holding 2D arrays or to CSV files.
+    k : int
+    feature_cols : list of str or None
+        Feature columns; required for CSV shards.
+    init : ndarray of shape (k, n_features) or None, default None
+        Initial centroids. If None, k rows are sampled as in ``init_centroids``.
+    max_iter : int, default 300
+    tol : float, default 1e-4
+    random_state : int or None
+    transport : {"pipe", "socket"}, default "pipe"
+        "pipe" connects the workers with multiprocessing pipes; "socket"
+        uses an authenticated local TCP listener (see ``run_worker``).
+    dtype : numpy dtype, default float64
+        Used when parsing CSV shards.
+    return_inertia : bool, default False
+        If True, also return the SSE of the final assignment.
+    connect_timeout : float, default 60.0
+        Seconds the socket workers have to connect to the driver (loading
+        the shards is not included). A worker that exits before connecting
+        or while loading its shard raises RuntimeError naming the shard.
+
+    Returns
+    -------
+    labels : ndarray of shape (n_samples,)
+        Labels of all rows, in shard order.
+    centroids : ndarray of shape (k, n_features)
+    inertia : float
+        Only returned when ``return_inertia`` is True.
+    """
+    if not shards:
+        raise ValueError("At least one shard is required.")
+    if transport not in ("pipe", "socket"):
+        raise ValueError("transport must be 'pipe' or 'socket'.")
+    if k <= 0:
+        raise ValueError("k must be a positive integer.")
+
+    pool = _ShardPool(list(shards), feature_cols, dtype, transport, connect_timeout)
+    try:
+        n_features = {shape[1] for shape in pool.shapes}
+        if len(n_features) != 1:
+            raise ValueError("All shards must have the same number of features.")
+        n_features = n_features.pop()
+        offsets = np.concatenate(([0], np.cumsum([shape[0] for shape in pool.shapes])))
+        n_samples = int(offsets[-1])
+
+        def fetch_rows(global_indices: np.ndarray) -> np.ndarray:
+            """Rows at global indices, fetched from the shards that own them."""
+            owners = np.searchsorted(offsets, global_indices, side="right") - 1
+            rows = np.empty((len(global_indices), n_features))
+            for shard in np.unique(owners):
+                selected = np.flatnonzero(owners == shard)
+                local = global_indices[selected] - offsets[shard]
+                rows[selected] = _request(pool.conns[shard], "rows", local)
+            return rows
+
+        if init is not None:
+            centroids = np.array(init, dtype=float)
+            if centroids.shape != (k, n_features):
+                raise ValueError(f"init must have shape ({k}, {n_features}), got {centroids.shape}.")
+        else:
+            if k > n_samples:
+                raise ValueError("k cannot be larger than the number of samples.")
+            # Same draw as init_centroids on the concatenated data.
+            rng = np.random.RandomState(random_state)
+            centroids = fetch_rows(rng.choice(n_samples, size=k, replace=False))
+
+        for _ in range(max_iter):
+            replies = pool.broadcast("step", (centroids, False))
+            sums = sum(reply[0] for reply in replies)
+            counts = sum(reply[1] for reply in replies)
+
+            new_centroids = sums / np.maximum(counts, 1)[:, np.newaxis]
+            empty = np.flatnonzero(counts == 0)
+            if empty.size:
+                # Same draws, in the same order, as update_centroids.
+                rng = np.random.RandomState(random_state)
+                reseed = np.array([rng.randint(0, n_samples) for _ in empty])
+                new_centroids[empty] = fetch_rows(reseed)
+
+            shift = np.linalg.norm(new_centroids - centroids)
+            centroids = new_centroids
+            if shift < tol:
+                break
+
+        replies = pool.broadcast("step", (centroids, True))
+        inertia = float(sum(reply[2] for reply in replies))
+        labels = np.concatenate(pool.broadcast("labels"))
+    finally:
+        pool.close()
+
+    if return_inertia:
+        return labels, centroids, inertia
+    return labels, centroids
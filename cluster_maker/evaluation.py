@@ -6,11 +6,14 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Optional
 
 import numpy as np
+import scipy.sparse as sp
 from sklearn.metrics import silhouette_score
 
+from ._matrix import check_sample_weight, cluster_sums, row_norms_sq
 from .algorithms import kmeans, sklearn_kmeans
 
 
@@ -18,15 +21,22 @@ def compute_inertia(
     X: np.ndarray,
     labels: np.ndarray,
     centroids: np.ndarray,
+    sample_weight: Optional[np.ndarray] = None,
 ) -> float:
     """
     Compute the within-cluster sum of squared distances (inertia).
 
+    For sparse X the inertia is expanded as
+    sum ||x||^2 - 2 sum_j s_j.c_j + sum_j n_j ||c_j||^2, where s_j and n_j
+    are the sum and size of cluster j, so X is never densified.
+
     Parameters
     ----------
-    X : ndarray of shape (n_samples, n_features)
+    X : ndarray or scipy.sparse matrix of shape (n_samples, n_features)
     labels : ndarray of shape (n_samples,)
     centroids : ndarray of shape (k, n_features)
+    sample_weight : ndarray of shape (n_samples,) or None, default None
+        If given, each squared distance is multiplied by its row's weight.
 
     Returns
     -------
@@ -34,19 +44,47 @@ def compute_inertia(
     """
     if X.shape[0] != labels.shape[0]:
         raise ValueError("X and labels must have the same number of samples.")
+    sample_weight = check_sample_weight(sample_weight, X.shape[0])
+
+    if sp.issparse(X):
+        sums, counts = cluster_sums(X, labels, centroids.shape[0], sample_weight)
+        centroid_sq = np.einsum("ij,ij->i", centroids, centroids)
+        row_sq = row_norms_sq(X)
+        inertia = (
+            (row_sq.sum() if sample_weight is None else row_sq @ sample_weight)
+            - 2.0 * np.einsum("ij,ij->", sums, centroids)
+            + counts @ centroid_sq
+        )
+        return float(max(inertia, 0.0))
 
     distances = X - centroids[labels]
-    sq_dist = np.sum(distances ** 2)
+    if sample_weight is None:
+        sq_dist = np.sum(distances ** 2)
+    else:
+        sq_dist = np.einsum("ij,ij->i", distances, distances) @ sample_weight
     return float(sq_dist)
 
 
 def silhouette_score_sklearn(
     X: np.ndarray,
     labels: np.ndarray,
+    sample_size: Optional[int] = None,
+    random_state: Optional[int] = None,
 ) -> float:
     """
     Compute the silhouette score using scikit-learn.
 
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    labels : ndarray of shape (n_samples,)
+    sample_size : int or None, default None
+        If given and smaller than n_samples, estimate the score on a random
+        subset of this many samples. The exact score costs O(n_samples^2)
+        time, so sampling is needed for large inputs.
+    random_state : int or None, default None
+        Seed for the subset when sampling.
+
     Returns
     -------
     score : float
@@ -54,7 +92,36 @@ def silhouette_score_sklearn(
     # Silhouette is only defined when there are at least 2 clusters
     if len(np.unique(labels)) < 2:
         raise ValueError("Silhouette score requires at least 2 clusters.")
-    return float(silhouette_score(X, labels))
+    if sample_size is not None and sample_size >= X.shape[0]:
+        sample_size = None
+    return float(silhouette_score(X, labels, sample_size=sample_size, random_state=random_state))
+
+
+# Feature matrix (and row weights) of the elbow fits, set once per worker process.
+_ELBOW_X: Optional[np.ndarray] = None
+_ELBOW_WEIGHT: Optional[np.ndarray] = None
+
+
+def _init_elbow_worker(X: np.ndarray, sample_weight: Optional[np.ndarray] = None) -> None:
+    global _ELBOW_X, _ELBOW_WEIGHT
+    _ELBOW_X = X
+    _ELBOW_WEIGHT = sample_weight
+
+
+def _elbow_inertia(
+    k: int,
+    random_state: Optional[int],
+    use_sklearn: bool,
+    X: Optional[np.ndarray] = None,
+    sample_weight: Optional[np.ndarray] = None,
+) -> float:
+    if X is None:
+        X, sample_weight = _ELBOW_X, _ELBOW_WEIGHT
+    if use_sklearn:
+        labels, centroids = sklearn_kmeans(X, k, random_state=random_state, sample_weight=sample_weight)
+    else:
+        labels, centroids = kmeans(X, k, random_state=random_state, sample_weight=sample_weight)
+    return compute_inertia(X, labels, centroids, sample_weight=sample_weight)
 
 
 def elbow_curve(
@@ -62,6 +129,8 @@ def elbow_curve(
     k_values: List[int],
     random_state: Optional[int] = None,
     use_sklearn: bool = True,
+    max_workers: int = 1,
+    sample_weight: Optional[np.ndarray] = None,
 ) -> Dict[int, float]:
     """
     Compute inertia values for multiple K values (elbow method).
@@ -73,22 +142,39 @@ def elbow_curve(
     random_state : int or None
     use_sklearn : bool, default True
         If True, use scikit-learn KMeans; otherwise use manual kmeans.
+    max_workers : int, default 1
+        Number of worker processes fitting different k values at once. X is
+        sent to each worker once. With 1, the fits run in the calling
+        process. When using several workers, limit the BLAS/OpenMP threads
+        of each (e.g. OMP_NUM_THREADS) to avoid oversubscribing the CPUs.
+    sample_weight : ndarray of shape (n_samples,) or None, default None
+        Row weights (e.g. coreset weights or duplicate counts): fits and
+        inertias are weighted.
 
     Returns
     -------
     inertia_dict : dict
         Mapping from k to inertia.
     """
-    inertia_dict: Dict[int, float] = {}
-
     for k in k_values:
         if k <= 0:
             raise ValueError("All k values must be positive integers.")
-        if use_sklearn:
-            labels, centroids = sklearn_kmeans(X, k, random_state=random_state)
-        else:
-            labels, centroids = kmeans(X, k, random_state=random_state)
-        inertia = compute_inertia(X, labels, centroids)
-        inertia_dict[k] = inertia
-
-    return inertia_dict
\ No newline at end of file
+    if max_workers <= 0:
+        raise ValueError("max_workers must be a positive integer.")
+
+    if max_workers == 1 or len(k_values) <= 1:
+        inertias = [_elbow_inertia(k, random_state, use_sklearn, X, sample_weight) for k in k_values]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers, len(k_values)),
+            initializer=_init_elbow_worker,
+            initargs=(X, sample_weight),
+        ) as executor:
+            inertias = list(executor.map(
+                _elbow_inertia,
+                k_values,
+                [random_state] * len(k_values),
+                [use_sklearn] * len(k_values),
+            ))
+
+    return dict(zip(k_values, inertias))
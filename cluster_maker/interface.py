@@ -6,16 +6,21 @@
 
 from __future__ import annotations
 
-from typing import Dict, Any, List, Optional
+import hashlib
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
+from sklearn.decomposition import PCA
 
-from .preprocessing import select_features, standardise_features, apply_pca
-from .algorithms import kmeans, sklearn_kmeans
+from .data_loader import load_feature_matrix, load_table_with_features
+from .preprocessing import apply_pca, FeatureScaler
+from .algorithms import assign_clusters, bisecting_kmeans, kmeans, sklearn_kmeans
+from .coreset import lightweight_coreset
 from .evaluation import compute_inertia, elbow_curve, silhouette_score_sklearn
-from .plotting_clustered import plot_clusters_2d, plot_elbow
 from .data_exporter import export_to_csv
+from .result_cache import ResultCache
+from .profiling import NULL_PROFILER, StageProfiler
 
 
 def run_clustering(
@@ -30,18 +35,29 @@ def run_clustering(
     elbow_k_values: Optional[List[int]] = None,
     use_pca: bool = False,
     pca_components: int = 2,
+    pca_solver: str = "auto",
+    scaler: Optional[FeatureScaler] = None,
+    dtype: Any = np.float64,
+    cache_matrix: bool = False,
+    return_data: bool = True,
+    plots: bool = True,
+    result_cache: Optional[ResultCache] = None,
+    profile: bool = False,
+    profile_path: Optional[str] = None,
+    silhouette_sample_size: Optional[int] = None,
+    coreset_size: Optional[int] = None,
+    deduplicate: bool = False,
 ) -> Dict[str, Any]:
     """
     High-level function to run the full clustering workflow.
 
     Steps:
-    1. Load data from CSV
-    2. Select feature columns
-    3. Optionally standardise features
-    4. Run the chosen clustering algorithm
-    5. Compute evaluation metrics
-    6. Generate plots
-    7. Optionally write labelled data to CSV
+    1. Load the selected feature columns from CSV
+    2. Optionally standardise features and apply PCA
+    3. Run the chosen clustering algorithm (optionally on unique rows or a coreset)
+    4. Compute evaluation metrics
+    5. Optionally generate plots
+    6. Optionally write labelled data to CSV
 
     Parameters
     ----------
@@ -49,7 +65,7 @@ def run_clustering(
         Path to the input CSV file.
     feature_cols : list of str
         Names of feature columns to use.
-    algorithm : {"kmeans", "sklearn_kmeans"}, default "kmeans"
+    algorithm : {"kmeans", "sklearn_kmeans", "bisecting_kmeans"}, default "kmeans"
     k : int, default 3
         Number of clusters.
     standardise : bool, default True
@@ -60,81 +76,241 @@ def run_clustering(
         If True, compute inertia for multiple k values.
     elbow_k_values : list of int or None, default None
         k-values for elbow curve. If None and compute_elbow is True, defaults
-        to range 1..(k+5).
+        to range 1..(k+5). Values above the number of rows fitted (e.g. the
+        unique rows with ``deduplicate=True``) are skipped.
+    use_pca : bool, default False
+        If True, project the features onto their leading principal components.
+    pca_components : int, default 2
+    pca_solver : {"auto", "full", "randomized", "incremental"}, default "auto"
+        SVD solver passed to ``apply_pca``.
+    scaler : FeatureScaler or None, default None
+        Scaler used when ``standardise`` is True. A fitted scaler is applied
+        as-is, so repeated jobs against the same reference data skip the refit
+        pass; an unfitted one is fitted on this input and can be reused
+        afterwards. If None, a new scaler is fitted on this input.
+    dtype : numpy dtype, default float64
+        dtype of the feature matrix built from the CSV.
+    cache_matrix : bool, default False
+        If True, cache the parsed feature matrix as a ``.npy`` sidecar next to
+        the input so repeated runs on the same file skip CSV parsing.
+    return_data : bool, default True
+        If True (or output_path is given), the whole CSV is parsed once and
+        the feature matrix is taken from that table, so ``cache_matrix`` has
+        no effect. If False (and no output_path is given), only the feature
+        columns are parsed and "data" in the result is None.
+    plots : bool, default True
+        If True, build the cluster (and elbow) figures on an off-screen Agg
+        canvas, outside pyplot's figure registry. If False, no figure is
+        created and matplotlib is not imported; the figure entries are None.
+    result_cache : ResultCache or None, default None
+        If given (and random_state is set), labels, centroids, metrics and
+        the fitted preprocessing are looked up in / stored to this cache,
+        keyed by the input file and the parameters that determine them. The
+        first two preprocessed columns are stored too, so that the cluster
+        plot can be drawn from the cache. On a hit, loading, preprocessing
+        and clustering are skipped unless the elbow curve needs the feature
+        matrix; with return_data=True (or output_path) the CSV is still read
+        once for the labelled table.
+    profile : bool, default False
+        If True, record wall time, CPU time and tracemalloc peak memory of
+        each stage under "profile" in the result ("metrics" covers the
+        inertia and "silhouette" the silhouette score, usually the costliest
+        metric). When False the stage hooks are no-ops.
+    profile_path : str or None, default None
+        If given (and profile is True), append the stage records to this
+        file as JSON lines.
+    silhouette_sample_size : int or None, default None
+        If given, estimate the silhouette score on a random subset of this
+        many samples instead of computing it exactly in O(n_samples^2).
+    coreset_size : int or None, default None
+        If given (and smaller than the number of rows), the centroids and
+        the elbow curve are fitted on a weighted lightweight coreset of this
+        many rows (see ``lightweight_coreset``) instead of on every row; all
+        rows are then labelled with their nearest centroid and the metrics
+        are computed on the full data. Weighted fits are supported by
+        "kmeans" and "sklearn_kmeans".
+    deduplicate : bool, default False
+        If True, identical (preprocessed) feature rows are collapsed into
+        unique rows weighted by their counts before clustering (and before
+        any coreset), and the labels are mapped back to every original row.
+        The weighted fit optimises the same objective as the full one, so
+        the work shrinks with the duplication ratio. Requires a weighted
+        algorithm ("kmeans" or "sklearn_kmeans"). If there are fewer unique
+        rows than k, every row is fitted instead.
 
     Returns
     -------
     result : dict
         Dictionary containing:
-        - "data": DataFrame with added "cluster" column
+        - "data": DataFrame with added "cluster" column, or None
         - "labels": ndarray of cluster labels
         - "centroids": ndarray of cluster centroids
         - "metrics": dict with "inertia" and optional "silhouette"
-        - "fig_cluster": Figure for the cluster plot
-        - "fig_elbow": Figure for the elbow plot or None
+        - "fig_cluster": Figure for the cluster plot, or None if plots is False
+        - "fig_elbow": Figure for the elbow plot, or None
         - "elbow_inertias": dict mapping k -> inertia (if computed)
+        - "scaler": the FeatureScaler applied, or None if not standardised
+        - "pca": the fitted PCA projector, or None if PCA was not used
+        - "cached": True if the clustering was served from result_cache
+        - "profile": list of per-stage records (stage, wall_s, cpu_s,
+          peak_mem_bytes), or None if profile is False
     """
-    # Load data
-    df = pd.read_csv(input_path)
+    profiler = StageProfiler() if profile else NULL_PROFILER
+    pipeline = clustering_pipeline(
+        input_path, feature_cols, algorithm=algorithm, k=k, standardise=standardise,
+        output_path=output_path, random_state=random_state, compute_elbow=compute_elbow,
+        elbow_k_values=elbow_k_values, use_pca=use_pca, pca_components=pca_components,
+        pca_solver=pca_solver, scaler=scaler, dtype=dtype, cache_matrix=cache_matrix,
+        return_data=return_data, plots=plots, result_cache=result_cache,
+        silhouette_sample_size=silhouette_sample_size, coreset_size=coreset_size,
+        deduplicate=deduplicate,
+    )
+    try:
+        value = None
+        while True:
+            try:
+                name, func, args = pipeline.send(value)
+            except StopIteration as stop:
+                result: Dict[str, Any] = stop.value
+                break
+            with profiler.stage(name):
+                value = func(*args)
+    finally:
+        profiler.close()
 
-    # Select and optionally standardise features
-    X_df = select_features(df, feature_cols)
-    X = X_df.to_numpy(dtype=float)
+    if profile and profile_path is not None:
+        profiler.to_jsonl(profile_path, extra={"input_path": input_path, "algorithm": algorithm, "k": k})
 
-    if standardise:
-        X = standardise_features(X)
+    result["profile"] = profiler.records if profile else None
+    return result
 
-    if use_pca:
-        X = apply_pca(X, n_components=pca_components)
 
-    # Run clustering
-    if algorithm == "kmeans":
-        labels, centroids = kmeans(X, k=k, random_state=random_state)
-    elif algorithm == "sklearn_kmeans":
-        labels, centroids = sklearn_kmeans(X, k=k, random_state=random_state)
-    else:
-        raise ValueError(f"Unknown algorithm '{algorithm}'. Use 'kmeans' or 'sklearn_kmeans'.")
+# One step of clustering_pipeline: (stage name, function, positional args).
+PipelineStep = Tuple[str, Callable[..., Any], Tuple[Any, ...]]
 
-    # Compute metrics
-    inertia = compute_inertia(X, labels, centroids)
-    metrics: Dict[str, Any] = {"inertia": inertia}
 
-    try:
-        sil = silhouette_score_sklearn(X, labels)
-    except ValueError:
-        sil = None
-    metrics["silhouette"] = sil
+def clustering_pipeline(
+    input_path: str,
+    feature_cols: List[str],
+    algorithm: str = "kmeans",
+    k: int = 3,
+    standardise: bool = True,
+    output_path: Optional[str] = None,
+    random_state: Optional[int] = None,
+    compute_elbow: bool = False,
+    elbow_k_values: Optional[List[int]] = None,
+    use_pca: bool = False,
+    pca_components: int = 2,
+    pca_solver: str = "auto",
+    scaler: Optional[FeatureScaler] = None,
+    dtype: Any = np.float64,
+    cache_matrix: bool = False,
+    return_data: bool = True,
+    plots: bool = True,
+    result_cache: Optional[ResultCache] = None,
+    silhouette_sample_size: Optional[int] = None,
+    coreset_size: Optional[int] = None,
+    deduplicate: bool = False,
+) -> Generator[PipelineStep, Any, Dict[str, Any]]:
+    """
+    The stages of ``run_clustering`` as a generator, so that the synchronous
+    and asynchronous workflows share one stage sequence.
 
-    # Add labels to DataFrame
-    df = df.copy()
-    df["cluster"] = labels
+    Each step yields ``(name, func, args)``. The caller runs ``func(*args)``
+    however it needs to (inline under a profiler, in an executor, ...) and
+    sends the return value back with ``send``. Every ``func`` is a
+    module-level function, so stages can also run in a process pool. When
+    the generator finishes, its return value (``StopIteration.value``) is
+    the result dictionary of ``run_clustering`` without "profile".
 
-    # Export if requested
-    if output_path is not None:
-        export_to_csv(df, output_path, delimiter=",", include_index=False)
+    Parameters are those of ``run_clustering`` except the profiling options.
+    """
+    # Look up a cached result (only deterministic runs are cacheable)
+    cache_key = None
+    cached = None
+    if (
+        result_cache is not None
+        and random_state is not None
+        and (scaler is None or scaler.is_fitted)
+    ):
+        cache_key, cached = yield "cache_lookup", _cache_lookup_stage, (result_cache, input_path, {
+            "feature_cols": list(feature_cols),
+            "algorithm": algorithm,
+            "k": k,
+            "standardise": standardise,
+            "scaler": _scaler_fingerprint(scaler) if standardise else None,
+            "use_pca": use_pca,
+            "pca_components": pca_components if use_pca else None,
+            "pca_solver": pca_solver if use_pca else None,
+            "random_state": random_state,
+            "dtype": np.dtype(dtype).str,
+            "silhouette_sample_size": silhouette_sample_size,
+            "coreset_size": coreset_size,
+            "deduplicate": deduplicate,
+        })
+
+    X = None
+    table = None
+    pca = None
+    plot_cached = cached is not None and "plot_xy" in cached[0]
+    if cached is None or compute_elbow or (plots and not plot_cached):
+        # Load the feature matrix (with the full table, if it will be labelled)
+        X, table = yield "load", _load_stage, (
+            input_path, feature_cols, dtype, cache_matrix, return_data or output_path is not None,
+        )
+        X, scaler = yield "standardise", _standardise_stage, (X, standardise, scaler)
+        X, pca = yield "pca", _pca_stage, (X, use_pca, pca_components, pca_solver, random_state)
 
-    # Plot clusters (2D)
-    fig_cluster, _ = plot_clusters_2d(X, labels, centroids=centroids, title="Cluster plot")
+    # Rows to fit on: X, its unique rows and/or a coreset of them
+    X_rows, X_fit, fit_weight, inverse = X, X, None, None
+    if X is not None and (cached is None or compute_elbow):
+        if deduplicate:
+            X_rows, fit_weight, inverse = yield "deduplicate", _deduplicate_stage, (X, k)
+            X_fit = X_rows
+        if coreset_size is not None:
+            X_fit, fit_weight = yield "coreset", _coreset_stage, (
+                X_rows, coreset_size, random_state, fit_weight,
+            )
+
+    if cached is None:
+        labels, centroids = yield "cluster", _cluster_stage, (
+            X_rows, X_fit, inverse, algorithm, k, random_state, fit_weight,
+        )
+        # The silhouette (O(n^2) unless sampled) is timed as its own stage.
+        inertia = yield "metrics", compute_inertia, (X, labels, centroids)
+        silhouette = yield "silhouette", _silhouette_stage, (
+            X, labels, silhouette_sample_size, random_state,
+        )
+        metrics = {"inertia": inertia, "silhouette": silhouette}
+        if cache_key is not None:
+            yield "cache_store", _cache_store_stage, (
+                result_cache, cache_key, labels, centroids, scaler, pca, X, metrics,
+            )
+    else:
+        arrays, meta = cached
+        labels = arrays["labels"].astype(np.intp)
+        centroids = arrays["centroids"]
+        metrics = meta["metrics"]
+        if X is None:
+            scaler, pca = _unpack_preprocessing(arrays)
+
+    # Add labels to the full input table (only if needed) and export
+    df = yield "export", _label_data, (input_path, labels, output_path, return_data, table)
 
     # Optional elbow curve
-    fig_elbow = None
     elbow_inertias: Optional[Dict[int, float]] = None
     if compute_elbow:
-        if elbow_k_values is None:
-            max_k = max(2, k + 5)
-            elbow_k_values = list(range(1, max_k + 1))
-        elbow_inertias = elbow_curve(
-            X,
-            k_values=elbow_k_values,
-            random_state=random_state,
-            use_sklearn=(algorithm == "sklearn_kmeans"),
-        )
-        fig_elbow, _ = plot_elbow(
-            elbow_k_values,
-            [elbow_inertias[val] for val in elbow_k_values],
+        elbow_inertias = yield "elbow", _elbow_stage, (
+            X_fit, algorithm, k, elbow_k_values, random_state, fit_weight,
         )
 
-    result: Dict[str, Any] = {
+    # Plots, only if figures were requested
+    fig_cluster = fig_elbow = None
+    if plots:
+        X_plot = X if X is not None else cached[0]["plot_xy"]
+        fig_cluster, fig_elbow = yield "plots", _plot_stage, (X_plot, labels, centroids, elbow_inertias)
+
+    return {
         "data": df,
         "labels": labels,
         "centroids": centroids,
@@ -142,5 +318,348 @@ def run_clustering(
         "fig_cluster": fig_cluster,
         "fig_elbow": fig_elbow,
         "elbow_inertias": elbow_inertias,
+        "scaler": scaler,
+        "pca": pca,
+        "cached": cached is not None,
+    }
+
+
+def _cache_lookup_stage(
+    result_cache: ResultCache,
+    input_path: str,
+    params: Dict[str, Any],
+) -> Tuple[str, Any]:
+    """Cache key of a run and the cached (arrays, meta) entry, or None."""
+    cache_key = result_cache.make_key(input_path, params)
+    return cache_key, result_cache.get(cache_key)
+
+
+def _cache_store_stage(
+    result_cache: ResultCache,
+    cache_key: str,
+    labels: np.ndarray,
+    centroids: np.ndarray,
+    scaler: Optional[FeatureScaler],
+    pca: Any,
+    X: np.ndarray,
+    metrics: Dict[str, Any],
+) -> None:
+    result_cache.put(cache_key, _pack_result(labels, centroids, scaler, pca, X), {"metrics": metrics})
+
+
+def _cluster_stage(
+    X_rows: np.ndarray,
+    X_fit: np.ndarray,
+    inverse: Optional[np.ndarray],
+    algorithm: str,
+    k: int,
+    random_state: Optional[int],
+    sample_weight: Optional[np.ndarray],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Fit on X_fit and label every input row."""
+    labels, centroids = fit_clusters(X_fit, algorithm, k, random_state, sample_weight)
+    return _expand_labels(X_rows, X_fit, inverse, labels, centroids), centroids
+
+
+def _standardise_stage(
+    X: np.ndarray,
+    standardise: bool,
+    scaler: Optional[FeatureScaler],
+) -> Tuple[np.ndarray, Optional[FeatureScaler]]:
+    """Optionally standardise X in place, fitting the scaler if needed."""
+    if not standardise:
+        return X, None
+    if scaler is None:
+        scaler = FeatureScaler()
+    if not scaler.is_fitted:
+        scaler.fit(X)
+    return scaler.transform(X, copy=False), scaler
+
+
+def _pca_stage(
+    X: np.ndarray,
+    use_pca: bool,
+    pca_components: int,
+    pca_solver: str,
+    random_state: Optional[int],
+) -> Tuple[np.ndarray, Any]:
+    """Optionally project X onto its leading principal components."""
+    if not use_pca:
+        return X, None
+    return apply_pca(
+        X,
+        n_components=pca_components,
+        solver=pca_solver,
+        random_state=random_state,
+        return_model=True,
+    )
+
+
+def _load_stage(
+    input_path: str,
+    feature_cols: List[str],
+    dtype: Any,
+    cache_matrix: bool,
+    need_table: bool,
+) -> Tuple[np.ndarray, Optional[pd.DataFrame]]:
+    """
+    Feature matrix, plus the full input table when it will be labelled. The
+    CSV is parsed once either way: only the feature columns when the table
+    is not needed, otherwise the whole file (the matrix sidecar is then not
+    used).
+    """
+    if need_table:
+        table, X = load_table_with_features(input_path, feature_cols, dtype=dtype)
+        return X, table
+    return load_feature_matrix(input_path, feature_cols, dtype=dtype, cache=cache_matrix), None
+
+
+def _label_data(
+    input_path: str,
+    labels: np.ndarray,
+    output_path: Optional[str],
+    return_data: bool,
+    table: Optional[pd.DataFrame] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Attach labels to the full input table (read here unless already loaded
+    as ``table``) and optionally export it.
+    """
+    if not return_data and output_path is None:
+        return None
+    df = pd.read_csv(input_path) if table is None else table
+    df["cluster"] = labels
+
+    # Export if requested
+    if output_path is not None:
+        export_to_csv(df, output_path, delimiter=",", include_index=False)
+    return df
+
+
+def _deduplicate_stage(
+    X: np.ndarray,
+    k: int,
+) -> Tuple[np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]:
+    """
+    Unique rows of X, their counts (as weights) and each row's unique-row
+    index; X itself (unweighted, no index) if it has fewer than k unique rows.
+    """
+    unique, inverse, counts = np.unique(X, axis=0, return_inverse=True, return_counts=True)
+    if unique.shape[0] < k:
+        return X, None, None
+    return unique, counts.astype(float), inverse.reshape(-1)
+
+
+def _coreset_stage(
+    X: np.ndarray,
+    coreset_size: int,
+    random_state: Optional[int],
+    sample_weight: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Weighted coreset to fit on, or X itself if it is small enough."""
+    if coreset_size <= 0:
+        raise ValueError("coreset_size must be a positive integer.")
+    if coreset_size >= X.shape[0]:
+        return X, sample_weight
+    return lightweight_coreset(X, coreset_size, sample_weight=sample_weight, random_state=random_state)
+
+
+def _expand_labels(
+    X_rows: np.ndarray,
+    X_fit: np.ndarray,
+    inverse: Optional[np.ndarray],
+    labels: np.ndarray,
+    centroids: np.ndarray,
+) -> np.ndarray:
+    """
+    Labels of every input row from a fit on X_fit: rows of a coreset are
+    relabelled by nearest centroid, unique rows are mapped back through
+    ``inverse``.
+    """
+    if X_fit.shape[0] != X_rows.shape[0]:  # fitted on a coreset
+        labels = assign_clusters(X_rows, centroids)
+    if inverse is not None:
+        labels = labels[inverse]
+    return labels
+
+
+def _elbow_stage(
+    X: np.ndarray,
+    algorithm: str,
+    k: int,
+    elbow_k_values: Optional[List[int]],
+    random_state: Optional[int],
+    sample_weight: Optional[np.ndarray] = None,
+) -> Dict[int, float]:
+    """Inertia for each elbow k (defaults to 1..k+5) up to the number of rows of X."""
+    if elbow_k_values is None:
+        max_k = max(2, k + 5)
+        elbow_k_values = list(range(1, max_k + 1))
+    elbow_k_values = [k_value for k_value in elbow_k_values if k_value <= X.shape[0]]
+    return elbow_curve(
+        X,
+        k_values=elbow_k_values,
+        random_state=random_state,
+        use_sklearn=(algorithm == "sklearn_kmeans"),
+        sample_weight=sample_weight,
+    )
+
+
+def _plot_stage(
+    X: np.ndarray,
+    labels: np.ndarray,
+    centroids: np.ndarray,
+    elbow_inertias: Optional[Dict[int, float]],
+) -> Tuple[Any, Any]:
+    """Build the headless cluster figure and, if available, the elbow figure."""
+    from .plotting_clustered import plot_clusters_2d, plot_elbow
+
+    fig_cluster, _ = plot_clusters_2d(
+        X, labels, centroids=centroids, title="Cluster plot", headless=True
+    )
+    fig_elbow = None
+    if elbow_inertias is not None:
+        fig_elbow, _ = plot_elbow(
+            list(elbow_inertias), list(elbow_inertias.values()), headless=True
+        )
+    return fig_cluster, fig_elbow
+
+
+def fit_clusters(
+    X: np.ndarray,
+    algorithm: str,
+    k: int,
+    random_state: Optional[int] = None,
+    sample_weight: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Run the named clustering algorithm (the clustering step of
+    ``run_clustering``, shared with ``run_sweep`` and the async workflow).
+
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    algorithm : {"kmeans", "sklearn_kmeans", "bisecting_kmeans"}
+    k : int
+    random_state : int or None, default None
+    sample_weight : ndarray of shape (n_samples,) or None, default None
+        Row weights; not supported by "bisecting_kmeans".
+
+    Returns
+    -------
+    labels : ndarray of shape (n_samples,)
+    centroids : ndarray of shape (k, n_features)
+    """
+    if algorithm == "kmeans":
+        return kmeans(X, k=k, random_state=random_state, sample_weight=sample_weight)
+    if algorithm == "sklearn_kmeans":
+        return sklearn_kmeans(X, k=k, random_state=random_state, sample_weight=sample_weight)
+    if sample_weight is not None and algorithm == "bisecting_kmeans":
+        raise ValueError("Algorithm 'bisecting_kmeans' does not support weighted fits.")
+    if algorithm == "bisecting_kmeans":
+        return bisecting_kmeans(X, k=k, random_state=random_state)
+    raise ValueError(
+        f"Unknown algorithm '{algorithm}'. Use 'kmeans', 'sklearn_kmeans' or 'bisecting_kmeans'."
+    )
+
+
+def compute_metrics(
+    X: np.ndarray,
+    labels: np.ndarray,
+    centroids: np.ndarray,
+    silhouette_sample_size: Optional[int] = None,
+    random_state: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Inertia and (when defined) silhouette score of a clustering, as
+    reported in ``run_clustering``'s "metrics".
+
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    labels : ndarray of shape (n_samples,)
+    centroids : ndarray of shape (k, n_features)
+    silhouette_sample_size : int or None, default None
+        If given, estimate the silhouette on a random subset of this size.
+    random_state : int or None, default None
+
+    Returns
+    -------
+    metrics : dict
+        "inertia" and "silhouette" (None when there is a single cluster).
+    """
+    return {
+        "inertia": compute_inertia(X, labels, centroids),
+        "silhouette": _silhouette_stage(X, labels, silhouette_sample_size, random_state),
+    }
+
+
+def _silhouette_stage(
+    X: np.ndarray,
+    labels: np.ndarray,
+    silhouette_sample_size: Optional[int],
+    random_state: Optional[int],
+) -> Optional[float]:
+    """Silhouette score, or None when it is undefined (e.g. a single cluster)."""
+    try:
+        return silhouette_score_sklearn(
+            X, labels, sample_size=silhouette_sample_size, random_state=random_state
+        )
+    except ValueError:
+        return None
+
+
+def _scaler_fingerprint(scaler: Optional[FeatureScaler]) -> Optional[str]:
+    if scaler is None:
+        return None
+    digest = hashlib.sha256(scaler.mean_.tobytes())
+    digest.update(scaler.var_.tobytes())
+    return digest.hexdigest()
+
+
+def _pack_result(
+    labels: np.ndarray,
+    centroids: np.ndarray,
+    scaler: Optional[FeatureScaler],
+    pca: Any,
+    X: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Arrays stored in the result cache, with labels in the smallest int type
+    and the two plotted columns of X (the cluster plot's only input).
+    """
+    arrays = {
+        "labels": labels.astype(np.min_scalar_type(max(len(centroids) - 1, 0))),
+        "centroids": centroids,
     }
-    return result
\ No newline at end of file
+    if X is not None and X.shape[1] >= 2:
+        arrays["plot_xy"] = np.ascontiguousarray(X[:, :2])
+    if scaler is not None:
+        arrays["scaler_mean"] = scaler.mean_
+        arrays["scaler_m2"] = scaler.var_ * scaler.n_samples_seen_
+        arrays["scaler_n"] = np.array(scaler.n_samples_seen_)
+    if pca is not None:
+        arrays["pca_mean"] = pca.mean_
+        arrays["pca_components"] = pca.components_
+        arrays["pca_explained_variance"] = pca.explained_variance_
+    return arrays
+
+
+def _unpack_preprocessing(arrays: Dict[str, np.ndarray]) -> Tuple[Optional[FeatureScaler], Any]:
+    """Rebuild the fitted scaler and PCA projector stored by _pack_result."""
+    scaler = None
+    if "scaler_mean" in arrays:
+        scaler = FeatureScaler.from_params(
+            arrays["scaler_mean"], arrays["scaler_m2"], arrays["scaler_n"]
+        )
+
+    pca = None
+    if "pca_mean" in arrays:
+        components = arrays["pca_components"]
+        pca = PCA(n_components=components.shape[0])
+        pca.mean_ = arrays["pca_mean"]
+        pca.components_ = components
+        pca.explained_variance_ = arrays["pca_explained_variance"]
+        pca.n_components_ = components.shape[0]
+        pca.n_features_in_ = components.shape[1]
+    return scaler, pca
@@ -0,0 +1,267 @@
+###
+## cluster_maker
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from .centroid_index import CentroidIndex
+
+_FORMAT_VERSION = 1
+
+
+class ClusterModel:
+    """
+    Fitted clustering pipeline for labelling new data.
+
+    Holds the standardisation statistics, the PCA projection and the
+    centroids produced by a clustering run. Because standardisation and PCA
+    are both affine, the whole pipeline followed by the nearest-centroid
+    search is folded at construction time into a single weight matrix W of
+    shape (n_features, k) and bias b of shape (k,):
+
+        argmin_c ||z(x) - c||^2 = argmin_c (x @ W + b)_c
+
+    so labelling a batch costs one matrix product per row block, whatever
+    preprocessing was used.
+
+    Parameters
+    ----------
+    centroids : ndarray of shape (k, n_components)
+        Centroids in the preprocessed (standardised / projected) space.
+    scaler_mean, scaler_scale : ndarray of shape (n_features,) or None
+        Standardisation statistics; None if the data was not standardised.
+    pca_mean : ndarray of shape (n_features,) or None
+    pca_components : ndarray of shape (n_components, n_features) or None
+        PCA projection; None if PCA was not used.
+    feature_cols : list of str or None
+        Input column names, used to select columns from DataFrame input.
+    """
+
+    def __init__(
+        self,
+        centroids: np.ndarray,
+        scaler_mean: Optional[np.ndarray] = None,
+        scaler_scale: Optional[np.ndarray] = None,
+        pca_mean: Optional[np.ndarray] = None,
+        pca_components: Optional[np.ndarray] = None,
+        feature_cols: Optional[List[str]] = None,
+    ) -> None:
+        self.centroids = np.asarray(centroids, dtype=float)
+        self.scaler_mean = None if scaler_mean is None else np.asarray(scaler_mean, dtype=float)
+        self.scaler_scale = None if scaler_scale is None else np.asarray(scaler_scale, dtype=float)
+        self.pca_mean = None if pca_mean is None else np.asarray(pca_mean, dtype=float)
+        self.pca_components = None if pca_components is None else np.asarray(pca_components, dtype=float)
+        self.feature_cols = None if feature_cols is None else list(feature_cols)
+
+        if (self.scaler_mean is None) != (self.scaler_scale is None):
+            raise ValueError("scaler_mean and scaler_scale must be given together.")
+        if (self.pca_mean is None) != (self.pca_components is None):
+            raise ValueError("pca_mean and pca_components must be given together.")
+
+        self._fold()
+
+    @property
+    def n_clusters(self) -> int:
+        return self.centroids.shape[0]
+
+    @property
+    def n_features_in(self) -> int:
+        return self._weights.shape[0]
+
+    def _fold(self) -> None:
+        """Fold preprocessing and centroid norms into one affine scoring step."""
+        # Preprocessing as z = x @ P + o
+        if self.pca_components is not None:
+            P = self.pca_components.T.copy()
+            o = -self.pca_mean @ P
+        else:
+            P = None
+            o = np.zeros(self.centroids.shape[1])
+
+        if self.scaler_mean is not None:
+            inv_scale = 1.0 / self.scaler_scale
+            if P is None:
+                P = np.diag(inv_scale)
+                o = -self.scaler_mean * inv_scale
+            else:
+                o = o - (self.scaler_mean * inv_scale) @ P
+                P = inv_scale[:, np.newaxis] * P
+
+        if P is None:
+            P = np.eye(self.centroids.shape[1])
+
+        if P.shape[1] != self.centroids.shape[1]:
+            raise ValueError("Centroid dimension does not match the preprocessing output.")
+
+        self._proj = P
+        self._offset = o
+        # ||z - c||^2 = ||z||^2 - 2 z.c + ||c||^2; ||z||^2 is constant per row.
+        self._weights = np.ascontiguousarray(-2.0 * (P @ self.centroids.T))
+        self._bias = (
+            np.einsum("ij,ij->i", self.centroids, self.centroids)
+            - 2.0 * (o @ self.centroids.T)
+        )
+
+    @classmethod
+    def from_result(
+        cls,
+        result: Dict[str, Any],
+        feature_cols: Optional[List[str]] = None,
+    ) -> "ClusterModel":
+        """
+        Build a model from the dictionary returned by ``run_clustering``.
+
+        Parameters
+        ----------
+        result : dict
+            Must contain "centroids", and optionally "scaler" and "pca".
+        feature_cols : list of str or None
+            Input column names used for the run.
+        """
+        scaler = result.get("scaler")
+        pca = result.get("pca")
+
+        scaler_mean = scaler_scale = None
+        if scaler is not None:
+            scaler_mean, scaler_scale = scaler.mean_, scaler.scale_
+
+        pca_mean = pca_components = None
+        if pca is not None:
+            pca_mean = pca.mean_
+            pca_components = pca.components_
+            if getattr(pca, "whiten", False):
+                pca_components = pca_components / np.sqrt(pca.explained_variance_)[:, np.newaxis]
+
+        return cls(
+            result["centroids"],
+            scaler_mean=scaler_mean,
+            scaler_scale=scaler_scale,
+            pca_mean=pca_mean,
+            pca_components=pca_components,
+            feature_cols=feature_cols,
+        )
+
+    def _as_matrix(self, X: Any) -> np.ndarray:
+        if isinstance(X, pd.DataFrame):
+            if self.feature_cols is not None:
+                X = X[self.feature_cols]
+            X = X.to_numpy(dtype=float)
+        else:
+            X = np.asarray(X)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.ndim != 2 or X.shape[1] != self._weights.shape[0]:
+            raise ValueError(
+                f"X must have {self._weights.shape[0]} features per row."
+            )
+        return X
+
+    def transform(self, X: Any) -> np.ndarray:
+        """
+        Apply the fitted preprocessing (standardisation and PCA) to X.
+        """
+        X = self._as_matrix(X)
+        return X @ self._proj + self._offset
+
+    def build_index(self, mode: str = "exact", **kwargs: Any) -> "CentroidIndex":
+        """
+        Build a ``CentroidIndex`` over the model's centroids, for ``predict``.
+
+        Parameters
+        ----------
+        mode : {"exact", "approximate"}, default "exact"
+        **kwargs
+            Further ``CentroidIndex`` arguments (n_groups, n_probe, random_state).
+        """
+        from .centroid_index import CentroidIndex
+
+        return CentroidIndex(self.centroids, mode=mode, **kwargs)
+
+    def predict(
+        self,
+        X: Any,
+        block_size: Optional[int] = None,
+        index: Optional["CentroidIndex"] = None,
+    ) -> np.ndarray:
+        """
+        Label rows of X with the index of their nearest centroid.
+
+        Parameters
+        ----------
+        X : ndarray of shape (n_samples, n_features) or (n_features,), or DataFrame
+            Raw (unpreprocessed) input rows. A 1D array is treated as one row.
+        block_size : int or None, default None
+            Rows scored per block. Defaults to a size keeping each block's
+            score matrix at roughly 8 MB, so memory stays bounded for
+            batches of millions of rows.
+        index : CentroidIndex or None, default None
+            Index from ``build_index``. If given, each block is preprocessed
+            with ``transform`` and searched through the index instead of
+            scored against every centroid, which is faster for large k.
+
+        Returns
+        -------
+        labels : ndarray of shape (n_samples,)
+        """
+        X = self._as_matrix(X)
+        n_samples = X.shape[0]
+        if index is not None:
+            if index.n_clusters != self.n_clusters:
+                raise ValueError("index was built for a different set of centroids.")
+            block_size = block_size or (1 << 16)
+            labels = np.empty(n_samples, dtype=np.intp)
+            for start in range(0, n_samples, block_size):
+                block = self.transform(X[start:start + block_size])
+                labels[start:start + block_size] = index.query(block)
+            return labels
+
+        if block_size is None:
+            block_size = max(1, (1 << 20) // self.n_clusters)
+
+        if n_samples <= block_size:
+            scores = X @ self._weights
+            scores += self._bias
+            return scores.argmin(axis=1)
+
+        labels = np.empty(n_samples, dtype=np.intp)
+        for start in range(0, n_samples, block_size):
+            scores = X[start:start + block_size] @ self._weights
+            scores += self._bias
+            labels[start:start + block_size] = scores.argmin(axis=1)
+        return labels
+
+    def save(self, path: str) -> None:
+        """
+        Save the model to an uncompressed ``.npz`` file.
+
+        Only the small parameter arrays are stored, so loading is a handful
+        of array reads.
+        """
+        arrays: Dict[str, np.ndarray] = {"centroids": self.centroids}
+        for name in ("scaler_mean", "scaler_scale", "pca_mean", "pca_components"):
+            value = getattr(self, name)
+            if value is not None:
+                arrays[name] = value
+        meta = {"format_version": _FORMAT_VERSION, "feature_cols": self.feature_cols}
+        np.savez(path, meta=np.array(json.dumps(meta)), **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "ClusterModel":
+        """
+        Load a model written by :meth:`save`.
+        """
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("format_version") != _FORMAT_VERSION:
+                raise ValueError(f"Unsupported model format in '{path}'.")
+            arrays = {name: data[name] for name in data.files if name != "meta"}
+        return cls(feature_cols=meta.get("feature_cols"), **arrays)
@@ -0,0 +1,283 @@
+###
+## cluster_maker
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from ._matrix import cluster_sums
+from .algorithms import kmeans, nearest_centroid, sklearn_kmeans
+from .preprocessing import merge_moments
+
+
+class OnlineKMeans:
+    """
+    K-means updated batch by batch, with drift detection and re-fitting.
+
+    The model keeps the per-cluster sums and counts of the points assigned
+    so far (the sufficient statistics of the centroid update). Each call to
+    ``partial_fit`` assigns the new batch to the current centroids, adds its
+    sums and counts (after multiplying the old ones by ``decay``) and moves
+    the centroids to the new means, so an update costs O(batch size * k)
+    whatever the length of the history.
+
+    Before the update, the batch is checked for drift against the model:
+
+    - inertia: the batch's mean squared distance to its nearest centroid is
+      compared with the same quantity over earlier batches (running mean and
+      standard deviation, Welford); a z-score above ``drift_threshold``
+      flags drift.
+    - cluster sizes: the total variation distance between the batch's
+      cluster-size distribution and the model's (counts normalised) above
+      ``size_threshold`` flags drift.
+
+    Checks start once ``min_batches`` batches have built the baseline. On
+    drift (with ``refit=True``) the model is re-fitted on the drifted batch
+    only (at least the k most recent points), the data of the new regime:
+    the new centroids are matched one-to-one with the old ones so cluster
+    labels keep their meaning, and the statistics and baseline restart from
+    that batch. The cost is O(batch size), and history is not replayed.
+
+    Parameters
+    ----------
+    k : int
+        Number of clusters.
+    decay : float, default 1.0
+        Factor in (0, 1] applied to the old sums and counts at each batch.
+        1.0 weights all points equally; smaller values forget old batches
+        geometrically.
+    drift_threshold : float, default 4.0
+        z-score of the batch inertia above which drift is flagged.
+    size_threshold : float, default 0.25
+        Total variation distance (between 0 and 1) of the cluster-size
+        distributions above which drift is flagged.
+    min_batches : int, default 5
+        Batches used to build the inertia baseline before drift is checked.
+    window_size : int, default 10000
+        Most recent points kept for re-fitting (see ``refit``).
+    refit : bool, default True
+        If True, re-fit on drift; if False, drift is only recorded.
+    random_state : int or None, default None
+        Seed for the initial fit and the re-fits.
+
+    Attributes
+    ----------
+    centroids_ : ndarray of shape (k, n_features) or None
+    sums_ : ndarray of shape (k, n_features) or None
+    counts_ : ndarray of shape (k,) or None
+        (Decayed) sum and number of the points assigned to each cluster.
+    n_batches_ : int
+    n_samples_seen_ : int
+    drift_ : bool
+        Whether drift was flagged on the last batch.
+    drift_events_ : list of dict
+        One record per flagged batch: "batch" (index), "reasons" (a list of
+        "inertia" and/or "sizes"), "inertia_z", "size_distance" and "refit".
+    """
+
+    def __init__(
+        self,
+        k: int,
+        decay: float = 1.0,
+        drift_threshold: float = 4.0,
+        size_threshold: float = 0.25,
+        min_batches: int = 5,
+        window_size: int = 10_000,
+        refit: bool = True,
+        random_state: Optional[int] = None,
+    ) -> None:
+        if k <= 0:
+            raise ValueError("k must be a positive integer.")
+        if not 0.0 < decay <= 1.0:
+            raise ValueError("decay must be in (0, 1].")
+        if min_batches < 2:
+            raise ValueError("min_batches must be at least 2.")
+        if window_size < k:
+            raise ValueError("window_size must be at least k.")
+        self.k = k
+        self.decay = decay
+        self.drift_threshold = drift_threshold
+        self.size_threshold = size_threshold
+        self.min_batches = min_batches
+        self.window_size = window_size
+        self.refit_on_drift = refit
+        self.random_state = random_state
+
+        self.centroids_: Optional[np.ndarray] = None
+        self.sums_: Optional[np.ndarray] = None
+        self.counts_: Optional[np.ndarray] = None
+        self.n_batches_: int = 0
+        self.n_samples_seen_: int = 0
+        self.drift_: bool = False
+        self.drift_events_: List[Dict[str, Any]] = []
+
+        # Baseline of per-batch mean squared distances (Welford).
+        self._baseline_n = 0
+        self._baseline_mean = 0.0
+        self._baseline_m2 = 0.0
+        # Ring buffer of the most recent points.
+        self._window: Optional[np.ndarray] = None
+        self._window_pos = 0
+        self._window_len = 0
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.centroids_ is not None
+
+    def partial_fit(self, X: np.ndarray) -> "OnlineKMeans":
+        """
+        Update the model with a batch of samples.
+
+        Parameters
+        ----------
+        X : ndarray of shape (n_batch, n_features)
+            The first non-empty batch must hold at least k rows; it is
+            clustered with ``kmeans`` to initialise the centroids.
+
+        Returns
+        -------
+        self : OnlineKMeans
+        """
+        if not isinstance(X, np.ndarray):
+            raise TypeError("X must be a NumPy array.")
+        if X.ndim != 2:
+            raise ValueError("X must be a 2D array.")
+        n_batch = X.shape[0]
+        if n_batch == 0:
+            return self
+        X = np.asarray(X, dtype=float)
+
+        if not self.is_fitted:
+            if n_batch < self.k:
+                raise ValueError("The first batch must hold at least k samples.")
+            labels, self.centroids_ = kmeans(X, self.k, random_state=self.random_state)
+            self.sums_, self.counts_ = cluster_sums(X, labels, self.k)
+            self.counts_ = self.counts_.astype(float)
+            self._push_window(X)
+            self.n_batches_ = 1
+            self.n_samples_seen_ = n_batch
+            self.drift_ = False
+            return self
+
+        if X.shape[1] != self.centroids_.shape[1]:
+            raise ValueError("X has a different number of features than the fitted data.")
+
+        labels, sq_dist = nearest_centroid(X, self.centroids_, return_distances=True)
+        batch_inertia = float(sq_dist.mean())
+        batch_sizes = np.bincount(labels, minlength=self.k) / n_batch
+        size_distance = float(0.5 * np.abs(batch_sizes - self.counts_ / self.counts_.sum()).sum())
+
+        reasons = []
+        inertia_z = None
+        if self._baseline_n >= self.min_batches:
+            inertia_z = self._inertia_z(batch_inertia)
+            if inertia_z > self.drift_threshold:
+                reasons.append("inertia")
+            if size_distance > self.size_threshold:
+                reasons.append("sizes")
+
+        # Sufficient-statistics update: O(n_batch * k), independent of history.
+        sums, counts = cluster_sums(X, labels, self.k)
+        self.sums_ = self.decay * self.sums_ + sums
+        self.counts_ = self.decay * self.counts_ + counts
+        assigned = self.counts_ > 0
+        self.centroids_[assigned] = self.sums_[assigned] / self.counts_[assigned, np.newaxis]
+
+        self._push_window(X)
+        self.n_batches_ += 1
+        self.n_samples_seen_ += n_batch
+        self.drift_ = bool(reasons)
+
+        if self.drift_:
+            self.drift_events_.append({
+                "batch": self.n_batches_ - 1,
+                "reasons": reasons,
+                "inertia_z": inertia_z,
+                "size_distance": size_distance,
+                "refit": self.refit_on_drift,
+            })
+            if self.refit_on_drift:
+                self.refit(max(n_batch, self.k))
+        else:
+            self._update_baseline(batch_inertia)
+        return self
+
+    def refit(self, n_recent: Optional[int] = None) -> "OnlineKMeans":
+        """
+        Re-fit on the most recent points and restart the statistics and
+        drift baseline from them.
+
+        The points are clustered with ``sklearn_kmeans`` (k-means++, several
+        initialisations), then each new centroid is matched to an old one
+        (minimum total distance) so that cluster labels keep their meaning.
+
+        Parameters
+        ----------
+        n_recent : int or None, default None
+            Number of most recent points to fit on, at most ``window_size``.
+            None uses every point in the window.
+        """
+        if not self.is_fitted:
+            raise ValueError("OnlineKMeans has not been fitted yet.")
+        X = self._recent(n_recent)
+        if X.shape[0] < self.k:
+            raise ValueError("At least k recent points are needed to re-fit.")
+        labels, centroids = sklearn_kmeans(X, self.k, random_state=self.random_state)
+        cost = ((centroids[:, np.newaxis] - self.centroids_[np.newaxis]) ** 2).sum(axis=2)
+        new_ids, old_ids = linear_sum_assignment(cost)
+        relabel = np.empty(self.k, dtype=np.intp)
+        relabel[new_ids] = old_ids
+        labels = relabel[labels]
+        self.centroids_ = np.empty_like(centroids)
+        self.centroids_[old_ids] = centroids[new_ids]
+        self.sums_, self.counts_ = cluster_sums(X, labels, self.k)
+        self.counts_ = self.counts_.astype(float)
+        self._baseline_n = 0
+        self._baseline_mean = 0.0
+        self._baseline_m2 = 0.0
+        return self
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Index of the nearest centroid of each row of X."""
+        if not self.is_fitted:
+            raise ValueError("OnlineKMeans has not been fitted yet.")
+        return nearest_centroid(X, self.centroids_)
+
+    def _inertia_z(self, batch_inertia: float) -> float:
+        std = np.sqrt(self._baseline_m2 / (self._baseline_n - 1))
+        excess = batch_inertia - self._baseline_mean
+        if std > 0:
+            return float(excess / std)
+        return float("inf") if excess > 0 else 0.0
+
+    def _update_baseline(self, batch_inertia: float) -> None:
+        self._baseline_n, self._baseline_mean, self._baseline_m2 = merge_moments(
+            self._baseline_n, self._baseline_mean, self._baseline_m2, 1, batch_inertia, 0.0
+        )
+
+    def _recent(self, n: Optional[int]) -> np.ndarray:
+        """The n most recent points (all of the window if None), oldest first."""
+        n = self._window_len if n is None else min(n, self._window_len)
+        positions = (self._window_pos - n + np.arange(n)) % self.window_size
+        return self._window[positions]
+
+    def _push_window(self, X: np.ndarray) -> None:
+        """Write the rows of X into the ring buffer of recent points."""
+        size = self.window_size
+        if self._window is None:
+            self._window = np.empty((size, X.shape[1]))
+        if X.shape[0] >= size:
+            self._window[:] = X[-size:]
+            self._window_pos = 0
+            self._window_len = size
+            return
+        positions = (self._window_pos + np.arange(X.shape[0])) % size
+        self._window[positions] = X
+        self._window_pos = int(positions[-1] + 1) % size
+        self._window_len = min(self._window_len + X.shape[0], size)
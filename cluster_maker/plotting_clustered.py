@@ -6,10 +6,119 @@
 
 from __future__ import annotations
 
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, TYPE_CHECKING
 
 import numpy as np
-import matplotlib.pyplot as plt
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+    from matplotlib.figure import Figure
+
+
+def _new_figure(headless: bool) -> Tuple["Figure", "Axes"]:
+    """
+    Create a figure with a single Axes.
+
+    Headless figures are drawn on an Agg canvas and are never registered with
+    pyplot, so no GUI backend is needed, nothing accumulates in pyplot's
+    figure registry and the figure is freed as soon as it is dropped.
+    """
+    if headless:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        return fig, fig.add_subplot()
+
+    import matplotlib.pyplot as plt
+
+    return plt.subplots()
+
+
+# Above SCATTER_MAX_POINTS, "auto" mode draws a reservoir sample of that
+# many points; above DENSITY_MIN_POINTS it switches to the density image.
+SCATTER_MAX_POINTS = 100_000
+DENSITY_MIN_POINTS = 1_000_000
+# The density image keeps one bins x bins count layer per cluster for at
+# most DENSITY_MAX_LAYERS - 1 clusters; the rest share a grey "other" layer.
+DENSITY_MAX_LAYERS = 16
+_OTHER_COLOUR = (0.5, 0.5, 0.5, 1.0)
+
+
+def _reservoir_sample(n: int, size: int, rng: np.random.RandomState) -> np.ndarray:
+    """
+    Indices of a uniform sample of ``size`` out of ``n`` items (Algorithm R).
+
+    The replacement draws for items ``size..n-1`` are generated in one
+    vectorised call; when several items pick the same slot only the last
+    one is written, exactly as in the sequential algorithm. The indices are
+    returned in increasing order so the sample keeps the drawing order of
+    the data.
+    """
+    reservoir = np.arange(size)
+    if n > size:
+        items = np.arange(size, n)
+        slots = (rng.random_sample(n - size) * (items + 1)).astype(np.int64)
+        keep = slots < size
+        slots, items = slots[keep][::-1], items[keep][::-1]
+        # First occurrence in the reversed order = last replacement per slot.
+        slots, last = np.unique(slots, return_index=True)
+        reservoir[slots] = items[last]
+    reservoir.sort()
+    return reservoir
+
+
+def _density_layers(offsets: np.ndarray, max_layers: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Density layer of every point and the cluster offset drawn by each layer.
+
+    Up to ``max_layers`` clusters each get their own layer. Beyond that, the
+    ``max_layers - 1`` largest clusters keep one and all others share a last
+    "other" layer (offset -1), so the image never holds more than
+    ``max_layers`` count layers whatever the number of clusters.
+    """
+    sizes = np.bincount(offsets)
+    if sizes.size <= max_layers:
+        return offsets, np.arange(sizes.size)
+    top = np.argsort(-sizes, kind="stable")[: max_layers - 1]
+    layer_of = np.full(sizes.size, max_layers - 1, dtype=np.int64)
+    layer_of[top] = np.arange(max_layers - 1)
+    return layer_of[offsets], np.append(top, -1)
+
+
+def _density_image(
+    x: np.ndarray,
+    y: np.ndarray,
+    labels: np.ndarray,
+    colours: np.ndarray,
+    bins: int,
+) -> Tuple[np.ndarray, Tuple[float, float, float, float]]:
+    """
+    Rasterise points into an RGBA image with one colour layer per cluster.
+
+    Each pixel's colour is the count-weighted mix of the cluster colours of
+    the points falling in it, and its opacity grows with log(1 + count), so
+    both dense cores and sparse tails stay visible.
+    """
+    x_min, x_max = float(x.min()), float(x.max())
+    y_min, y_max = float(y.min()), float(y.max())
+    x_span = (x_max - x_min) or 1.0
+    y_span = (y_max - y_min) or 1.0
+
+    ix = np.clip(((x - x_min) * (bins / x_span)).astype(np.int64), 0, bins - 1)
+    iy = np.clip(((y - y_min) * (bins / y_span)).astype(np.int64), 0, bins - 1)
+    n_layers = colours.shape[0]
+    flat = (labels * bins + iy) * bins + ix
+    counts = np.bincount(flat, minlength=n_layers * bins * bins).reshape(n_layers, bins, bins)
+
+    total = counts.sum(axis=0)
+    image = np.zeros((bins, bins, 4))
+    occupied = total > 0
+    image[..., :3] = np.tensordot(counts, colours[:, :3], axes=(0, 0))
+    image[occupied, :3] /= total[occupied, None]
+    image[..., 3] = np.log1p(total) / np.log1p(total.max())
+    return image, (x_min, x_min + x_span, y_min, y_min + y_span)
 
 
 def plot_clusters_2d(
@@ -17,7 +126,12 @@ def plot_clusters_2d(
     labels: np.ndarray,
     centroids: Optional[np.ndarray] = None,
     title: Optional[str] = None,
-) -> Tuple[plt.Figure, plt.Axes]:
+    headless: bool = False,
+    mode: str = "auto",
+    max_points: int = SCATTER_MAX_POINTS,
+    bins: int = 512,
+    random_state: Optional[int] = None,
+) -> Tuple["Figure", "Axes"]:
     """
     Plot clustered data in 2D using the first two features.
 
@@ -25,8 +139,26 @@ def plot_clusters_2d(
     ----------
     X : ndarray of shape (n_samples, n_features)
     labels : ndarray of shape (n_samples,)
+        Integer cluster labels.
     centroids : ndarray of shape (k, n_features) or None
     title : str or None
+    headless : bool, default False
+        If True, draw on an off-screen Agg canvas without using pyplot.
+    mode : {"auto", "scatter", "sample", "density"}, default "auto"
+        "scatter" draws every point. "sample" draws a uniform reservoir
+        sample of ``max_points`` points, rasterised. "density" bins the
+        points per cluster into a ``bins`` x ``bins`` image, which costs
+        O(n) time and constant output size however many points there are;
+        beyond DENSITY_MAX_LAYERS clusters, the smallest are drawn together
+        in grey.
+        "auto" uses "scatter" up to ``max_points`` points, "sample" up to
+        DENSITY_MIN_POINTS and "density" above that.
+    max_points : int, default SCATTER_MAX_POINTS
+        Point budget of the scatter modes.
+    bins : int, default 512
+        Resolution of the density image along each axis.
+    random_state : int or None
+        Seed for the reservoir sample.
 
     Returns
     -------
@@ -34,9 +166,46 @@ def plot_clusters_2d(
     """
     if X.shape[1] < 2:
         raise ValueError("X must have at least 2 features for a 2D plot.")
+    if mode not in ("auto", "scatter", "sample", "density"):
+        raise ValueError("mode must be 'auto', 'scatter', 'sample' or 'density'.")
+    if max_points <= 0 or bins <= 0:
+        raise ValueError("max_points and bins must be positive integers.")
 
-    fig, ax = plt.subplots()
-    scatter = ax.scatter(X[:, 0], X[:, 1], c=labels, cmap="tab10", alpha=0.8)
+    from matplotlib import colormaps
+    from matplotlib.cm import ScalarMappable
+    from matplotlib.colors import Normalize
+
+    n = X.shape[0]
+    if mode == "auto":
+        if n <= max_points:
+            mode = "scatter"
+        elif n <= DENSITY_MIN_POINTS:
+            mode = "sample"
+        else:
+            mode = "density"
+
+    labels = np.asarray(labels)
+    label_min, label_max = int(labels.min()), int(labels.max())
+    cmap = colormaps["tab10"]
+    norm = Normalize(vmin=label_min, vmax=label_max)
+
+    fig, ax = _new_figure(headless)
+    if mode == "density":
+        layers, layer_offsets = _density_layers(labels - label_min, DENSITY_MAX_LAYERS)
+        colours = cmap(norm(label_min + layer_offsets))
+        colours[layer_offsets < 0] = _OTHER_COLOUR
+        image, extent = _density_image(X[:, 0], X[:, 1], layers, colours, bins)
+        ax.imshow(image, origin="lower", extent=extent, aspect="auto", interpolation="nearest")
+        mappable = ScalarMappable(norm=norm, cmap=cmap)
+    else:
+        if mode == "sample" and n > max_points:
+            idx = _reservoir_sample(n, max_points, np.random.RandomState(random_state))
+            x, y, c = X[idx, 0], X[idx, 1], labels[idx]
+        else:
+            x, y, c = X[:, 0], X[:, 1], labels
+        mappable = ax.scatter(
+            x, y, c=c, cmap=cmap, norm=norm, alpha=0.8, rasterized=(mode == "sample")
+        )
 
     if centroids is not None:
         ax.scatter(
@@ -55,7 +224,7 @@ def plot_clusters_2d(
     if title:
         ax.set_title(title)
 
-    fig.colorbar(scatter, ax=ax, label="Cluster label")
+    fig.colorbar(mappable, ax=ax, label="Cluster label")
     fig.tight_layout()
     return fig, ax
 
@@ -64,7 +233,8 @@ def plot_elbow(
     k_values: List[int],
     inertias: List[float],
     title: str = "Elbow Curve",
-) -> Tuple[plt.Figure, plt.Axes]:
+    headless: bool = False,
+) -> Tuple["Figure", "Axes"]:
     """
     Plot inertia vs k (elbow method).
 
@@ -73,6 +243,8 @@ def plot_elbow(
     k_values : list of int
     inertias : list of float
     title : str, default "Elbow Curve"
+    headless : bool, default False
+        If True, draw on an off-screen Agg canvas without using pyplot.
 
     Returns
     -------
@@ -81,7 +253,7 @@ def plot_elbow(
     if len(k_values) != len(inertias):
         raise ValueError("k_values and inertias must have the same length.")
 
-    fig, ax = plt.subplots()
+    fig, ax = _new_figure(headless)
     ax.plot(k_values, inertias, marker="o")
     ax.set_xlabel("Number of clusters (k)")
     ax.set_ylabel("Inertia")
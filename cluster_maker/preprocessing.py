@@ -6,12 +6,13 @@
 
 from __future__ import annotations
 
-from typing import List
+import os
+from typing import Any, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
-from sklearn.decomposition import PCA
+from sklearn.decomposition import PCA, IncrementalPCA
 
 
 def select_features(data: pd.DataFrame, feature_cols: List[str]) -> pd.DataFrame:
@@ -69,57 +70,316 @@ def standardise_features(X: np.ndarray) -> np.ndarray:
     scaler = StandardScaler()
     return scaler.fit_transform(X)
 
-from sklearn.decomposition import PCA
 
-def apply_pca(X: np.ndarray, n_components: int = 2) -> np.ndarray:
+def merge_moments(
+    n_a: int,
+    mean_a: Any,
+    m2_a: Any,
+    n_b: int,
+    mean_b: Any,
+    m2_b: Any,
+) -> Tuple[int, Any, Any]:
     """
-    Apply Principal Component Analysis (PCA) for dimensionality reduction.
+    Combine the count, mean and sum of squared deviations (M2) of two sets
+    of samples, using the pairwise form of Welford's update (Chan et al.).
+
+    Works on scalars or elementwise on arrays (e.g. one value per feature).
+    A single new value x is merged as ``(1, x, 0.0)``. The variance of the
+    union is ``m2 / n`` (population) or ``m2 / (n - 1)`` (sample).
 
     Parameters
     ----------
-    X : ndarray of shape (n_samples, n_features)
-        Standardised numeric feature matrix.
-
-    n_components : int
-        Number of principal components to keep.
+    n_a, mean_a, m2_a : int, float or ndarray
+        Statistics of the first set (n_a may be 0).
+    n_b, mean_b, m2_b : int, float or ndarray
+        Statistics of the second set.
 
     Returns
     -------
-    X_reduced : ndarray
-        Array of shape (n_samples, n_components) containing PCA-transformed data.
+    n, mean, m2
+        Statistics of the union.
     """
-    if n_components <= 0:
-        raise ValueError("n_components must be a positive integer.")
+    n = n_a + n_b
+    if n == 0:
+        return n, mean_a, m2_a
+    delta = mean_b - mean_a
+    mean = mean_a + delta * (n_b / n)
+    m2 = m2_a + m2_b + delta ** 2 * (n_a * n_b / n)
+    return n, mean, m2
 
-    if n_components > X.shape[1]:
-        raise ValueError("n_components cannot exceed original feature count.")
 
-    pca = PCA(n_components=n_components)
-    return pca.fit_transform(X)
+class FeatureScaler:
+    """
+    Reusable standardiser whose statistics can be accumulated over chunks.
+
+    The per-feature mean and variance are updated with Welford's online
+    algorithm (in the pairwise form of Chan et al.), so a scaler can be fitted
+    once on a large reference set, one chunk at a time, and then reused to
+    transform any number of new batches without refitting.
+
+    Attributes
+    ----------
+    mean_ : ndarray of shape (n_features,) or None
+    var_ : ndarray of shape (n_features,) or None
+        Population variance (ddof=0), as used by scikit-learn's StandardScaler.
+    n_samples_seen_ : int
+    """
+
+    def __init__(self) -> None:
+        self._reset()
+
+    def _reset(self) -> None:
+        """Forget any fitted statistics."""
+        self.mean_: Optional[np.ndarray] = None
+        self.var_: Optional[np.ndarray] = None
+        self.n_samples_seen_: int = 0
+        self._m2: Optional[np.ndarray] = None
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.n_samples_seen_ > 0
+
+    @property
+    def scale_(self) -> np.ndarray:
+        """Per-feature standard deviation, with zero-variance features set to 1."""
+        if not self.is_fitted:
+            raise ValueError("FeatureScaler has not been fitted yet.")
+        scale = np.sqrt(self.var_)
+        scale[scale == 0.0] = 1.0
+        return scale
+
+    def partial_fit(self, X: np.ndarray) -> "FeatureScaler":
+        """
+        Update the running mean and variance with a chunk of samples.
+
+        Parameters
+        ----------
+        X : ndarray of shape (n_chunk, n_features)
+
+        Returns
+        -------
+        self : FeatureScaler
+        """
+        if not isinstance(X, np.ndarray):
+            raise TypeError("X must be a NumPy array.")
+        if X.ndim != 2:
+            raise ValueError("X must be a 2D array.")
+        n_chunk = X.shape[0]
+        if n_chunk == 0:
+            return self
+
+        if not self.is_fitted:
+            self.mean_ = np.zeros(X.shape[1])
+            self._m2 = np.zeros(X.shape[1])
+        elif X.shape[1] != self.mean_.shape[0]:
+            raise ValueError("X has a different number of features than the fitted data.")
 
+        chunk_mean = X.mean(axis=0, dtype=float)
+        chunk_m2 = ((X - chunk_mean) ** 2).sum(axis=0)
+        self.n_samples_seen_, self.mean_, self._m2 = merge_moments(
+            self.n_samples_seen_, self.mean_, self._m2, n_chunk, chunk_mean, chunk_m2
+        )
+        self.var_ = self._m2 / self.n_samples_seen_
+        return self
 
-def apply_pca(X: np.ndarray, n_components: int = 2) -> np.ndarray:
+    def fit(self, X: np.ndarray, chunk_size: Optional[int] = None) -> "FeatureScaler":
+        """
+        Fit the scaler from scratch, optionally streaming over row chunks.
+
+        Parameters
+        ----------
+        X : ndarray of shape (n_samples, n_features)
+        chunk_size : int or None, default None
+            If given, statistics are accumulated over chunks of this many rows,
+            which bounds the temporary memory used for very large inputs.
+        """
+        self._reset()
+        if chunk_size is None:
+            return self.partial_fit(X)
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer.")
+        for start in range(0, X.shape[0], chunk_size):
+            self.partial_fit(X[start:start + chunk_size])
+        return self
+
+    def transform(self, X: np.ndarray, copy: bool = True) -> np.ndarray:
+        """
+        Standardise X with the fitted statistics.
+
+        Parameters
+        ----------
+        X : ndarray of shape (n_samples, n_features)
+        copy : bool, default True
+            If False and X is a writeable floating-point array, X is scaled in
+            place and returned, avoiding a second copy of the data.
+
+        Returns
+        -------
+        X_scaled : ndarray of shape (n_samples, n_features)
+        """
+        if not isinstance(X, np.ndarray):
+            raise TypeError("X must be a NumPy array.")
+        if not self.is_fitted:
+            raise ValueError("FeatureScaler has not been fitted yet.")
+        if X.shape[1] != self.mean_.shape[0]:
+            raise ValueError("X has a different number of features than the fitted data.")
+
+        if copy or X.dtype.kind != "f" or not X.flags.writeable:
+            X = np.array(X, dtype=float)
+        X -= self.mean_
+        X /= self.scale_
+        return X
+
+    def fit_transform(self, X: np.ndarray, copy: bool = True) -> np.ndarray:
+        """Fit the scaler on X and return the standardised data."""
+        return self.fit(X).transform(X, copy=copy)
+
+    def save(self, path: str) -> None:
+        """
+        Save the fitted parameters to a NumPy ``.npz`` file.
+        """
+        if not self.is_fitted:
+            raise ValueError("FeatureScaler has not been fitted yet.")
+        np.savez(
+            path,
+            mean=self.mean_,
+            m2=self._m2,
+            n_samples_seen=np.array(self.n_samples_seen_),
+        )
+
+    @classmethod
+    def from_params(cls, mean: np.ndarray, m2: np.ndarray, n_samples_seen: int) -> "FeatureScaler":
+        """
+        Rebuild a fitted scaler from its statistics.
+
+        Parameters
+        ----------
+        mean : ndarray of shape (n_features,)
+        m2 : ndarray of shape (n_features,)
+            Per-feature sum of squared deviations from the mean
+            (``var_ * n_samples_seen_``).
+        n_samples_seen : int
+            Must be positive.
+        """
+        n_samples_seen = int(n_samples_seen)
+        if n_samples_seen <= 0:
+            raise ValueError("n_samples_seen must be a positive integer.")
+        mean = np.asarray(mean, dtype=float)
+        m2 = np.asarray(m2, dtype=float)
+        if mean.ndim != 1 or m2.shape != mean.shape:
+            raise ValueError("mean and m2 must be 1D arrays of the same length.")
+        scaler = cls()
+        scaler.mean_ = mean
+        scaler._m2 = m2
+        scaler.n_samples_seen_ = n_samples_seen
+        scaler.var_ = m2 / n_samples_seen
+        return scaler
+
+    @classmethod
+    def load(cls, path: str) -> "FeatureScaler":
+        """
+        Load a scaler previously written with :meth:`save`.
+        """
+        with np.load(path) as params:
+            return cls.from_params(params["mean"], params["m2"], params["n_samples_seen"])
+
+
+def apply_pca(
+    X: Union[np.ndarray, str],
+    n_components: int = 2,
+    solver: str = "auto",
+    batch_size: Optional[int] = None,
+    random_state: Optional[int] = None,
+    return_model: bool = False,
+):
     """
     Apply Principal Component Analysis (PCA) for dimensionality reduction.
 
     Parameters
     ----------
-    X : ndarray of shape (n_samples, n_features)
-        Standardised numeric feature matrix.
+    X : ndarray of shape (n_samples, n_features) or str
+        Standardised numeric feature matrix, or the path to a ``.npy`` file
+        holding it. A path is memory-mapped, so with ``solver="incremental"``
+        the data is streamed from disk one batch at a time.
 
     n_components : int
         Number of principal components to keep.
 
+    solver : {"auto", "full", "randomized", "incremental"}, default "auto"
+        - "auto": let scikit-learn choose the SVD solver from the data shape.
+        - "full": exact LAPACK SVD.
+        - "randomized": randomised truncated SVD (Halko et al.), much cheaper
+          than a full SVD when n_components is small relative to both
+          n_samples and n_features.
+        - "incremental": IncrementalPCA fitted batch by batch, so memory
+          scales with batch_size rather than n_samples.
+
+    batch_size : int or None, default None
+        Rows per batch for the incremental solver. Defaults to
+        ``max(1000, 5 * n_features)``.
+
+    random_state : int or None, default None
+        Seed for the randomised solver.
+
+    return_model : bool, default False
+        If True, also return the fitted projector, whose ``transform`` method
+        projects new data without refitting.
+
     Returns
     -------
     X_reduced : ndarray
         Array of shape (n_samples, n_components) containing PCA-transformed data.
+    pca : PCA or IncrementalPCA
+        Only returned when ``return_model`` is True.
     """
+    if isinstance(X, (str, os.PathLike)):
+        X = np.load(X, mmap_mode="r")
+    if not isinstance(X, np.ndarray):
+        raise TypeError("X must be a NumPy array or a path to a .npy file.")
+
     if n_components <= 0:
         raise ValueError("n_components must be a positive integer.")
 
     if n_components > X.shape[1]:
         raise ValueError("n_components cannot exceed original feature count.")
 
-    pca = PCA(n_components=n_components)
-    return pca.fit_transform(X)
+    if solver in ("auto", "full", "randomized"):
+        pca = PCA(n_components=n_components, svd_solver=solver, random_state=random_state)
+        X_reduced = pca.fit_transform(X)
+    elif solver == "incremental":
+        pca, X_reduced = _incremental_pca(X, n_components, batch_size)
+    else:
+        raise ValueError(
+            f"Unknown PCA solver '{solver}'. "
+            "Use 'auto', 'full', 'randomized' or 'incremental'."
+        )
+
+    if return_model:
+        return X_reduced, pca
+    return X_reduced
+
+
+def _incremental_pca(X: np.ndarray, n_components: int, batch_size: Optional[int]):
+    """Fit IncrementalPCA over row batches of X, then project it batch by batch."""
+    n_samples, n_features = X.shape
+    if batch_size is None:
+        batch_size = max(1000, 5 * n_features)
+    # Every partial_fit batch needs at least n_components rows.
+    batch_size = max(batch_size, n_components)
+    if n_components > n_samples:
+        raise ValueError("n_components cannot exceed the number of samples.")
+
+    starts = list(range(0, n_samples, batch_size))
+    if len(starts) > 1 and n_samples - starts[-1] < n_components:
+        # Fold a short final batch into the previous one.
+        starts.pop()
+    bounds = list(zip(starts, starts[1:] + [n_samples]))
+
+    pca = IncrementalPCA(n_components=n_components)
+    for start, stop in bounds:
+        pca.partial_fit(X[start:stop])
+
+    X_reduced = np.empty((n_samples, n_components), dtype=float)
+    for start, stop in bounds:
+        X_reduced[start:stop] = pca.transform(X[start:stop])
+    return pca, X_reduced
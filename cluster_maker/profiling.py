@@ -0,0 +1,102 @@
+###
+## cluster_maker
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+from __future__ import annotations
+
+import contextlib
+import json
+import time
+import tracemalloc
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class StageProfiler:
+    """
+    Record wall time, CPU time and peak traced memory of pipeline stages.
+
+    Use one profiler per run and wrap each stage in ``with profiler.stage(name)``.
+    Stages are expected to run one after another (not nested): the memory
+    figure of a stage is the peak of Python-traced allocations (tracemalloc,
+    which also covers NumPy buffers) above the level at which the stage
+    started.
+
+    Parameters
+    ----------
+    trace_memory : bool, default True
+        If True, tracemalloc is started for the lifetime of the profiler
+        (unless already running). Tracing slows allocation-heavy code down,
+        so timings are more faithful with trace_memory=False.
+    """
+
+    enabled = True
+
+    def __init__(self, trace_memory: bool = True) -> None:
+        self.records: List[Dict[str, Any]] = []
+        self.trace_memory = trace_memory
+        self._started_tracing = False
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Context manager timing the enclosed block as stage ``name``."""
+        if self.trace_memory:
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            mem_start = tracemalloc.get_traced_memory()[0]
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            record: Dict[str, Any] = {
+                "stage": name,
+                "wall_s": time.perf_counter() - wall_start,
+                "cpu_s": time.process_time() - cpu_start,
+                "peak_mem_bytes": None,
+            }
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                record["peak_mem_bytes"] = max(peak - mem_start, 0)
+            self.records.append(record)
+
+    def close(self) -> None:
+        """Stop tracemalloc if this profiler started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def to_jsonl(self, path: str, extra: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Append one JSON object per stage to ``path``.
+
+        Parameters
+        ----------
+        path : str
+        extra : dict or None
+            Fields added to every line, e.g. the input path or a run id.
+        """
+        with open(path, "a", encoding="utf-8") as f:
+            for record in self.records:
+                f.write(json.dumps({**(extra or {}), **record}, default=str) + "\n")
+
+
+class _NullProfiler:
+    """Profiler stand-in whose stages cost a single attribute lookup."""
+
+    enabled = False
+    records: List[Dict[str, Any]] = []
+    _null_context = contextlib.nullcontext()
+
+    def stage(self, name: str) -> contextlib.nullcontext:
+        return self._null_context
+
+    def close(self) -> None:
+        pass
+
+
+NULL_PROFILER = _NullProfiler()
@@ -0,0 +1,127 @@
+###
+## cluster_maker
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterable, List, Optional
+
+from .plotting_clustered import plot_clusters_2d, plot_elbow
+
+_PLOTTERS = {
+    "clusters": plot_clusters_2d,
+    "elbow": plot_elbow,
+}
+_FORMATS = {".png": "png", ".svg": "svg"}
+
+
+def _check_spec(spec: Dict[str, Any]) -> None:
+    if spec.get("kind") not in _PLOTTERS:
+        raise ValueError(f"Unknown figure kind {spec.get('kind')!r}. Use 'clusters' or 'elbow'.")
+    path = spec.get("path")
+    if not path:
+        raise ValueError("Every figure spec needs an output 'path'.")
+    if os.path.splitext(path)[1].lower() not in _FORMATS:
+        raise ValueError(f"Unsupported output format for '{path}'. Use .png or .svg.")
+
+
+def render_figure(spec: Dict[str, Any], dpi: int = 100) -> str:
+    """
+    Build one figure from ``spec`` off-screen and write it to ``spec["path"]``.
+
+    Parameters
+    ----------
+    spec : dict
+        "kind" ("clusters" or "elbow"), "path" (a .png or .svg file) and the
+        arguments of ``plot_clusters_2d`` or ``plot_elbow``, e.g. ``X``,
+        ``labels``, ``centroids`` and ``title``.
+    dpi : int, default 100
+        Resolution of PNG output.
+
+    Returns
+    -------
+    path : str
+        The file written.
+    """
+    _check_spec(spec)
+    kwargs = {name: value for name, value in spec.items() if name not in ("kind", "path")}
+    path = spec["path"]
+
+    fig, _ = _PLOTTERS[spec["kind"]](**kwargs, headless=True)
+    try:
+        fig.savefig(path, dpi=dpi, format=_FORMATS[os.path.splitext(path)[1].lower()])
+    finally:
+        # Headless figures are not known to pyplot; clearing breaks the
+        # figure/axes reference cycles so the memory is released now rather
+        # than at the next garbage collection.
+        fig.clear()
+    return path
+
+
+def render_figures(
+    specs: Iterable[Dict[str, Any]],
+    max_workers: Optional[int] = None,
+    dpi: int = 100,
+) -> List[str]:
+    """
+    Render many figure specs to PNG/SVG files in a pool of worker processes.
+
+    Figures are drawn on Agg canvases without pyplot (see ``render_figure``),
+    so neither the calling process nor the workers accumulate open figures.
+    ``specs`` is consumed lazily and at most twice ``max_workers`` specs are
+    in flight at any time, so a generator yielding thousands of specs is
+    rendered in bounded memory.
+
+    Parameters
+    ----------
+    specs : iterable of dict
+        Figure specs as accepted by ``render_figure``.
+    max_workers : int or None, default None
+        Number of worker processes. Defaults to the number of CPUs; with 1
+        the figures are rendered in the calling process.
+    dpi : int, default 100
+
+    Returns
+    -------
+    paths : list of str
+        The files written, in the order of ``specs``.
+
+    Raises
+    ------
+    ValueError
+        If a spec has an unknown kind or output format. Errors raised while
+        rendering are re-raised after the figures in flight have finished.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers <= 0:
+        raise ValueError("max_workers must be a positive integer.")
+
+    if max_workers == 1:
+        return [render_figure(spec, dpi) for spec in specs]
+
+    paths: Dict[int, str] = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = {}
+        spec_iter = enumerate(specs)
+        exhausted = False
+        while not exhausted or in_flight:
+            while not exhausted and len(in_flight) < 2 * max_workers:
+                try:
+                    index, spec = next(spec_iter)
+                except StopIteration:
+                    exhausted = True
+                    break
+                _check_spec(spec)
+                in_flight[executor.submit(render_figure, spec, dpi)] = index
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                paths[in_flight.pop(future)] = future.result()
+
+    return [paths[i] for i in sorted(paths)]
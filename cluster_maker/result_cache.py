@@ -0,0 +1,190 @@
+###
+## cluster_maker
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+_ENTRY_SUFFIX = ".npz"
+
+
+class ResultCache:
+    """
+    On-disk, size-bounded LRU cache for clustering results.
+
+    Each entry is an uncompressed ``.npz`` file holding NumPy arrays plus a
+    small JSON metadata record, stored under a key derived from the input
+    file and the normalised parameters of the run (see ``make_key``).
+
+    The cache is safe to share between processes: entries are written to a
+    temporary file and atomically renamed into place, readers treat a
+    missing or partially deleted entry as a miss, and eviction is serialised
+    with an advisory file lock where the platform provides one.
+
+    Parameters
+    ----------
+    directory : str
+        Cache directory (created if needed).
+    max_bytes : int, default 512 MiB
+        Upper bound on the total size of the entries. The least recently
+        used entries are evicted after each write until the cache fits.
+    fingerprint : {"mtime", "content"}, default "mtime"
+        How the input file is identified. "mtime" uses its absolute path,
+        size and modification time, and costs a single ``stat``; "content"
+        hashes the file bytes, so copies of the same file share entries and
+        touching a file without changing it keeps its entries valid.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = 512 * 1024 * 1024,
+        fingerprint: str = "mtime",
+    ) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive.")
+        if fingerprint not in ("mtime", "content"):
+            raise ValueError("fingerprint must be 'mtime' or 'content'.")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.fingerprint = fingerprint
+        os.makedirs(directory, exist_ok=True)
+
+    def _file_fingerprint(self, input_path: str) -> Any:
+        if self.fingerprint == "mtime":
+            stat = os.stat(input_path)
+            return [os.path.abspath(input_path), stat.st_size, stat.st_mtime_ns]
+
+        digest = hashlib.sha256()
+        with open(input_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def make_key(self, input_path: str, params: Dict[str, Any]) -> str:
+        """
+        Build the cache key for a run on ``input_path`` with ``params``.
+
+        Parameters
+        ----------
+        input_path : str
+        params : dict
+            JSON-serialisable parameters that determine the result. Keys are
+            sorted, so the order in which they are given does not matter.
+
+        Returns
+        -------
+        key : str
+            Hexadecimal SHA-256 digest.
+        """
+        payload = json.dumps(
+            {"input": self._file_fingerprint(input_path), "params": params},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _ENTRY_SUFFIX)
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, np.ndarray], Dict[str, Any]]]:
+        """
+        Return ``(arrays, meta)`` stored under ``key``, or None on a miss.
+        """
+        path = self._entry_path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(str(data["__meta__"]))
+                arrays = {name: data[name] for name in data.files if name != "__meta__"}
+            os.utime(path)  # mark as recently used
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            return None
+        return arrays, meta
+
+    def put(
+        self,
+        key: str,
+        arrays: Dict[str, np.ndarray],
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Store ``arrays`` and JSON-serialisable ``meta`` under ``key``.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, __meta__=np.array(json.dumps(meta or {})), **arrays)
+            os.replace(tmp_path, self._entry_path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self._evict()
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        with self._lock():
+            for name in os.listdir(self.directory):
+                if name.endswith(_ENTRY_SUFFIX):
+                    _remove_quietly(os.path.join(self.directory, name))
+
+    def size_bytes(self) -> int:
+        """Total size of the stored entries."""
+        return sum(size for _, _, size in self._entries())
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(_ENTRY_SUFFIX):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, name, stat.st_size))
+        return entries
+
+    def _evict(self) -> None:
+        with self._lock():
+            entries = sorted(self._entries())
+            total = sum(size for _, _, size in entries)
+            for _, name, size in entries:
+                if total <= self.max_bytes:
+                    break
+                _remove_quietly(os.path.join(self.directory, name))
+                total -= size
+
+    @contextmanager
+    def _lock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.directory, ".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,181 @@
+###
+## cluster_maker
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+from __future__ import annotations
+
+import itertools
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .data_loader import load_feature_matrix
+from .interface import compute_metrics, fit_clusters
+from .preprocessing import FeatureScaler, apply_pca
+
+SWEEP_COLUMNS = [
+    "standardise",
+    "pca_components",
+    "algorithm",
+    "k",
+    "inertia",
+    "silhouette",
+    "fit_s",
+]
+
+# Feature matrices already memory-mapped by this (worker) process.
+_WORKER_MATRICES: Dict[str, np.ndarray] = {}
+
+
+def _fit_task(
+    matrix_path: str,
+    algorithm: str,
+    k: int,
+    random_state: Optional[int],
+) -> Dict[str, Any]:
+    """Fit one configuration on a preprocessed matrix stored as .npy."""
+    X = _WORKER_MATRICES.get(matrix_path)
+    if X is None:
+        X = np.load(matrix_path, mmap_mode="r")
+        _WORKER_MATRICES[matrix_path] = X
+
+    start = time.perf_counter()
+    labels, centroids = fit_clusters(X, algorithm, k, random_state)
+    fit_s = time.perf_counter() - start
+    metrics = compute_metrics(X, labels, centroids)
+    return {**metrics, "fit_s": fit_s}
+
+
+def run_sweep(
+    input_path: str,
+    feature_cols: List[str],
+    k_values: Sequence[int],
+    algorithms: Sequence[str] = ("kmeans",),
+    standardise_options: Sequence[bool] = (True,),
+    pca_components_options: Sequence[Optional[int]] = (None,),
+    random_state: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    pca_solver: str = "auto",
+    dtype: Any = np.float64,
+    cache_matrix: bool = False,
+) -> pd.DataFrame:
+    """
+    Evaluate every combination of preprocessing and clustering parameters.
+
+    The sweep is a small DAG of stages:
+
+        load -> standardise (per option) -> PCA (per option) -> fit (per algorithm, k)
+
+    Each distinct preprocessing node is computed exactly once and shared by
+    all fits below it, so the CSV is parsed once, standardisation runs once
+    per standardise option and PCA once per (standardise, n_components)
+    pair. Each preprocessed matrix is saved to a ``.npy`` file as soon as it
+    is computed and dropped from memory. Only the clustering fits, the
+    leaves of the DAG, are repeated per combination, and they are fanned out
+    over a process pool; the matrices reach the workers memory-mapped, so
+    they are shared through the page cache rather than copied into every
+    task.
+
+    Parameters
+    ----------
+    input_path : str
+        Path to the input CSV file.
+    feature_cols : list of str
+    k_values : sequence of int
+    algorithms : sequence of str, default ("kmeans",)
+        Any algorithm accepted by ``run_clustering``.
+    standardise_options : sequence of bool, default (True,)
+    pca_components_options : sequence of int or None, default (None,)
+        Number of PCA components per option; None means no PCA.
+    random_state : int or None, default None
+    max_workers : int or None, default None
+        Worker processes for the fits. Defaults to the number of CPUs; with
+        1 the fits run in the calling process.
+    pca_solver : str, default "auto"
+        SVD solver passed to ``apply_pca``.
+    dtype : numpy dtype, default float64
+    cache_matrix : bool, default False
+        Passed to ``load_feature_matrix``.
+
+    Returns
+    -------
+    results : pandas.DataFrame
+        One row per combination with columns SWEEP_COLUMNS, where "fit_s"
+        is the wall time of the clustering fit alone.
+    """
+    if not k_values:
+        raise ValueError("k_values must contain at least one value.")
+    for algorithm in algorithms:
+        if algorithm not in ("kmeans", "sklearn_kmeans", "bisecting_kmeans"):
+            raise ValueError(
+                f"Unknown algorithm '{algorithm}'. "
+                "Use 'kmeans', 'sklearn_kmeans' or 'bisecting_kmeans'."
+            )
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers <= 0:
+        raise ValueError("max_workers must be a positive integer.")
+
+    standardise_options = list(dict.fromkeys(standardise_options))
+    pca_components_options = list(dict.fromkeys(pca_components_options))
+
+    tmp_dir = tempfile.mkdtemp(prefix="cluster_maker_sweep_")
+    try:
+        # Stage 1: load once
+        X_raw = load_feature_matrix(input_path, feature_cols, dtype=dtype, cache=cache_matrix)
+
+        # Stages 2-3: each distinct preprocessing node once, written to disk
+        # as soon as it is computed so at most one node is held in memory
+        # (besides the raw and standardised matrices it derives from).
+        matrix_paths: Dict[Tuple[bool, Optional[int]], str] = {}
+        for standardise in standardise_options:
+            X_std = FeatureScaler().fit_transform(X_raw) if standardise else X_raw
+            for n_components in pca_components_options:
+                if n_components is None:
+                    X_node = X_std
+                else:
+                    X_node = apply_pca(
+                        X_std, n_components=n_components, solver=pca_solver, random_state=random_state
+                    )
+                path = os.path.join(tmp_dir, f"node_{len(matrix_paths)}.npy")
+                np.save(path, np.ascontiguousarray(X_node))
+                matrix_paths[(standardise, n_components)] = path
+                del X_node
+            del X_std
+        del X_raw
+
+        # Stage 4: fan the fits out over the pool
+        configs = list(itertools.product(matrix_paths, algorithms, k_values))
+        tasks = [
+            (matrix_paths[node], algorithm, k, random_state)
+            for node, algorithm, k in configs
+        ]
+        if max_workers == 1:
+            outputs = [_fit_task(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                outputs = list(executor.map(_fit_task, *zip(*tasks)))
+    finally:
+        _WORKER_MATRICES.clear()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    rows = [
+        {
+            "standardise": node[0],
+            "pca_components": node[1],
+            "algorithm": algorithm,
+            "k": k,
+            **output,
+        }
+        for (node, algorithm, k), output in zip(configs, outputs)
+    ]
+    return pd.DataFrame(rows).reindex(columns=SWEEP_COLUMNS)
+
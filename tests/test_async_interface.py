@@ -0,0 +1,112 @@
+###
+## cluster_maker - test file for async_interface.py
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+import unittest
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from cluster_maker.async_interface import AsyncClusteringService, run_clustering_async
+from cluster_maker.interface import clustering_pipeline, run_clustering
+
+
+class TestAsyncInterface(unittest.TestCase):
+    """
+    Tests for the asyncio front end to the clustering workflow.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp.name, "data.csv")
+        rng = np.random.RandomState(4)
+        pd.DataFrame(rng.normal(size=(50, 2)), columns=["x", "y"]).to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_matches_synchronous_result(self):
+        """The async pipeline gives the same labels and metrics as run_clustering."""
+        result = asyncio.run(
+            run_clustering_async(self.csv_path, ["x", "y"], k=3, random_state=0, compute_elbow=True)
+        )
+        expected = run_clustering(self.csv_path, ["x", "y"], k=3, random_state=0,
+                                  compute_elbow=True, plots=False)
+
+        np.testing.assert_array_equal(result["labels"], expected["labels"])
+        self.assertEqual(result["metrics"], expected["metrics"])
+        self.assertEqual(result["elbow_inertias"], expected["elbow_inertias"])
+        self.assertListEqual(list(result["data"]["cluster"]), list(expected["labels"]))
+
+    def test_sync_and_async_share_the_stage_sequence(self):
+        """Both workflows run the steps of clustering_pipeline, in its order."""
+        options = dict(k=3, random_state=0, compute_elbow=True, deduplicate=True,
+                       coreset_size=20, plots=False)
+        pipeline = clustering_pipeline(self.csv_path, ["x", "y"], **options)
+        steps, value = [], None
+        try:
+            while True:
+                name, func, args = pipeline.send(value)
+                steps.append((name, func))
+                value = func(*args)
+        except StopIteration:
+            pass
+
+        class RecordingExecutor(ThreadPoolExecutor):
+            def __init__(self):
+                super().__init__(max_workers=1)
+                self.funcs = []
+
+            def submit(self, fn, *args, **kwargs):
+                self.funcs.append(fn.func)
+                return super().submit(fn, *args, **kwargs)
+
+        with RecordingExecutor() as executor:
+            asyncio.run(run_clustering_async(self.csv_path, ["x", "y"], executor=executor, **options))
+        self.assertListEqual(executor.funcs, [func for _, func in steps])
+
+        result = run_clustering(self.csv_path, ["x", "y"], profile=True, **options)
+        self.assertListEqual([r["stage"] for r in result["profile"]], [name for name, _ in steps])
+
+    def test_errors_propagate(self):
+        """Errors from a stage surface as the same exception types."""
+        with self.assertRaises(FileNotFoundError):
+            asyncio.run(run_clustering_async("missing.csv", ["x", "y"]))
+        with self.assertRaises(KeyError):
+            asyncio.run(run_clustering_async(self.csv_path, ["x", "z"]))
+
+    def test_service_limits_concurrency(self):
+        """No more than max_concurrency jobs run at the same time."""
+        service = AsyncClusteringService(max_concurrency=2)
+        peak = 0
+
+        async def monitor(tasks):
+            nonlocal peak
+            while not all(task.done() for task in tasks):
+                peak = max(peak, service.active)
+                await asyncio.sleep(0)
+
+        async def main():
+            tasks = [
+                asyncio.ensure_future(
+                    service.run_clustering(self.csv_path, ["x", "y"], k=2, random_state=i)
+                )
+                for i in range(6)
+            ]
+            await monitor(tasks)
+            return await asyncio.gather(*tasks)
+
+        results = asyncio.run(main())
+        self.assertEqual(len(results), 6)
+        self.assertLessEqual(peak, 2)
+        self.assertGreaterEqual(peak, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
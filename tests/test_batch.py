@@ -0,0 +1,110 @@
+###
+## cluster_maker - test file for batch.py
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+import unittest
+import json
+import multiprocessing
+import os
+import tempfile
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from cluster_maker.batch import load_manifest, run_batch
+from cluster_maker import interface
+
+_real_run_clustering = interface.run_clustering
+
+
+def _crashing_run_clustering(**params):
+    """Kill the worker process for one marked input, run normally otherwise."""
+    if params["input_path"] == "crash.csv":
+        os._exit(1)
+    return _real_run_clustering(**params)
+
+
+class TestBatchRunner(unittest.TestCase):
+    """
+    Tests for the parallel batch runner and manifest loading.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.paths = []
+        for i in range(2):
+            path = os.path.join(self.tmp.name, f"tenant_{i}.csv")
+            pd.DataFrame({"x": np.random.rand(30), "y": np.random.rand(30)}).to_csv(path, index=False)
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_failures_are_isolated(self):
+        """A bad input is reported as an error without stopping the other jobs."""
+        jobs = [
+            {"input_path": self.paths[0], "feature_cols": ["x", "y"], "k": 2},
+            {"input_path": "does/not/exist.csv", "feature_cols": ["x", "y"]},
+            {"input_path": self.paths[1], "feature_cols": ["x", "y"], "job_id": "last"},
+        ]
+        metrics = run_batch(jobs, max_workers=2, timeout=60, defaults={"random_state": 0})
+
+        self.assertListEqual(list(metrics["status"]), ["ok", "error", "ok"])
+        self.assertListEqual(list(metrics["job_id"]), [0, 1, "last"])
+        self.assertIn("FileNotFoundError", metrics.loc[1, "error"])
+        self.assertEqual(metrics.loc[0, "n_samples"], 30)
+        self.assertGreater(metrics.loc[2, "inertia"], 0.0)
+
+    @unittest.skipUnless(
+        multiprocessing.get_start_method() == "fork", "workers must inherit the patched function"
+    )
+    def test_dead_worker_only_fails_its_own_job(self):
+        """Jobs sharing the broken pool with a crashing job are retried and succeed."""
+        jobs = [{"input_path": self.paths[i % 2], "feature_cols": ["x", "y"], "k": 2} for i in range(5)]
+        jobs.insert(2, {"input_path": "crash.csv", "feature_cols": ["x", "y"]})
+        with mock.patch.object(interface, "run_clustering", _crashing_run_clustering):
+            metrics = run_batch(jobs, max_workers=2, defaults={"random_state": 0})
+
+        self.assertListEqual(list(metrics["status"]), ["ok", "ok", "error", "ok", "ok", "ok"])
+        self.assertEqual(metrics.loc[2, "error"], "Worker process terminated abruptly.")
+        self.assertTrue((metrics.drop(index=2)["n_samples"] == 30).all())
+
+    def test_load_manifest_formats(self):
+        """JSON-lines and CSV manifests describe the same jobs."""
+        jsonl_path = os.path.join(self.tmp.name, "jobs.jsonl")
+        with open(jsonl_path, "w") as f:
+            f.write(json.dumps({"input_path": self.paths[0], "feature_cols": ["x", "y"], "k": 4}) + "\n")
+
+        csv_path = os.path.join(self.tmp.name, "jobs.csv")
+        pd.DataFrame({
+            "input_path": [self.paths[0]],
+            "feature_cols": ["x;y"],
+            "k": [4],
+        }).to_csv(csv_path, index=False)
+
+        self.assertEqual(load_manifest(jsonl_path), load_manifest(csv_path))
+
+        # Only known numeric/boolean parameters are converted.
+        pd.DataFrame({
+            "job_id": ["007"],
+            "input_path": ["nan"],
+            "feature_cols": ["x;y"],
+            "k": ["5"],
+            "use_pca": ["True"],
+            "output_path": ["inf"],
+        }).to_csv(csv_path, index=False)
+        job = load_manifest(csv_path)[0]
+        self.assertEqual(job, {
+            "job_id": "007", "input_path": "nan", "feature_cols": ["x", "y"],
+            "k": 5, "use_pca": True, "output_path": "inf",
+        })
+
+        with self.assertRaises(FileNotFoundError):
+            load_manifest(os.path.join(self.tmp.name, "missing.jsonl"))
+
+
+if __name__ == "__main__":
+    unittest.main()
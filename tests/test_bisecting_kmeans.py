@@ -0,0 +1,83 @@
+###
+## cluster_maker - test file for bisecting_kmeans in algorithms.py
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+import unittest
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from cluster_maker.algorithms import bisecting_kmeans, cut_tree
+from cluster_maker.interface import run_clustering
+
+
+class TestBisectingKMeans(unittest.TestCase):
+    """
+    Tests for bisecting K-means and its split tree.
+    """
+
+    def setUp(self):
+        rng = np.random.RandomState(2)
+        centres = np.array([[0, 0], [0, 20], [20, 0], [20, 20]], dtype=float)
+        # Two tight pairs of blobs per centre: 8 clusters, 4 well-separated groups.
+        offsets = np.array([[-1.5, 0], [1.5, 0]])
+        self.X = np.vstack([
+            c + o + 0.2 * rng.normal(size=(50, 2)) for c in centres for o in offsets
+        ])
+        self.truth = np.repeat(np.arange(8), 50)
+
+    def _assert_same_partition(self, labels, truth):
+        # Every true cluster maps to exactly one label and vice versa.
+        pairs = set(zip(labels.tolist(), truth.tolist()))
+        self.assertEqual(len(pairs), len(set(truth.tolist())))
+        self.assertEqual(len(set(labels.tolist())), len(set(truth.tolist())))
+
+    def test_recovers_clusters_and_tree(self):
+        """Finds the 8 blobs; cutting the tree at 4 gives the 4 groups."""
+        labels, centroids, tree = bisecting_kmeans(self.X, 8, random_state=0, return_tree=True)
+        self.assertEqual(centroids.shape, (8, 2))
+        self._assert_same_partition(labels, self.truth)
+
+        n_nodes = tree["parent"].size
+        self.assertEqual(n_nodes, 15)
+        self.assertEqual(tree["sizes"][0], len(self.X))
+        np.testing.assert_array_equal(tree["sizes"][tree["leaf_nodes"]], np.bincount(labels))
+
+        coarse_labels, coarse_centroids = cut_tree(tree, labels, 4)
+        self.assertEqual(coarse_centroids.shape, (4, 2))
+        self._assert_same_partition(coarse_labels, self.truth // 2)
+        for j in range(4):
+            np.testing.assert_allclose(coarse_centroids[j], self.X[coarse_labels == j].mean(axis=0))
+
+        with self.assertRaises(ValueError):
+            cut_tree(tree, labels, 9)
+
+    def test_parallel_and_sparse_give_same_result(self):
+        """Results do not depend on the number of threads or on sparse input."""
+        serial = bisecting_kmeans(self.X, 8, random_state=3, max_workers=1)
+        parallel = bisecting_kmeans(self.X, 8, random_state=3, max_workers=4)
+        sparse = bisecting_kmeans(sp.csr_matrix(self.X), 8, random_state=3, max_workers=4)
+        for other in (parallel, sparse):
+            np.testing.assert_array_equal(other[0], serial[0])
+            np.testing.assert_allclose(other[1], serial[1])
+
+    def test_run_clustering_and_invalid_input(self):
+        """Selectable in run_clustering; too few distinct points raise ValueError."""
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, "data.csv")
+            pd.DataFrame(self.X, columns=["x", "y"]).to_csv(csv_path, index=False)
+            result = run_clustering(csv_path, ["x", "y"], algorithm="bisecting_kmeans", k=8,
+                                    random_state=0, plots=False)
+        self.assertEqual(result["centroids"].shape, (8, 2))
+
+        with self.assertRaises(ValueError):
+            bisecting_kmeans(np.zeros((10, 2)), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+###
+## cluster_maker - test file for centroid_index.py
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+import unittest
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from cluster_maker.algorithms import kmeans, nearest_centroid
+from cluster_maker.centroid_index import CentroidIndex
+from cluster_maker.interface import run_clustering
+from cluster_maker.model import ClusterModel
+
+
+class TestCentroidIndex(unittest.TestCase):
+    """
+    Tests for exact and approximate nearest-centroid search.
+    """
+
+    def _clustered(self, k, d, n, seed=0):
+        rng = np.random.RandomState(seed)
+        centroids = rng.normal(size=(k, d))
+        X = centroids[rng.randint(0, k, size=n)] + 0.3 * rng.normal(size=(n, d))
+        return X, centroids
+
+    def test_exact_mode_matches_brute_force(self):
+        """Exact mode (kd-tree in low and brute force in high dimension) is exact."""
+        for d in (3, 24):
+            X, centroids = self._clustered(300, d, 2000)
+            index = CentroidIndex(centroids)
+            labels, sq_dist = index.query(X, return_distances=True)
+            ref_labels, ref_sq_dist = nearest_centroid(X, centroids, return_distances=True)
+            np.testing.assert_array_equal(labels, ref_labels)
+            np.testing.assert_allclose(sq_dist, ref_sq_dist, atol=1e-9)
+        np.testing.assert_array_equal(index.query(sp.csr_matrix(X)), ref_labels)
+
+    def test_approximate_recall_grows_with_n_probe(self):
+        """More probed groups find the true nearest centroid more often; all groups is exact."""
+        X, centroids = self._clustered(400, 32, 3000)
+        exact = nearest_centroid(X, centroids)
+        recalls = []
+        for n_probe in (1, 4):
+            index = CentroidIndex(centroids, mode="approximate", n_probe=n_probe, random_state=0)
+            recalls.append(np.mean(index.query(X, block_size=500) == exact))
+        self.assertLessEqual(recalls[0], recalls[1])
+        self.assertGreater(recalls[1], 0.9)
+
+        index = CentroidIndex(centroids, mode="approximate", n_probe=10_000, random_state=0)
+        labels, sq_dist = index.query(X, return_distances=True)
+        np.testing.assert_array_equal(labels, exact)
+        np.testing.assert_allclose(sq_dist, ((X - centroids[labels]) ** 2).sum(axis=1), atol=1e-8)
+
+    def test_kmeans_and_model_use_index(self):
+        """kmeans(index="exact") and ClusterModel.predict(index=...) match the default paths."""
+        X, _ = self._clustered(20, 3, 1000)
+        labels, centroids = kmeans(X, 20, random_state=0)
+        labels_idx, centroids_idx = kmeans(X, 20, random_state=0, index="exact")
+        np.testing.assert_array_equal(labels_idx, labels)
+        np.testing.assert_allclose(centroids_idx, centroids)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, "data.csv")
+            pd.DataFrame(X, columns=["a", "b", "c"]).to_csv(csv_path, index=False)
+            result = run_clustering(csv_path, ["a", "b", "c"], k=20, random_state=0)
+        model = ClusterModel.from_result(result)
+        index = model.build_index()
+        np.testing.assert_array_equal(model.predict(X, index=index, block_size=128), model.predict(X))
+
+        with self.assertRaises(ValueError):
+            model.predict(X, index=CentroidIndex(centroids[:5]))
+
+    def test_invalid_arguments(self):
+        """Unknown modes and non-positive n_probe raise ValueError."""
+        centroids = np.random.rand(5, 2)
+        with self.assertRaises(ValueError):
+            CentroidIndex(centroids, mode="hnsw")
+        with self.assertRaises(ValueError):
+            CentroidIndex(centroids, mode="approximate", n_probe=0)
+        with self.assertRaises(ValueError):
+            CentroidIndex(centroids).query(np.random.rand(4, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
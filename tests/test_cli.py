@@ -0,0 +1,99 @@
+###
+## cluster_maker - test file for cli.py
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+import unittest
+import contextlib
+import io
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from cluster_maker.cli import main
+
+
+class TestCommandLine(unittest.TestCase):
+    """
+    Tests for the cluster-maker console entry point.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp.name, "data.csv")
+        rng = np.random.RandomState(5)
+        df = pd.DataFrame(rng.normal(size=(60, 2)), columns=["x", "y"])
+        df["name"] = "row"
+        df.loc[3, "x"] = np.nan
+        df.dropna().to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def _main(self, argv):
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()) as err:
+            code = main(argv)
+        return code, err.getvalue()
+
+    def test_fit_then_predict(self):
+        """Labels streamed by predict match the labels written by fit."""
+        code, _ = self._main([
+            "fit", self.csv_path, "--features", "x", "y", "-k", "3", "--random-state", "0",
+            "--model", self._path("model.npz"), "--labels", self._path("fit_labels.csv"),
+            "--chunk-size", "7", "--dtype", "float32", "--threads", "1",
+        ])
+        self.assertEqual(code, 0)
+
+        code, _ = self._main([
+            "predict", self._path("model.npz"), self.csv_path,
+            "--output", self._path("pred.csv"), "--chunk-size", "11", "--dtype", "float32",
+        ])
+        self.assertEqual(code, 0)
+
+        fitted = pd.read_csv(self._path("fit_labels.csv"))["cluster"]
+        predicted = pd.read_csv(self._path("pred.csv"))["cluster"]
+        self.assertEqual(len(predicted), len(fitted))
+        self.assertTrue((fitted == predicted).all())
+
+    def test_summarise_streams_chunks(self):
+        """Chunked summarise writes both summary files."""
+        code, _ = self._main([
+            "summarise", self.csv_path, "--chunk-size", "10",
+            "--output-csv", self._path("s.csv"), "--output-txt", self._path("s.txt"),
+        ])
+        self.assertEqual(code, 0)
+        summary = pd.read_csv(self._path("s.csv"))
+        self.assertListEqual(list(summary["note"]), ["numeric", "numeric", "non-numeric (ignored)"])
+
+    def test_option_validation_and_profile_path(self):
+        """--pca must be positive, and --profile-path alone turns profiling on."""
+        for bad in ("0", "-1"):
+            with self.assertRaises(SystemExit) as ctx:
+                self._main(["fit", self.csv_path, "--features", "x", "y", "--pca", bad])
+            self.assertEqual(ctx.exception.code, 2)
+
+        profile_path = self._path("profile.jsonl")
+        code, _ = self._main([
+            "fit", self.csv_path, "--features", "x", "y", "--pca", "1",
+            "--profile-path", profile_path,
+        ])
+        self.assertEqual(code, 0)
+        with open(profile_path, encoding="utf-8") as f:
+            self.assertGreater(len(f.readlines()), 0)
+
+    def test_errors_exit_cleanly(self):
+        """A missing input file gives exit code 1 and an error message, no traceback."""
+        code, err = self._main(["fit", self._path("missing.csv"), "--features", "x", "y"])
+        self.assertEqual(code, 1)
+        self.assertIn("ERROR", err)
+        self.assertNotIn("Traceback", err)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+###
+## cluster_maker - test file for model.py
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+import unittest
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from cluster_maker.algorithms import assign_clusters, nearest_centroid
+from cluster_maker.interface import run_clustering
+from cluster_maker.model import ClusterModel
+
+
+class TestClusterModel(unittest.TestCase):
+    """
+    Tests for ClusterModel and the blocked nearest-centroid search.
+    """
+
+    def setUp(self):
+        rng = np.random.RandomState(3)
+        self.df = pd.DataFrame(
+            rng.normal(size=(90, 3)) + np.repeat([[0, 0, 0], [6, 6, 0], [0, 6, 6]], 30, axis=0),
+            columns=["a", "b", "c"],
+        )
+
+    def _run(self, **kwargs):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, "data.csv")
+            self.df.to_csv(csv_path, index=False)
+            return run_clustering(
+                input_path=csv_path,
+                feature_cols=["a", "b", "c"],
+                k=3,
+                random_state=0,
+                **kwargs,
+            )
+
+    def test_nearest_centroid_matches_assign_clusters(self):
+        """Blocked search should give the same labels as the broadcast version."""
+        X = np.random.rand(500, 4)
+        centroids = np.random.rand(7, 4)
+        labels = nearest_centroid(X, centroids, block_size=64)
+        np.testing.assert_array_equal(labels, assign_clusters(X, centroids))
+
+    def test_predict_reproduces_training_labels(self):
+        """Predicting on the training rows must reproduce the fitted labels."""
+        for kwargs in ({}, {"standardise": False}, {"use_pca": True, "pca_components": 2}):
+            result = self._run(**kwargs)
+            model = ClusterModel.from_result(result, feature_cols=["a", "b", "c"])
+            np.testing.assert_array_equal(model.predict(self.df), result["labels"])
+            np.testing.assert_array_equal(
+                model.predict(self.df.to_numpy(), block_size=7), result["labels"]
+            )
+
+    def test_single_row_predict(self):
+        """A single 1D row should be labelled like the same row in a batch."""
+        result = self._run(use_pca=True, pca_components=2)
+        model = ClusterModel.from_result(result)
+        row = self.df.to_numpy()[40]
+        self.assertEqual(model.predict(row).shape, (1,))
+        self.assertEqual(model.predict(row)[0], result["labels"][40])
+
+    def test_save_and_load_roundtrip(self):
+        """A saved model should reload and predict identically."""
+        result = self._run(use_pca=True, pca_components=2)
+        model = ClusterModel.from_result(result, feature_cols=["a", "b", "c"])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "model.npz")
+            model.save(path)
+            loaded = ClusterModel.load(path)
+
+        self.assertEqual(loaded.feature_cols, ["a", "b", "c"])
+        np.testing.assert_array_equal(loaded.predict(self.df), model.predict(self.df))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+###
+## cluster_maker - test file for coreset.py
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+import unittest
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from cluster_maker.algorithms import kmeans, update_centroids
+from cluster_maker.coreset import lightweight_coreset, streaming_coreset
+from cluster_maker.evaluation import compute_inertia, elbow_curve
+from cluster_maker.interface import run_clustering
+
+
+def _blobs(n, seed=0):
+    rng = np.random.RandomState(seed)
+    centres = np.array([[0.0, 0.0, 0.0], [6.0, 0.0, 2.0], [0.0, 6.0, -2.0], [6.0, 6.0, 4.0]])
+    labels = rng.randint(0, len(centres), size=n)
+    return centres[labels] + rng.normal(size=(n, 3)), centres
+
+
+class TestSampleWeight(unittest.TestCase):
+    """
+    Integer weights must act like repeated rows.
+    """
+
+    def setUp(self):
+        rng = np.random.RandomState(1)
+        self.X = rng.normal(size=(40, 3))
+        self.weights = rng.randint(1, 4, size=40).astype(float)
+        self.repeated = np.repeat(self.X, self.weights.astype(int), axis=0)
+        self.labels = rng.randint(0, 3, size=40)
+        self.centroids = rng.normal(size=(3, 3))
+
+    def test_update_centroids_and_inertia(self):
+        """Weighted means and inertia equal those of the repeated rows (dense and CSR)."""
+        repeated_labels = np.repeat(self.labels, self.weights.astype(int))
+        expected = update_centroids(self.repeated, repeated_labels, 3)
+        expected_inertia = compute_inertia(self.repeated, repeated_labels, self.centroids)
+        for X in (self.X, sp.csr_matrix(self.X)):
+            np.testing.assert_allclose(
+                update_centroids(X, self.labels, 3, sample_weight=self.weights), expected
+            )
+            self.assertAlmostEqual(
+                compute_inertia(X, self.labels, self.centroids, sample_weight=self.weights),
+                expected_inertia,
+            )
+
+    def test_kmeans_and_elbow_accept_weights(self):
+        """Weighted fits run, and zero-weight rows do not move the centroids."""
+        X, _ = _blobs(400)
+        weights = np.ones(400)
+        weights[:50] = 0.0
+        X_shifted = X.copy()
+        X_shifted[:50] += 100.0
+        _, centroids = kmeans(X, 4, random_state=0, sample_weight=weights)
+        _, shifted = kmeans(X_shifted, 4, random_state=0, sample_weight=weights)
+        np.testing.assert_allclose(centroids, shifted)
+
+        inertias = elbow_curve(X, [1, 2, 4], random_state=0, use_sklearn=False, sample_weight=weights)
+        self.assertGreater(inertias[1], inertias[4])
+        with self.assertRaises(ValueError):
+            kmeans(X, 4, sample_weight=-weights)
+
+
+class TestCoresets(unittest.TestCase):
+    """
+    Tests for the lightweight and streaming coresets.
+    """
+
+    def setUp(self):
+        self.X, self.centres = _blobs(20_000)
+        self.full_cost = compute_inertia(
+            self.X, np.argmin(((self.X[:, None] - self.centres) ** 2).sum(-1), axis=1), self.centres
+        )
+
+    def _relative_error(self, coreset, weights):
+        labels = np.argmin(((coreset[:, None] - self.centres) ** 2).sum(-1), axis=1)
+        cost = compute_inertia(coreset, labels, self.centres, sample_weight=weights)
+        return abs(cost - self.full_cost) / self.full_cost
+
+    def test_lightweight_coreset(self):
+        """Weights sum to about n and the cost of good centroids is preserved."""
+        coreset, weights = lightweight_coreset(self.X, 1_000, random_state=0)
+        self.assertEqual(coreset.shape, (1_000, 3))
+        self.assertAlmostEqual(weights.sum() / len(self.X), 1.0, delta=0.1)
+        self.assertLess(self._relative_error(coreset, weights), 0.1)
+
+        head = self.X[:100]
+        whole, whole_weights = lightweight_coreset(head, 500)
+        self.assertIs(whole, head)
+        np.testing.assert_array_equal(whole_weights, np.ones(100))
+
+    def test_streaming_coreset(self):
+        """Merge-and-reduce over chunks keeps the size bounded and the cost close."""
+        chunks = (self.X[i:i + 1_500] for i in range(0, len(self.X), 1_500))
+        coreset, weights = streaming_coreset(chunks, 1_000, random_state=0)
+        self.assertLessEqual(coreset.shape[0], 1_000)
+        self.assertLess(self._relative_error(coreset, weights), 0.15)
+        with self.assertRaises(ValueError):
+            streaming_coreset(iter([]), 10)
+
+
+class TestRunClusteringCoreset(unittest.TestCase):
+    """
+    run_clustering(coreset_size=...) fits on the coreset and labels every row.
+    """
+
+    def test_coreset_stage(self):
+        X, _ = _blobs(5_000, seed=3)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "data.csv")
+            pd.DataFrame(X, columns=["a", "b", "c"]).to_csv(path, index=False)
+            common = dict(k=4, random_state=0, plots=False, return_data=False, silhouette_sample_size=500)
+            full = run_clustering(path, ["a", "b", "c"], **common)
+            small = run_clustering(path, ["a", "b", "c"], coreset_size=400, compute_elbow=True,
+                                   elbow_k_values=[2, 4], **common)
+            self.assertEqual(small["labels"].shape, (5_000,))
+            self.assertLess(small["metrics"]["inertia"], 1.05 * full["metrics"]["inertia"])
+            self.assertEqual(list(small["elbow_inertias"]), [2, 4])
+            with self.assertRaises(ValueError):
+                run_clustering(path, ["a", "b", "c"], algorithm="bisecting_kmeans",
+                               coreset_size=400, **common)
+
+
+if __name__ == "__main__":
+    unittest.main()
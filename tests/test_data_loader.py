@@ -0,0 +1,96 @@
+###
+## cluster_maker - test file for data_loader.py
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+import unittest
+import os
+import tempfile
+
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from cluster_maker.data_loader import load_feature_matrix, load_table_with_features, matrix_cache_path
+from cluster_maker.interface import run_clustering
+
+
+class TestLoadFeatureMatrix(unittest.TestCase):
+    """
+    Tests for column-projected CSV ingestion and the .npy matrix cache.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp.name, "data.csv")
+        self.df = pd.DataFrame({
+            "x": [1.0, 2.0, 3.0],
+            "label": ["a", "b", "c"],
+            "y": [4, 5, 6],
+        })
+        self.df.to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_loads_requested_columns_in_order(self):
+        """Only the requested columns are returned, in the requested order."""
+        X = load_feature_matrix(self.csv_path, ["y", "x"])
+        np.testing.assert_array_equal(X, self.df[["y", "x"]].to_numpy(dtype=float))
+        self.assertEqual(X.dtype, np.float64)
+
+        X32 = load_feature_matrix(self.csv_path, ["x"], dtype=np.float32)
+        self.assertEqual(X32.dtype, np.float32)
+
+    def test_missing_and_non_numeric_columns(self):
+        """Missing columns raise KeyError, non-numeric ones TypeError."""
+        with self.assertRaises(KeyError):
+            load_feature_matrix(self.csv_path, ["x", "z"])
+        with self.assertRaises(TypeError):
+            load_feature_matrix(self.csv_path, ["x", "label"])
+        with self.assertRaises(FileNotFoundError):
+            load_feature_matrix(os.path.join(self.tmp.name, "nope.csv"), ["x"])
+
+    def test_cache_is_written_and_invalidated(self):
+        """The sidecar is reused for the same file and ignored once it changes."""
+        X = load_feature_matrix(self.csv_path, ["x", "y"], cache=True)
+        sidecar = matrix_cache_path(self.csv_path, ["x", "y"])
+        self.assertTrue(os.path.exists(sidecar))
+
+        X_cached = load_feature_matrix(self.csv_path, ["x", "y"], cache=True)
+        np.testing.assert_array_equal(X_cached, X)
+
+        # Rewriting the file changes its size, so the old sidecar is not used
+        pd.DataFrame({"x": [10.0, 20.0], "y": [30, 40]}).to_csv(self.csv_path, index=False)
+        X_new = load_feature_matrix(self.csv_path, ["x", "y"], cache=True)
+        np.testing.assert_array_equal(X_new, [[10.0, 30.0], [20.0, 40.0]])
+
+
+    def test_table_and_matrix_from_one_read(self):
+        """load_table_with_features returns the table and an independent matrix."""
+        df, X = load_table_with_features(self.csv_path, ["y", "x"], dtype=np.float32)
+        self.assertEqual(list(df.columns), ["x", "label", "y"])
+        np.testing.assert_array_equal(X, [[4, 1], [5, 2], [6, 3]])
+        X[0, 0] = -1.0
+        self.assertEqual(df["y"].iloc[0], 4)
+        with self.assertRaises(KeyError):
+            load_table_with_features(self.csv_path, ["x", "z"])
+        with self.assertRaises(TypeError):
+            load_table_with_features(self.csv_path, ["x", "label"])
+
+    def test_run_clustering_parses_the_csv_once(self):
+        """With return_data=True the file body is read a single time."""
+        pd.DataFrame({"x": np.arange(20.0), "y": np.arange(20.0) % 3, "tag": "t"}).to_csv(
+            self.csv_path, index=False
+        )
+        with mock.patch("pandas.read_csv", wraps=pd.read_csv) as read_csv:
+            result = run_clustering(self.csv_path, ["x", "y"], k=2, random_state=0, plots=False)
+        body_reads = [c for c in read_csv.call_args_list if c.kwargs.get("nrows") != 0]
+        self.assertEqual(len(body_reads), 1)
+        self.assertEqual(list(result["data"].columns), ["x", "y", "tag", "cluster"])
+
+
+if __name__ == "__main__":
+    unittest.main()
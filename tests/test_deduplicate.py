@@ -0,0 +1,100 @@
+###
+## cluster_maker - test file for weighted fits and run_clustering(deduplicate=True)
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+import unittest
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from cluster_maker.algorithms import sklearn_kmeans
+from cluster_maker.evaluation import compute_inertia, elbow_curve
+from cluster_maker.interface import run_clustering
+
+
+def _quantised(n, seed=0):
+    """Readings rounded to a coarse grid: few unique rows, many duplicates."""
+    rng = np.random.RandomState(seed)
+    centres = np.array([[0.0, 0.0], [10.0, 0.0], [0.0, 10.0]])
+    X = centres[rng.randint(0, 3, size=n)] + rng.normal(scale=1.0, size=(n, 2))
+    return np.round(X)
+
+
+class TestWeightedSklearnKMeans(unittest.TestCase):
+    """
+    sklearn_kmeans and elbow_curve(use_sklearn=True) with sample_weight.
+    """
+
+    def test_counts_as_weights(self):
+        """A fit on unique rows weighted by counts has the cost of the full data."""
+        X = _quantised(3_000)
+        unique, inverse, counts = np.unique(X, axis=0, return_inverse=True, return_counts=True)
+        labels, centroids = sklearn_kmeans(unique, 3, random_state=0, sample_weight=counts)
+        full_labels, full_centroids = sklearn_kmeans(X, 3, random_state=0)
+
+        weighted = compute_inertia(unique, labels, centroids, sample_weight=counts)
+        self.assertAlmostEqual(weighted, compute_inertia(X, labels[inverse.ravel()], centroids))
+        self.assertAlmostEqual(weighted, compute_inertia(X, full_labels, full_centroids), delta=1e-6 * weighted)
+
+        curve = elbow_curve(unique, [1, 3], random_state=0, sample_weight=counts)
+        self.assertAlmostEqual(curve[3], weighted, delta=1e-6 * weighted)
+
+
+class TestRunClusteringDeduplicate(unittest.TestCase):
+    """
+    run_clustering(deduplicate=True) fits on unique rows and labels every row.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "readings.csv")
+        self.X = _quantised(4_000, seed=2)
+        pd.DataFrame(self.X, columns=["x", "y"]).to_csv(self.path, index=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_labels_map_back_to_all_rows(self):
+        """Every row is labelled, at no worse a cost, for both weighted algorithms."""
+        common = dict(k=3, random_state=0, plots=False, return_data=False, silhouette_sample_size=500)
+        for algorithm in ("kmeans", "sklearn_kmeans"):
+            full = run_clustering(self.path, ["x", "y"], algorithm=algorithm, **common)
+            dedup = run_clustering(self.path, ["x", "y"], algorithm=algorithm, deduplicate=True,
+                                   compute_elbow=True, elbow_k_values=[2, 3], profile=True, **common)
+            self.assertEqual(dedup["labels"].shape, (len(self.X),))
+            # The weighted fit optimises the full objective (kmeans draws its
+            # initial rows differently, so it may find a better optimum).
+            self.assertLessEqual(dedup["metrics"]["inertia"], full["metrics"]["inertia"] * (1 + 1e-6))
+            # Identical rows always share a label.
+            _, inverse = np.unique(self.X, axis=0, return_inverse=True)
+            per_unique = pd.Series(dedup["labels"]).groupby(inverse.ravel()).nunique()
+            self.assertTrue((per_unique == 1).all())
+            self.assertIn("deduplicate", [r["stage"] for r in dedup["profile"]])
+
+        with self.assertRaises(ValueError):
+            run_clustering(self.path, ["x", "y"], algorithm="bisecting_kmeans", deduplicate=True, **common)
+
+    def test_fewer_unique_rows_than_k(self):
+        """With at most k+5 unique rows, the fit and the default elbow still run."""
+        rng = np.random.RandomState(0)
+        corners = np.array([[0.0, 0.0], [0.0, 5.0], [5.0, 0.0], [5.0, 5.0]])
+        path = os.path.join(self.tmp.name, "corners.csv")
+        pd.DataFrame(corners[rng.randint(0, 4, size=5_000)], columns=["x", "y"]).to_csv(path, index=False)
+        common = dict(random_state=0, plots=False, return_data=False, deduplicate=True)
+
+        # k above the number of unique rows: every row is fitted instead.
+        result = run_clustering(path, ["x", "y"], k=5, **common)
+        self.assertEqual(result["labels"].shape, (5_000,))
+
+        # Default elbow range 1..8 is clipped to the 4 unique rows.
+        result = run_clustering(path, ["x", "y"], k=3, compute_elbow=True, **common)
+        self.assertEqual(sorted(result["elbow_inertias"]), [1, 2, 3, 4])
+        self.assertAlmostEqual(result["elbow_inertias"][4], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+###
+## cluster_maker - test file for distributed.py
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+import unittest
+import multiprocessing
+import os
+import tempfile
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from cluster_maker import distributed
+from cluster_maker.algorithms import kmeans
+from cluster_maker.distributed import distributed_kmeans
+from cluster_maker.evaluation import compute_inertia
+
+_real_run_worker = distributed.run_worker
+_real_load_shard = distributed._load_shard
+
+
+def _dying_run_worker(address, authkey, shard, shard_index, *args):
+    """Exit before connecting for the second shard."""
+    if shard_index == 1:
+        os._exit(3)
+    _real_run_worker(address, authkey, shard, shard_index, *args)
+
+
+def _dying_load_shard(path, *args):
+    """Exit while loading the second shard."""
+    if path.endswith("shard_1.npy"):
+        os._exit(4)
+    return _real_load_shard(path, *args)
+
+
+class TestDistributedKMeans(unittest.TestCase):
+    """
+    Tests that the sharded Lloyd driver reproduces single-process kmeans.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        rng = np.random.RandomState(6)
+        self.X = rng.normal(size=(450, 3)) + np.repeat([[0, 0, 0], [5, 5, 0], [0, 5, 5]], 150, axis=0)
+        rng.shuffle(self.X)
+        self.shards = []
+        for i, part in enumerate(np.array_split(self.X, 3)):
+            path = os.path.join(self.tmp.name, f"shard_{i}.npy")
+            np.save(path, part)
+            self.shards.append(path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_matches_kmeans_over_both_transports(self):
+        """Same sampled initial rows, same labels and centroids as kmeans."""
+        labels_ref, centroids_ref = kmeans(self.X, 3, random_state=1)
+        for transport in ("pipe", "socket"):
+            labels, centroids, inertia = distributed_kmeans(
+                self.shards, 3, random_state=1, transport=transport, return_inertia=True
+            )
+            np.testing.assert_array_equal(labels, labels_ref)
+            np.testing.assert_allclose(centroids, centroids_ref)
+            self.assertAlmostEqual(inertia, compute_inertia(self.X, labels, centroids))
+
+    def test_given_init_with_empty_cluster_and_csv_shard(self):
+        """An empty cluster is re-seeded exactly like kmeans; CSV shards work too."""
+        csv_path = os.path.join(self.tmp.name, "shard_2.csv")
+        pd.DataFrame(np.load(self.shards[2]), columns=["a", "b", "c"]).to_csv(csv_path, index=False)
+        shards = self.shards[:2] + [csv_path]
+
+        init = np.array([[0.0, 0.0, 0.0], [5.0, 5.0, 0.0], [100.0, 100.0, 100.0]])
+        labels_ref, centroids_ref = kmeans(self.X, 3, random_state=4, init=init)
+        labels, centroids = distributed_kmeans(
+            shards, 3, feature_cols=["a", "b", "c"], init=init, random_state=4
+        )
+        np.testing.assert_array_equal(labels, labels_ref)
+        np.testing.assert_allclose(centroids, centroids_ref)
+
+    def test_worker_errors_reach_the_driver(self):
+        """A CSV shard without feature_cols raises ValueError in the driver."""
+        csv_path = os.path.join(self.tmp.name, "bad.csv")
+        pd.DataFrame(self.X[:10]).to_csv(csv_path, index=False)
+        with self.assertRaises(ValueError):
+            distributed_kmeans([self.shards[0], csv_path], 3)
+        with self.assertRaises(ValueError):
+            distributed_kmeans(self.shards, 3, transport="mpi")
+
+    @unittest.skipUnless(
+        multiprocessing.get_start_method() == "fork", "workers must inherit the patched function"
+    )
+    def test_dead_worker_raises_instead_of_hanging(self):
+        """A worker that dies before connecting or while loading names its shard."""
+        with mock.patch.object(distributed, "run_worker", _dying_run_worker):
+            with self.assertRaisesRegex(RuntimeError, "shard 1 .*shard_1.npy.* code 3 before connecting"):
+                distributed_kmeans(self.shards, 3, transport="socket", random_state=0)
+        with mock.patch.object(distributed, "_load_shard", _dying_load_shard):
+            for transport in ("pipe", "socket"):
+                with self.assertRaisesRegex(RuntimeError, "shard 1 .*code 4 while loading"):
+                    distributed_kmeans(self.shards, 3, transport=transport, random_state=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+###
+## cluster_maker - test file for evaluation.py
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+import unittest
+
+import numpy as np
+
+from cluster_maker.evaluation import elbow_curve
+
+
+class TestElbowCurve(unittest.TestCase):
+    """
+    Tests for the serial and process-pool elbow curve.
+    """
+
+    def setUp(self):
+        rng = np.random.RandomState(5)
+        self.X = rng.normal(size=(300, 2)) + np.repeat([[0, 0], [8, 0], [0, 8]], 100, axis=0)
+
+    def test_parallel_matches_serial(self):
+        """Fitting the k values in worker processes gives the same inertias."""
+        k_values = [1, 2, 3, 4]
+        for use_sklearn in (True, False):
+            serial = elbow_curve(self.X, k_values, random_state=0, use_sklearn=use_sklearn)
+            parallel = elbow_curve(self.X, k_values, random_state=0, use_sklearn=use_sklearn,
+                                   max_workers=2)
+            self.assertEqual(list(parallel), k_values)
+            for k in k_values:
+                self.assertAlmostEqual(parallel[k], serial[k])
+
+    def test_invalid_arguments(self):
+        """Non-positive k values or worker counts raise ValueError."""
+        with self.assertRaises(ValueError):
+            elbow_curve(self.X, [2, 0], max_workers=2)
+        with self.assertRaises(ValueError):
+            elbow_curve(self.X, [2, 3], max_workers=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
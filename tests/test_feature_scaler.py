@@ -0,0 +1,116 @@
+###
+## cluster_maker - test file for FeatureScaler
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+import unittest
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+from cluster_maker.preprocessing import FeatureScaler, merge_moments
+from cluster_maker.interface import run_clustering
+
+
+class TestFeatureScaler(unittest.TestCase):
+    """
+    Tests for the reusable, chunk-fitted FeatureScaler.
+    """
+
+    def test_partial_fit_matches_full_fit(self):
+        """Accumulating statistics over chunks should match a single full fit."""
+        rng = np.random.RandomState(0)
+        X = rng.normal(loc=5.0, scale=3.0, size=(1000, 4))
+
+        chunked = FeatureScaler()
+        for start in range(0, 1000, 137):
+            chunked.partial_fit(X[start:start + 137])
+
+        reference = StandardScaler().fit(X)
+
+        self.assertEqual(chunked.n_samples_seen_, 1000)
+        np.testing.assert_allclose(chunked.mean_, reference.mean_)
+        np.testing.assert_allclose(chunked.var_, reference.var_)
+        np.testing.assert_allclose(chunked.transform(X), reference.transform(X))
+
+    def test_merge_moments_and_refit(self):
+        """merge_moments combines blocks or single values; fit() starts afresh."""
+        rng = np.random.RandomState(1)
+        x = rng.normal(size=50)
+        n, mean, m2 = 0, 0.0, 0.0
+        for value in x:
+            n, mean, m2 = merge_moments(n, mean, m2, 1, value, 0.0)
+        self.assertEqual(n, 50)
+        self.assertAlmostEqual(mean, x.mean())
+        self.assertAlmostEqual(m2 / n, x.var())
+
+        a, b = x[:20], x[20:]
+        _, mean, m2 = merge_moments(
+            a.size, a.mean(), ((a - a.mean()) ** 2).sum(), b.size, b.mean(), ((b - b.mean()) ** 2).sum()
+        )
+        self.assertAlmostEqual(m2 / (x.size - 1), x.var(ddof=1))
+
+        scaler = FeatureScaler().partial_fit(x[:, None] + 10.0)
+        scaler.fit(x[:, None])
+        self.assertEqual(scaler.n_samples_seen_, 50)
+        np.testing.assert_allclose(scaler.mean_, [x.mean()])
+
+    def test_transform_in_place(self):
+        """copy=False should scale a float array in place without copying."""
+        X = np.random.rand(50, 3)
+        scaler = FeatureScaler().fit(X)
+
+        X_work = X.copy()
+        X_scaled = scaler.transform(X_work, copy=False)
+
+        self.assertIs(X_scaled, X_work)
+        np.testing.assert_allclose(X_scaled.mean(axis=0), 0.0, atol=1e-12)
+
+    def test_save_and_load_roundtrip(self):
+        """A saved scaler should reload with identical parameters."""
+        X = np.random.rand(40, 2)
+        scaler = FeatureScaler().fit(X)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "scaler.npz")
+            scaler.save(path)
+            loaded = FeatureScaler.load(path)
+
+        np.testing.assert_array_equal(loaded.mean_, scaler.mean_)
+        np.testing.assert_array_equal(loaded.scale_, scaler.scale_)
+        self.assertEqual(loaded.n_samples_seen_, scaler.n_samples_seen_)
+
+        rebuilt = FeatureScaler.from_params(scaler.mean_, scaler.var_ * 40, 40)
+        np.testing.assert_allclose(rebuilt.transform(X), scaler.transform(X))
+        with self.assertRaises(ValueError):
+            FeatureScaler.from_params(scaler.mean_, scaler.var_, 0)
+
+    def test_run_clustering_reuses_fitted_scaler(self):
+        """A pre-fitted scaler passed to run_clustering should not be refitted."""
+        reference = pd.DataFrame({"x": np.arange(100.0), "y": np.arange(100.0) * 2})
+        batch = pd.DataFrame({"x": np.random.rand(30), "y": np.random.rand(30)})
+
+        scaler = FeatureScaler().fit(reference.to_numpy())
+        mean_before = scaler.mean_.copy()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, "batch.csv")
+            batch.to_csv(csv_path, index=False)
+            result = run_clustering(
+                input_path=csv_path,
+                feature_cols=["x", "y"],
+                k=2,
+                random_state=0,
+                scaler=scaler,
+            )
+
+        self.assertIs(result["scaler"], scaler)
+        np.testing.assert_array_equal(scaler.mean_, mean_before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+###
+## cluster_maker - test file for kmeans checkpointing in algorithms.py
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+import unittest
+import os
+import tempfile
+
+import numpy as np
+
+from cluster_maker.algorithms import kmeans, load_kmeans_checkpoint
+
+
+class TestKMeansCheckpoint(unittest.TestCase):
+    """
+    Tests for checkpointing and resuming the manual K-means loop.
+    """
+
+    def setUp(self):
+        rng = np.random.RandomState(11)
+        self.X = rng.normal(size=(600, 4)) + np.repeat(rng.uniform(-4, 4, size=(6, 4)), 100, axis=0)
+
+    def test_resume_matches_uninterrupted_run(self):
+        """
+        A fit stopped after a few iterations and resumed gives exactly the
+        labels and centroids of a single uninterrupted fit.
+        """
+        labels_ref, centroids_ref = kmeans(self.X, k=6, tol=1e-10, random_state=2)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "fit.npz")
+            kmeans(self.X, k=6, max_iter=2, tol=1e-10, random_state=2,
+                   checkpoint_path=path, checkpoint_every=1, checkpoint_stats=True)
+            state = load_kmeans_checkpoint(path)
+            self.assertEqual(state["iteration"], 2)
+            self.assertEqual(state["counts"].sum(), len(self.X))
+            self.assertEqual(state["sums"].shape, (6, 4))
+
+            labels, centroids = kmeans(self.X, k=6, tol=1e-10, random_state=2,
+                                       checkpoint_path=path, resume=True)
+            self.assertTrue(load_kmeans_checkpoint(path)["converged"])
+
+        np.testing.assert_array_equal(labels, labels_ref)
+        np.testing.assert_array_equal(centroids, centroids_ref)
+
+    def test_resume_rejects_mismatched_checkpoint(self):
+        """
+        Resuming with a different k or different data raises ValueError.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "fit.npz")
+            kmeans(self.X, k=6, max_iter=2, random_state=2, checkpoint_path=path)
+            with self.assertRaises(ValueError):
+                kmeans(self.X, k=5, random_state=2, checkpoint_path=path, resume=True)
+            with self.assertRaises(ValueError):
+                kmeans(self.X + 1.0, k=6, random_state=2, checkpoint_path=path, resume=True)
+
+            # A change to a single value is detected, wherever it is.
+            X = np.repeat(self.X, 10, axis=0)
+            kmeans(X, k=6, max_iter=2, random_state=2, checkpoint_path=path)
+            X[1, 0] += 1.0
+            with self.assertRaises(ValueError):
+                kmeans(X, k=6, random_state=2, checkpoint_path=path, resume=True)
+
+    def test_resume_without_random_state(self):
+        """
+        With random_state=None the drawn seed is checkpointed, so the resumed
+        fit matches an uninterrupted fit with that seed.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "fit.npz")
+            kmeans(self.X, k=6, max_iter=2, tol=1e-10, checkpoint_path=path, checkpoint_every=1)
+            state = load_kmeans_checkpoint(path)
+            self.assertIsNone(state["random_state"])
+            self.assertIsNotNone(state["seed"])
+
+            labels, centroids = kmeans(self.X, k=6, tol=1e-10, checkpoint_path=path, resume=True)
+
+        labels_ref, centroids_ref = kmeans(self.X, k=6, tol=1e-10, random_state=state["seed"])
+        np.testing.assert_array_equal(labels, labels_ref)
+        np.testing.assert_array_equal(centroids, centroids_ref)
+
+
+if __name__ == "__main__":
+    unittest.main()
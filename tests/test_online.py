@@ -0,0 +1,85 @@
+###
+## cluster_maker - test file for online.py
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+import unittest
+
+import numpy as np
+
+from cluster_maker.online import OnlineKMeans
+
+CENTRES = np.array([[0.0, 0.0], [8.0, 0.0], [0.0, 8.0]])
+
+
+def _batch(rng, n=300, centres=CENTRES, proportions=None):
+    labels = rng.choice(len(centres), size=n, p=proportions)
+    return centres[labels] + rng.normal(scale=0.7, size=(n, 2))
+
+
+def _closest_distance(centroids, point):
+    return np.min(np.linalg.norm(centroids - point, axis=1))
+
+
+class TestOnlineKMeans(unittest.TestCase):
+    """
+    Tests for incremental updates, drift detection and re-fitting.
+    """
+
+    def setUp(self):
+        self.rng = np.random.RandomState(0)
+        self.model = OnlineKMeans(3, random_state=0)
+        for _ in range(10):
+            self.model.partial_fit(_batch(self.rng))
+
+    def test_stationary_stream(self):
+        """No drift on a stationary stream; statistics cover every point."""
+        self.assertEqual(self.model.drift_events_, [])
+        self.assertEqual(self.model.n_samples_seen_, 3_000)
+        self.assertAlmostEqual(self.model.counts_.sum(), 3_000)
+        for centre in CENTRES:
+            self.assertLess(_closest_distance(self.model.centroids_, centre), 0.2)
+        np.testing.assert_array_equal(
+            self.model.predict(CENTRES), [np.argmin(np.linalg.norm(self.model.centroids_ - c, axis=1)) for c in CENTRES]
+        )
+
+    def test_shift_triggers_inertia_drift_and_refit(self):
+        """A moved cluster is flagged, and the re-fit tracks its new position."""
+        moved = CENTRES.copy()
+        moved[2] = [8.0, 8.0]
+        self.model.partial_fit(_batch(self.rng, centres=moved))
+        self.assertTrue(self.model.drift_)
+        event = self.model.drift_events_[-1]
+        self.assertIn("inertia", event["reasons"])
+        self.assertTrue(event["refit"])
+
+        for _ in range(10):
+            self.model.partial_fit(_batch(self.rng, centres=moved))
+        self.assertLess(_closest_distance(self.model.centroids_, moved[2]), 0.5)
+        self.assertFalse(self.model.drift_)
+
+    def test_size_drift(self):
+        """A change of cluster proportions alone is flagged as size drift."""
+        self.model.refit_on_drift = False
+        self.model.partial_fit(_batch(self.rng, proportions=[0.9, 0.05, 0.05]))
+        self.assertEqual(self.model.drift_events_[-1]["reasons"], ["sizes"])
+        self.assertFalse(self.model.drift_events_[-1]["refit"])
+
+    def test_decay_and_invalid_input(self):
+        """decay < 1 down-weights history; bad batches raise."""
+        model = OnlineKMeans(3, decay=0.5, random_state=0)
+        for _ in range(4):
+            model.partial_fit(_batch(self.rng, n=100))
+        self.assertAlmostEqual(model.counts_.sum(), 100 * (1 + 0.5 + 0.25 + 0.125))
+
+        with self.assertRaises(ValueError):
+            OnlineKMeans(3).partial_fit(np.zeros((2, 2)))
+        with self.assertRaises(ValueError):
+            self.model.partial_fit(np.zeros((5, 3)))
+        with self.assertRaises(TypeError):
+            self.model.partial_fit([[0.0, 0.0]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+###
+## cluster_maker - test file for the package namespace
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+import unittest
+import os
+import subprocess
+import sys
+
+import cluster_maker
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestLazyImports(unittest.TestCase):
+    """
+    Tests for the lazily loaded public API of cluster_maker.
+    """
+
+    def test_all_public_names_resolve(self):
+        """Every name in __all__ is reachable and listed by dir()."""
+        for name in cluster_maker.__all__:
+            self.assertTrue(callable(getattr(cluster_maker, name)), name)
+            self.assertIn(name, dir(cluster_maker))
+
+        with self.assertRaises(AttributeError):
+            cluster_maker.not_a_function
+
+    def test_submodules_are_attributes(self):
+        """Submodules are reachable as attributes after a plain import."""
+        code = (
+            "import cluster_maker; "
+            "assert cluster_maker.algorithms.kmeans is cluster_maker.kmeans; "
+            "assert callable(cluster_maker.cli.main); "
+            "assert 'preprocessing' in dir(cluster_maker); "
+            "print(cluster_maker.data_loader.__name__)"
+        )
+        env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True
+        )
+        self.assertEqual(out.stdout.strip(), "cluster_maker.data_loader")
+
+    def test_import_does_not_load_heavy_dependencies(self):
+        """Importing the package and using simulate_data must not load sklearn or pyplot."""
+        code = (
+            "import sys, cluster_maker; cluster_maker.simulate_data; "
+            "print(any(m.startswith(('sklearn', 'matplotlib')) for m in sys.modules))"
+        )
+        env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True
+        )
+        self.assertEqual(out.stdout.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -139,5 +139,48 @@ class TestPCAExtension(unittest.TestCase):
             self.assertAlmostEqual(m, 0.0, places=6)
 
 
+    # ---------------------------------------------------------
+    # G: Randomised and incremental solvers agree with full SVD
+    # ---------------------------------------------------------
+    def test_pca_solvers_agree(self):
+        """
+        The randomised solver should give the same projection as the full
+        SVD, up to the sign of each component. The incremental solver is an
+        approximation, so it only needs to agree closely.
+        """
+        rng = np.random.RandomState(0)
+        X = rng.normal(size=(500, 6)) * np.array([10.0, 5.0, 2.0, 1.0, 0.5, 0.1])
+
+        X_full = apply_pca(X, n_components=2, solver="full")
+        X_rand = apply_pca(X, n_components=2, solver="randomized", random_state=0)
+        X_incr = apply_pca(X, n_components=2, solver="incremental", batch_size=64)
+
+        for X_other, atol in ((X_rand, 1e-6), (X_incr, 0.05)):
+            signs = np.sign(np.sum(X_full * X_other, axis=0))
+            np.testing.assert_allclose(X_other * signs, X_full, atol=atol)
+
+        with self.assertRaises(ValueError):
+            apply_pca(X, n_components=2, solver="bogus")
+
+    # ---------------------------------------------------------
+    # H: Fitted projector is returned and streams from .npy files
+    # ---------------------------------------------------------
+    def test_pca_return_model_and_npy_streaming(self):
+        """
+        return_model should give a projector that reproduces the fitted
+        output, and the incremental solver should accept a .npy path.
+        """
+        X = np.random.rand(120, 4)
+
+        X_reduced, pca = apply_pca(X, n_components=2, return_model=True)
+        np.testing.assert_allclose(pca.transform(X), X_reduced)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            npy_path = os.path.join(tmp, "X.npy")
+            np.save(npy_path, X)
+            X_stream = apply_pca(npy_path, n_components=2, solver="incremental", batch_size=50)
+
+        self.assertEqual(X_stream.shape, (120, 2))
+
 if __name__ == "__main__":
     unittest.main()
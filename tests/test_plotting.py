@@ -0,0 +1,148 @@
+###
+## cluster_maker - test file for plotting_clustered.py
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+import unittest
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from cluster_maker.interface import run_clustering
+from cluster_maker.plotting_clustered import (
+    DENSITY_MAX_LAYERS,
+    _density_layers,
+    _reservoir_sample,
+    plot_clusters_2d,
+    plot_elbow,
+)
+
+
+class TestPlotting(unittest.TestCase):
+    """
+    Tests for headless figure creation and opt-in plotting in run_clustering.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp.name, "data.csv")
+        pd.DataFrame({"x": np.random.rand(30), "y": np.random.rand(30)}).to_csv(
+            self.csv_path, index=False
+        )
+        plt.close("all")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        plt.close("all")
+
+    def test_headless_figures_bypass_pyplot(self):
+        """Headless figures must not be registered with pyplot."""
+        X = np.random.rand(20, 2)
+        fig, _ = plot_clusters_2d(X, np.zeros(20, dtype=int), headless=True)
+        fig_elbow, _ = plot_elbow([1, 2], [2.0, 1.0], headless=True)
+
+        self.assertEqual(plt.get_fignums(), [])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "plot.png")
+            fig.savefig(path)
+            self.assertTrue(os.path.exists(path))
+
+    def test_run_clustering_without_plots(self):
+        """plots=False must not build any figure, even with the elbow curve."""
+        result = run_clustering(
+            input_path=self.csv_path,
+            feature_cols=["x", "y"],
+            k=2,
+            random_state=0,
+            compute_elbow=True,
+            plots=False,
+        )
+        self.assertIsNone(result["fig_cluster"])
+        self.assertIsNone(result["fig_elbow"])
+        self.assertIsNotNone(result["elbow_inertias"])
+
+    def test_run_clustering_plots_are_headless(self):
+        """Default figures are built off-screen and left out of pyplot."""
+        result = run_clustering(
+            input_path=self.csv_path,
+            feature_cols=["x", "y"],
+            k=2,
+            random_state=0,
+            compute_elbow=True,
+        )
+        self.assertIsNotNone(result["fig_cluster"])
+        self.assertIsNotNone(result["fig_elbow"])
+        self.assertEqual(plt.get_fignums(), [])
+
+    def test_large_data_modes(self):
+        """
+        "auto" samples above the point budget and rasterises into a density
+        image above DENSITY_MIN_POINTS; the density image mixes cluster colours.
+        """
+        rng = np.random.RandomState(0)
+        X = np.vstack([rng.normal(size=(500, 2)), rng.normal(size=(500, 2)) + 10])
+        labels = np.repeat([0, 1], 500)
+
+        _, ax = plot_clusters_2d(X, labels, headless=True, max_points=200, random_state=1)
+        self.assertEqual(len(ax.collections[0].get_offsets()), 200)
+        self.assertEqual(len(ax.images), 0)
+
+        _, ax = plot_clusters_2d(X, labels, headless=True, mode="density", bins=16)
+        image = ax.images[0].get_array()
+        self.assertEqual(image.shape, (16, 16, 4))
+        self.assertAlmostEqual(float(image[..., 3].max()), 1.0)
+        self.assertEqual(len(ax.collections), 0)
+
+        with self.assertRaises(ValueError):
+            plot_clusters_2d(X, labels, headless=True, mode="hexbin")
+
+    def test_reservoir_sample_is_uniform(self):
+        """Every index is equally likely to be kept by the reservoir sample."""
+        rng = np.random.RandomState(0)
+        hits = np.zeros(50)
+        for _ in range(2000):
+            idx = _reservoir_sample(50, 10, rng)
+            self.assertEqual(len(np.unique(idx)), 10)
+            hits[idx] += 1
+        np.testing.assert_allclose(hits / 2000, 0.2, atol=0.04)
+
+    def test_reservoir_sample_matches_sequential_algorithm(self):
+        """With colliding slots, the last replacement wins as in Algorithm R."""
+        n, size = 5000, 20
+        idx = _reservoir_sample(n, size, np.random.RandomState(3))
+
+        rng = np.random.RandomState(3)
+        items = np.arange(size, n)
+        slots = (rng.random_sample(n - size) * (items + 1)).astype(np.int64)
+        reservoir = np.arange(size)
+        for item, slot in zip(items, slots):
+            if slot < size:
+                reservoir[slot] = item
+        np.testing.assert_array_equal(idx, np.sort(reservoir))
+
+    def test_density_layers_are_capped(self):
+        """Many clusters keep DENSITY_MAX_LAYERS layers, the smallest merged."""
+        rng = np.random.RandomState(0)
+        sizes = np.arange(1, 201)
+        labels = np.repeat(np.arange(200), sizes)
+        layers, offsets = _density_layers(labels, DENSITY_MAX_LAYERS)
+        self.assertEqual(len(offsets), DENSITY_MAX_LAYERS)
+        self.assertEqual(int(layers.max()), DENSITY_MAX_LAYERS - 1)
+        np.testing.assert_array_equal(offsets[:-1], np.arange(199, 199 - DENSITY_MAX_LAYERS + 1, -1))
+        self.assertEqual(offsets[-1], -1)
+        np.testing.assert_array_equal(offsets[layers[labels == 199]], 199)
+
+        X = rng.normal(size=(labels.size, 2))
+        _, ax = plot_clusters_2d(X, labels, headless=True, mode="density", bins=8)
+        self.assertEqual(ax.images[0].get_array().shape, (8, 8, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
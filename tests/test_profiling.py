@@ -0,0 +1,73 @@
+###
+## cluster_maker - test file for profiling.py
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+import unittest
+import json
+import os
+import tempfile
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from cluster_maker.interface import run_clustering
+from cluster_maker.profiling import StageProfiler
+
+
+class TestProfiling(unittest.TestCase):
+    """
+    Tests for per-stage profiling of run_clustering.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp.name, "data.csv")
+        pd.DataFrame({"x": np.random.rand(40), "y": np.random.rand(40)}).to_csv(
+            self.csv_path, index=False
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_stage_profiler_records_memory(self):
+        """A stage that allocates ~8 MB should report at least that peak."""
+        profiler = StageProfiler()
+        with profiler.stage("alloc"):
+            block = np.ones(1_000_000)
+        profiler.close()
+        del block
+
+        record = profiler.records[0]
+        self.assertEqual(record["stage"], "alloc")
+        self.assertGreaterEqual(record["peak_mem_bytes"], 8_000_000)
+        self.assertGreaterEqual(record["wall_s"], 0.0)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_run_clustering_profile(self):
+        """Profiling lists every stage that ran and can be exported as JSON lines."""
+        profile_path = os.path.join(self.tmp.name, "profile.jsonl")
+        result = run_clustering(
+            self.csv_path, ["x", "y"], k=2, random_state=0,
+            compute_elbow=True, profile=True, profile_path=profile_path,
+        )
+        stages = [record["stage"] for record in result["profile"]]
+        self.assertListEqual(
+            stages, ["load", "standardise", "pca", "cluster", "metrics", "silhouette", "export", "elbow", "plots"]
+        )
+
+        with open(profile_path) as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(len(lines), len(stages))
+        self.assertEqual(lines[0]["input_path"], self.csv_path)
+
+    def test_profile_disabled_by_default(self):
+        """Without profile=True no profile is recorded."""
+        result = run_clustering(self.csv_path, ["x", "y"], k=2, random_state=0, plots=False)
+        self.assertIsNone(result["profile"])
+
+
+if __name__ == "__main__":
+    unittest.main()
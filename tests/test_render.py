@@ -0,0 +1,59 @@
+###
+## cluster_maker - test file for render.py
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+import unittest
+import os
+import tempfile
+
+import numpy as np
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from cluster_maker.render import render_figure, render_figures
+
+
+class TestRender(unittest.TestCase):
+    """
+    Tests for rendering figure specs to files.
+    """
+
+    def _specs(self, tmp, n):
+        rng = np.random.RandomState(0)
+        for i in range(n):
+            X = rng.normal(size=(50, 2))
+            if i % 2:
+                yield {"kind": "elbow", "path": os.path.join(tmp, f"fig_{i}.svg"),
+                       "k_values": [1, 2, 3], "inertias": [9.0, 4.0, 3.0]}
+            else:
+                yield {"kind": "clusters", "path": os.path.join(tmp, f"fig_{i}.png"),
+                       "X": X, "labels": (X[:, 0] > 0).astype(int), "title": f"run {i}"}
+
+    def test_render_figures_in_pool(self):
+        """All specs are written, in order, without touching pyplot."""
+        plt.close("all")
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = render_figures(self._specs(tmp, 6), max_workers=2)
+            self.assertEqual(paths, [os.path.join(tmp, f"fig_{i}.{'svg' if i % 2 else 'png'}")
+                                     for i in range(6)])
+            for path in paths:
+                self.assertGreater(os.path.getsize(path), 0)
+
+            render_figure(next(self._specs(tmp, 1)))
+        self.assertEqual(plt.get_fignums(), [])
+
+    def test_invalid_specs(self):
+        """Unknown kinds and output formats raise ValueError."""
+        with self.assertRaises(ValueError):
+            render_figure({"kind": "pie", "path": "x.png"})
+        with self.assertRaises(ValueError):
+            render_figures([{"kind": "elbow", "path": "x.pdf", "k_values": [1], "inertias": [1.0]}],
+                           max_workers=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+###
+## cluster_maker - test file for result_cache.py
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+import unittest
+import os
+import tempfile
+import time
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from cluster_maker.interface import run_clustering
+from cluster_maker.model import ClusterModel
+from cluster_maker.result_cache import ResultCache
+
+
+class TestResultCache(unittest.TestCase):
+    """
+    Tests for the on-disk LRU result cache and its use in run_clustering.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp.name, "cache")
+        self.csv_path = os.path.join(self.tmp.name, "data.csv")
+        rng = np.random.RandomState(0)
+        pd.DataFrame(rng.normal(size=(60, 3)), columns=["a", "b", "c"]).to_csv(
+            self.csv_path, index=False
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_put_get_roundtrip(self):
+        """Stored arrays and metadata come back unchanged; unknown keys miss."""
+        cache = ResultCache(self.cache_dir)
+        key = cache.make_key(self.csv_path, {"k": 3, "algorithm": "kmeans"})
+        self.assertEqual(key, cache.make_key(self.csv_path, {"algorithm": "kmeans", "k": 3}))
+        self.assertIsNone(cache.get(key))
+
+        cache.put(key, {"labels": np.arange(5)}, {"metrics": {"inertia": 1.5}})
+        arrays, meta = cache.get(key)
+        np.testing.assert_array_equal(arrays["labels"], np.arange(5))
+        self.assertEqual(meta, {"metrics": {"inertia": 1.5}})
+
+    def test_lru_eviction_respects_size_bound(self):
+        """The least recently used entry is evicted once the bound is exceeded."""
+        cache = ResultCache(self.cache_dir, max_bytes=3000)
+        payload = {"x": np.zeros(100)}  # roughly 1 kB per entry
+        for key in ("first", "second"):
+            cache.put(key, payload)
+            time.sleep(0.01)
+        cache.get("first")  # "second" is now the least recently used
+        time.sleep(0.01)
+        cache.put("third", payload)
+
+        self.assertLessEqual(cache.size_bytes(), 3000)
+        self.assertIsNotNone(cache.get("first"))
+        self.assertIsNone(cache.get("second"))
+        self.assertIsNotNone(cache.get("third"))
+
+    def test_run_clustering_cache_hit(self):
+        """A repeated run is served from the cache with identical results."""
+        cache = ResultCache(self.cache_dir)
+        kwargs = dict(
+            input_path=self.csv_path,
+            feature_cols=["a", "b", "c"],
+            k=3,
+            random_state=1,
+            use_pca=True,
+            plots=False,
+            return_data=False,
+            result_cache=cache,
+        )
+        first = run_clustering(**kwargs)
+        second = run_clustering(**kwargs)
+
+        self.assertFalse(first["cached"])
+        self.assertTrue(second["cached"])
+        np.testing.assert_array_equal(second["labels"], first["labels"])
+        self.assertEqual(second["metrics"], first["metrics"])
+
+        # The restored preprocessing must label data exactly as the original
+        X = pd.read_csv(self.csv_path).to_numpy()
+        np.testing.assert_array_equal(
+            ClusterModel.from_result(second).predict(X),
+            ClusterModel.from_result(first).predict(X),
+        )
+
+        # Changing a parameter is a miss
+        self.assertFalse(run_clustering(**dict(kwargs, k=2))["cached"])
+
+
+    def test_default_cache_hit_does_not_load_the_matrix(self):
+        """With plots on (the default), a hit draws the figure from the cache."""
+        cache = ResultCache(self.cache_dir)
+        kwargs = dict(input_path=self.csv_path, feature_cols=["a", "b", "c"], k=3,
+                      random_state=1, result_cache=cache)
+        first = run_clustering(**kwargs)
+
+        with mock.patch("pandas.read_csv", wraps=pd.read_csv) as read_csv, \
+                mock.patch("cluster_maker.interface._load_stage") as load_stage:
+            second = run_clustering(**kwargs)
+            load_stage.assert_not_called()
+            # Only the labelled table that return_data=True asks for is read.
+            self.assertEqual(read_csv.call_count, 1)
+            self.assertIsNone(read_csv.call_args.kwargs.get("usecols"))
+
+            read_csv.reset_mock()
+            lean = run_clustering(**kwargs, return_data=False)
+            read_csv.assert_not_called()
+
+        self.assertTrue(second["cached"] and lean["cached"])
+        self.assertIsNotNone(lean["fig_cluster"])
+        np.testing.assert_array_equal(second["data"]["cluster"], first["labels"])
+        np.testing.assert_array_equal(
+            lean["fig_cluster"].axes[0].collections[0].get_offsets(),
+            first["fig_cluster"].axes[0].collections[0].get_offsets(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
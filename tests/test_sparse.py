@@ -0,0 +1,81 @@
+###
+## cluster_maker - test file for sparse input to algorithms.py and evaluation.py
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+import unittest
+
+import numpy as np
+import scipy.sparse as sp
+
+from cluster_maker.algorithms import assign_clusters, init_centroids, kmeans, update_centroids
+from cluster_maker.evaluation import compute_inertia
+
+
+class TestSparseInput(unittest.TestCase):
+    """
+    Tests that CSR input gives the same results as the equivalent dense array.
+    """
+
+    def setUp(self):
+        # Three groups of rows, each using its own block of columns.
+        rng = np.random.RandomState(4)
+        blocks = []
+        for group in range(3):
+            block = sp.random(40, 60, density=0.1, random_state=rng, format="csr")
+            block.data += 1.0
+            cols = sp.hstack([sp.csr_matrix((40, 60 * group)), block,
+                              sp.csr_matrix((40, 60 * (2 - group)))])
+            blocks.append(cols)
+        self.X_sparse = sp.vstack(blocks).tocsr()
+        self.X_dense = self.X_sparse.toarray()
+
+    def test_building_blocks_match_dense(self):
+        """assign_clusters, update_centroids and compute_inertia agree with dense input."""
+        centroids = init_centroids(self.X_sparse, 3, random_state=1)
+        self.assertIsInstance(centroids, np.ndarray)
+        np.testing.assert_array_equal(centroids, init_centroids(self.X_dense, 3, random_state=1))
+
+        labels = assign_clusters(self.X_sparse, centroids)
+        np.testing.assert_array_equal(labels, assign_clusters(self.X_dense, centroids))
+
+        # k=5 leaves empty clusters, which must be re-initialised identically.
+        new_sparse = update_centroids(self.X_sparse, labels, 5, random_state=2)
+        new_dense = update_centroids(self.X_dense, labels, 5, random_state=2)
+        np.testing.assert_allclose(new_sparse, new_dense)
+
+        self.assertAlmostEqual(
+            compute_inertia(self.X_sparse, labels, centroids),
+            compute_inertia(self.X_dense, labels, centroids),
+            places=6,
+        )
+
+    def test_kmeans_matches_dense(self):
+        """kmeans on CSR (or CSC, converted to CSR) finds the dense solution."""
+        labels_dense, centroids_dense = kmeans(self.X_dense, 3, random_state=0)
+        for X in (self.X_sparse, self.X_sparse.tocsc()):
+            labels, centroids = kmeans(X, 3, random_state=0)
+            np.testing.assert_array_equal(labels, labels_dense)
+            np.testing.assert_allclose(centroids, centroids_dense)
+
+    def test_very_wide_matrix_is_not_densified(self):
+        """A matrix far too large to densify is clustered from its non-zeros."""
+        n, d = 300, 2_000_000
+        rng = np.random.RandomState(0)
+        group = np.repeat([0, 1, 2], 100)
+        cols = group * 1000 + rng.randint(0, 50, size=n)
+        X = sp.csr_matrix((np.ones(n), (np.arange(n), cols)), shape=(n, d))
+
+        labels, centroids = kmeans(X, 3, random_state=0)
+        self.assertEqual(centroids.shape, (3, d))
+        self.assertGreaterEqual(compute_inertia(X, labels, centroids), 0.0)
+
+    def test_rejects_other_types(self):
+        """Lists and other non-array inputs are still rejected."""
+        with self.assertRaises(TypeError):
+            kmeans([[0.0, 1.0], [1.0, 0.0]], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
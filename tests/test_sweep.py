@@ -0,0 +1,96 @@
+###
+## cluster_maker - test file for sweep.py
+## Georgie Paterson - University of Bath
+## November 2025
+###
+
+import unittest
+from unittest import mock
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from cluster_maker.interface import run_clustering
+from cluster_maker.sweep import run_sweep
+
+
+class TestParameterSweep(unittest.TestCase):
+    """
+    Tests for the shared-preprocessing parameter sweep.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp.name, "data.csv")
+        rng = np.random.RandomState(2)
+        pd.DataFrame(rng.normal(size=(80, 3)), columns=["a", "b", "c"]).to_csv(
+            self.csv_path, index=False
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_sweep_grid_matches_run_clustering(self):
+        """Every combination appears once, with the metrics run_clustering gives."""
+        results = run_sweep(
+            self.csv_path,
+            ["a", "b", "c"],
+            k_values=[2, 3],
+            algorithms=["kmeans", "sklearn_kmeans"],
+            standardise_options=[True, False],
+            pca_components_options=[None, 2],
+            random_state=0,
+            max_workers=2,
+        )
+        self.assertEqual(len(results), 2 * 2 * 2 * 2)
+
+        row = results[
+            (results["k"] == 3)
+            & (results["algorithm"] == "kmeans")
+            & (results["standardise"])
+            & (results["pca_components"] == 2)
+        ].iloc[0]
+        single = run_clustering(
+            self.csv_path, ["a", "b", "c"], k=3, random_state=0,
+            use_pca=True, pca_components=2, plots=False, return_data=False,
+        )
+        self.assertAlmostEqual(row["inertia"], single["metrics"]["inertia"])
+        self.assertAlmostEqual(row["silhouette"], single["metrics"]["silhouette"])
+
+    def test_sweep_in_process(self):
+        """max_workers=1 runs the fits without a process pool."""
+        results = run_sweep(self.csv_path, ["a", "b"], k_values=[2], max_workers=1)
+        self.assertEqual(len(results), 1)
+        self.assertTrue(pd.isna(results.loc[0, "pca_components"]))
+
+        with self.assertRaises(ValueError):
+            run_sweep(self.csv_path, ["a", "b"], k_values=[2], algorithms=["bogus"])
+
+    def test_nodes_are_saved_as_they_are_computed(self):
+        """Each preprocessed matrix is written before the next one is built."""
+        import cluster_maker.sweep as sweep
+
+        events = []
+
+        def record_pca(*args, **kwargs):
+            events.append("pca")
+            return real_pca(*args, **kwargs)
+
+        def record_save(*args, **kwargs):
+            events.append("save")
+            return real_save(*args, **kwargs)
+
+        real_pca, real_save = sweep.apply_pca, np.save
+        with mock.patch.object(sweep, "apply_pca", side_effect=record_pca), \
+                mock.patch.object(sweep.np, "save", side_effect=record_save):
+            run_sweep(
+                self.csv_path, ["a", "b", "c"], k_values=[2],
+                pca_components_options=[1, 2], max_workers=1,
+            )
+        self.assertEqual(events, ["pca", "save", "pca", "save"])
+
+
+if __name__ == "__main__":
+    unittest.main()